@@ -1,5 +1,6 @@
 from nomad.config.models.plugins import AppEntryPoint
 from nomad.config.models.ui import App, Column, Columns, FilterMenu, FilterMenus
+from nomad_novelmof.apps.mof_statistics_app import mof_statistics_app
 from nomad_novelmof.apps.novel_mof_app import novel_mof_app
 
 novel_mof_app_entry_point = AppEntryPoint(
@@ -7,3 +8,9 @@ novel_mof_app_entry_point = AppEntryPoint(
     description='Novel MOF App let you interact with **MOF Archive Data** within NOMAD.',
     app= novel_mof_app
 )
+
+mof_statistics_app_entry_point = AppEntryPoint(
+    name='MOF Archive Upload Statistics',
+    description='Lists the precomputed MOFArchiveStatistics entry of every upload.',
+    app=mof_statistics_app,
+)
@@ -0,0 +1,73 @@
+from nomad.config.models.ui import (
+    App,
+    Column,
+    Menu,
+    MenuItemTerms,
+    MenuSizeEnum,
+    SearchQuantities,
+)
+
+SCHEMA = "nomad_novelmof.schema_packages.novelmof_mofarch.MOFArchiveStatistics"
+
+# The precomputed statistics of the MOFArchive entries of each upload, without
+# aggregating over the MOFArchive entries themselves.
+mof_statistics_app = App(
+    label="MOF Archive Upload Statistics",
+    path="mofarchivestatistics",
+    category="Use Cases",
+    description=(
+        "Precomputed descriptor statistics of the MOF Archive entries per upload."
+    ),
+    readme=(
+        '''
+        Every upload with MOF Archive data has one statistics entry with the
+        count, range, mean, variance and histogram of the pore descriptors and the
+        synthesis temperature, and the most frequent Hall symbols and publishers.
+        Open an entry to see them.\n'''
+    ),
+    search_quantities=SearchQuantities(
+        include=[
+            f"data.n_entries#{SCHEMA}",
+            f"data.last_update#{SCHEMA}",
+            f"data.descriptors.label#{SCHEMA}",
+            f"data.descriptors.mean#{SCHEMA}",
+        ]
+    ),
+    filters_locked={"section_defs.definition_qualified_name": [SCHEMA]},
+    columns=[
+        Column(search_quantity="upload_name", selected=True),
+        Column(
+            search_quantity=f"data.n_entries#{SCHEMA}",
+            label="MOFArchive Entries",
+            selected=True,
+        ),
+        Column(
+            search_quantity=f"data.last_update#{SCHEMA}",
+            label="Last Update",
+            selected=True,
+        ),
+        Column(search_quantity="upload_id"),
+        Column(search_quantity="main_author.name", label="Main Author"),
+    ],
+    menu=Menu(
+        title="Upload Filters",
+        items=[
+            Menu(
+                title='Uploads',
+                size=MenuSizeEnum.LG,
+                items=[
+                    MenuItemTerms(
+                        search_quantity='upload_name',
+                        show_input=True,
+                        options=10,
+                    ),
+                    MenuItemTerms(
+                        search_quantity='main_author.name',
+                        show_input=True,
+                        options=10,
+                    ),
+                ],
+            ),
+        ],
+    ),
+)
@@ -18,6 +18,8 @@ from nomad.config.models.ui import (
     WidgetTerms
 )
 
+from nomad_novelmof.schema_packages import SEARCHABLE_QUANTITIES
+
 SCHEMA = "nomad_novelmof.schema_packages.novelmof_mofarch.MOFArchive"
 
 novel_mof_app = App(
@@ -40,7 +42,10 @@ novel_mof_app = App(
         # # ---------------------------- search index -------------------------
 
         # 不加这个参数全局崩溃。。。。
-        search_quantities=SearchQuantities(include=[f"*#{SCHEMA}"]),
+        # Only the curated filterable quantities, not the CIF text or list quantities.
+        search_quantities=SearchQuantities(
+            include=[f"{quantity}#{SCHEMA}" for quantity in SEARCHABLE_QUANTITIES]
+        ),
 
         # ---------------------------- fixed filters ------------------------
         filters_locked={"section_defs.definition_qualified_name": [SCHEMA]},
@@ -91,12 +96,13 @@ novel_mof_app = App(
                             options=10,
                             title='DOI',
                         ),
-                        # MenuItemTerms(
-                        #     search_quantity=f'data.reference_data.year#{SCHEMA}',
-                        #     title='Publication Year',
-                        #     show_input=False,
-                        #     options=10,
-                        # ),
+                        MenuItemHistogram(
+                            x=Axis(
+                                search_quantity=f'data.reference_data.year#{SCHEMA}',
+                                title='Publication Year',
+                            ),
+                            n_bins=50,
+                        ),
                     ],
                 ),
                 Menu(
@@ -121,6 +127,59 @@ novel_mof_app = App(
                         ),
                     ],
                 ),
+                Menu(
+                    title='Building Blocks',
+                    size=MenuSizeEnum.XXL,
+                    items=[
+                        MenuItemTerms(
+                            search_quantity=f"data.building_blocks.metal_nodes#{SCHEMA}",
+                            show_input=True,
+                            options=10,
+                            title="Metal Nodes",
+                        ),
+                        MenuItemTerms(
+                            search_quantity=f"data.building_blocks.linkers#{SCHEMA}",
+                            show_input=True,
+                            options=10,
+                            title="Linkers",
+                        ),
+                        MenuItemTerms(
+                            search_quantity=f"data.building_blocks.topology#{SCHEMA}",
+                            show_input=True,
+                            options=10,
+                            title="MOFid Topology",
+                        ),
+                    ],
+                ),
+                Menu(
+                    title='Crystallography',
+                    size=MenuSizeEnum.XXL,
+                    items=[
+                        MenuItemTerms(
+                            search_quantity=f"data.calculation_properties.structural_properties.topological_and_crystallographic_information.crystal_system#{SCHEMA}",
+                            options=7,
+                            title="Crystal System",
+                        ),
+                        MenuItemTerms(
+                            search_quantity=f"data.calculation_properties.structural_properties.topological_and_crystallographic_information.hall#{SCHEMA}",
+                            show_input=True,
+                            options=10,
+                            title="Hall Symbol",
+                        ),
+                    ],
+                ),
+                Menu(
+                    title='Data Quality',
+                    size=MenuSizeEnum.XXL,
+                    items=[
+                        MenuItemTerms(
+                            search_quantity=f"data.plausibility_flags#{SCHEMA}",
+                            show_input=True,
+                            options=10,
+                            title="Plausibility Flags",
+                        ),
+                    ],
+                ),
                 # Menu(
                 #     title='Structural Properties',
                 #     size=MenuSizeEnum.XXL,
@@ -1,8 +1,39 @@
 from nomad.config.models.plugins import ExampleUploadEntryPoint
+from pydantic import Field
 
-example_upload_entry_point = ExampleUploadEntryPoint(
-    title='New Example Upload',
+
+class MOFArchExampleUploadEntryPoint(ExampleUploadEntryPoint):
+    n_single: int = Field(
+        1000, description='Number of records written as single record files.'
+    )
+    n_bulk: int = Field(10_000, description='Number of records written in bulk files.')
+    bulk_size: int = Field(1000, description='Number of records per bulk file.')
+    malformed_rate: float = Field(
+        0.02, description='Fraction of records that are malformed on purpose.'
+    )
+    cif_rate: float = Field(0.1, description='Fraction of records with a CIF block.')
+    max_atoms: int = Field(2000, description='Maximum number of atoms of a CIF block.')
+    seed: int = Field(0, description='Seed of the generated records.')
+
+    def load(self, upload_path: str):
+        from nomad_novelmof.example_uploads.generate import write_example_upload
+
+        super().load(upload_path)
+        write_example_upload(
+            upload_path,
+            n_single=self.n_single,
+            n_bulk=self.n_bulk,
+            bulk_size=self.bulk_size,
+            malformed_rate=self.malformed_rate,
+            cif_rate=self.cif_rate,
+            max_atoms=self.max_atoms,
+            seed=self.seed,
+        )
+
+
+example_upload_entry_point = MOFArchExampleUploadEntryPoint(
+    title='MOFArch Load Test Upload',
     category='Examples',
-    description='Description of this example upload.',
-    path='example_uploads/getting_started',
+    description='Generated MOFArch records in single and bulk `.mofarch.json` files, with CIF blocks, sparse and malformed records, for load tests of parsing, indexing and the Novel MOF App.',
+    resources=['example_uploads/getting_started/*'],
 )
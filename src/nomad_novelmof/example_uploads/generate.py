@@ -0,0 +1,200 @@
+'''
+Generator of the MOFArch load test upload.
+
+Writes a configurable number of realistic `.mofarch.json` records from
+`tools.synthetic` into an upload folder, both as single record files in
+`single/` and as bulk files with a JSON list of records in `bulk/`. Some records
+embed CIF blocks, optional fields are missing and numbers arrive as strings, as
+in real deliveries. A fraction of the records is malformed on purpose, so the
+error paths of parsing and normalization are loaded as well:
+
+- `truncated`: a single record file that is cut off and is not valid JSON,
+- `empty`: a record without any fields,
+- `no_identifier`: a record without `identifier`,
+- `wrong_sections`: sections given as strings or lists instead of objects,
+- `unconvertible`: values that cannot be converted to the expected type.
+
+In bulk files, where a truncated record would break the whole file, truncated
+records are replaced by `null` entries. `example_upload.json` records the
+parameters and the number of files and records of every kind, so the results
+of a load test run can be compared with what was generated. The same parameters
+and seed always produce the same upload.
+
+Usage:
+
+    python -m nomad_novelmof.example_uploads.generate UPLOAD_DIR --single 1000 --bulk 100000
+'''
+
+import argparse
+import json
+import os
+import random
+from collections import Counter
+
+from nomad_novelmof.tools.synthetic import RecordGenerator
+
+MALFORMED_KINDS = [
+    'truncated',
+    'empty',
+    'no_identifier',
+    'wrong_sections',
+    'unconvertible',
+]
+SUMMARY_FILE = 'example_upload.json'
+
+
+def malformed_record(rng: random.Random, record: dict, kind: str) -> dict:
+    '''
+    A broken variant of `record`. `truncated` records are unchanged, they are
+    only cut off when they are written.
+    '''
+    if kind == 'empty':
+        return {}
+    record = dict(record)
+    if kind == 'no_identifier':
+        record.pop('identifier', None)
+    elif kind == 'wrong_sections':
+        record['calculation_properties'] = rng.choice(['n/a', [], 'see SI'])
+        record['structural_data'] = [record.get('structural_data')]
+    elif kind == 'unconvertible':
+        record['calculation_properties'] = {
+            'structural_properties': {
+                'pore_characteristics': {'PLD_angstrom': 'n/a', 'PV_cm3_g': [0.1]},
+                'topological_and_crystallographic_information': {
+                    'catenation': 'two-fold',
+                    'number_spacegroup': {'value': 14},
+                },
+            },
+        }
+        record['structural_data'] = {'unmodified': 'maybe'}
+        record['reference_data'] = {'year': 'in press'}
+    return record
+
+
+class ExampleUploadGenerator:
+    '''
+    Generates the records of the example upload, `malformed_rate` of them
+    broken in one of the `MALFORMED_KINDS`.
+    '''
+
+    def __init__(
+        self,
+        seed: int = 0,
+        malformed_rate: float = 0.02,
+        cif_rate: float = 0.1,
+        max_atoms: int = 2000,
+    ):
+        self.rng = random.Random(seed)
+        self.records = RecordGenerator(seed=seed, cif_rate=cif_rate, max_atoms=max_atoms)
+        self.malformed_rate = malformed_rate
+        self.counts: Counter = Counter()
+
+    def record(self, index: int) -> tuple[str, dict]:
+        '''
+        The kind of the record, `valid` or a malformed kind, and the record.
+        '''
+        record = self.records.record(index)
+        if self.rng.random() >= self.malformed_rate:
+            self.counts['valid'] += 1
+            return 'valid', record
+        kind = self.rng.choice(MALFORMED_KINDS)
+        self.counts[kind] += 1
+        return kind, malformed_record(self.rng, record, kind)
+
+    def write_single(self, path: str, index: int) -> None:
+        kind, record = self.record(index)
+        text = json.dumps(record)
+        if kind == 'truncated':
+            text = text[: len(text) // 2]
+        with open(path, 'w') as f:
+            f.write(text)
+
+    def write_bulk(self, path: str, start: int, n: int) -> None:
+        records = []
+        for index in range(start, start + n):
+            kind, record = self.record(index)
+            records.append(None if kind == 'truncated' else record)
+        with open(path, 'w') as f:
+            json.dump(records, f)
+
+
+def write_example_upload(
+    upload_path: str,
+    n_single: int = 1000,
+    n_bulk: int = 10_000,
+    bulk_size: int = 1000,
+    malformed_rate: float = 0.02,
+    cif_rate: float = 0.1,
+    max_atoms: int = 2000,
+    seed: int = 0,
+) -> dict:
+    '''
+    Writes `n_single` single record files and `n_bulk` records in bulk files of
+    `bulk_size` records into `upload_path`. Returns the summary that is also
+    written to `example_upload.json`.
+    '''
+    generator = ExampleUploadGenerator(seed, malformed_rate, cif_rate, max_atoms)
+    single_dir = os.path.join(upload_path, 'single')
+    bulk_dir = os.path.join(upload_path, 'bulk')
+    os.makedirs(single_dir, exist_ok=True)
+    os.makedirs(bulk_dir, exist_ok=True)
+
+    for index in range(n_single):
+        generator.write_single(
+            os.path.join(single_dir, f'mof_{index:07d}.mofarch.json'), index
+        )
+    n_bulk_files = 0
+    for start in range(0, n_bulk, bulk_size):
+        generator.write_bulk(
+            os.path.join(bulk_dir, f'bulk_{n_bulk_files:05d}.mofarch.json'),
+            n_single + start,
+            min(bulk_size, n_bulk - start),
+        )
+        n_bulk_files += 1
+
+    summary = dict(
+        parameters=dict(
+            n_single=n_single,
+            n_bulk=n_bulk,
+            bulk_size=bulk_size,
+            malformed_rate=malformed_rate,
+            cif_rate=cif_rate,
+            max_atoms=max_atoms,
+            seed=seed,
+        ),
+        single_files=n_single,
+        bulk_files=n_bulk_files,
+        records=dict(generator.counts),
+    )
+    with open(os.path.join(upload_path, SUMMARY_FILE), 'w') as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('upload_path')
+    parser.add_argument('--single', type=int, default=1000, help='Single record files.')
+    parser.add_argument('--bulk', type=int, default=10_000, help='Records in bulk files.')
+    parser.add_argument('--bulk-size', type=int, default=1000)
+    parser.add_argument('--malformed-rate', type=float, default=0.02)
+    parser.add_argument('--cif-rate', type=float, default=0.1)
+    parser.add_argument('--max-atoms', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    summary = write_example_upload(
+        args.upload_path,
+        n_single=args.single,
+        n_bulk=args.bulk,
+        bulk_size=args.bulk_size,
+        malformed_rate=args.malformed_rate,
+        cif_rate=args.cif_rate,
+        max_atoms=args.max_atoms,
+        seed=args.seed,
+    )
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+'''
+The fields of MOFArchive data shared by the parsers, the plausibility checks
+and the offline tools.
+
+`RECORD_FIELDS` lists where every field of a `.mofarch.json` record goes in the
+mapped data, and `COLUMNS` the flat, typed columns of `tools.records` records
+that bulk ingestion, the columnar export and the query tools address the
+descriptors by.
+'''
+
+STRUCTURAL = 'calculation_properties.structural_properties'
+PORES = f'{STRUCTURAL}.pore_characteristics'
+TOPOLOGY = f'{STRUCTURAL}.topological_and_crystallographic_information'
+
+# column name -> (MOFArchive quantity path relative to `data`, column type)
+COLUMNS = {
+    'entry_id': (None, 'string'),
+    'common_name': ('common_name', 'string'),
+    'identifier': ('identifier', 'string'),
+    'metal_types': ('compositional_information.metal_types', 'list'),
+    'PLD_angstrom': (f'{PORES}.PLD_angstrom', 'float'),
+    'ASA_m2_cm3': (f'{PORES}.ASA_m2_cm3', 'float'),
+    'NASA_m2_cm3': (f'{PORES}.NASA_m2_cm3', 'float'),
+    'PV_cm3_g': (f'{PORES}.PV_cm3_g', 'float'),
+    'structure_dimension': (f'{TOPOLOGY}.structure_dimension', 'int'),
+    'topology_single_nodes': (f'{TOPOLOGY}.topology_single_nodes', 'string'),
+    'topology_all_nodes': (f'{TOPOLOGY}.topology_all_nodes', 'string'),
+    'catenation': (f'{TOPOLOGY}.catenation', 'int'),
+    'dimension_by_topo': (f'{TOPOLOGY}.dimension_by_topo', 'int'),
+    'hall': (f'{TOPOLOGY}.hall', 'string'),
+    'number_spacegroup': (f'{TOPOLOGY}.number_spacegroup', 'int'),
+    'crystal_system': (f'{TOPOLOGY}.crystal_system', 'string'),
+    'thermal_stability_celsius': (
+        'calculation_properties.stability.thermal_stability_celsius',
+        'float',
+    ),
+    'unmodified': ('structural_data.unmodified', 'bool'),
+    'year': ('reference_data.year', 'int'),
+    'publication': ('reference_data.publication', 'string'),
+    'doi': ('reference_data.doi', 'string'),
+    'synthesis_method': ('synthesis_information.synthesis_method', 'string'),
+    'synthesis_temperature_celsius': (
+        'synthesis_information.synthesis_parameter.temperature',
+        'float',
+    ),
+    'synthesis_time_h': ('synthesis_information.synthesis_parameter.time', 'float'),
+    'metal_nodes': ('building_blocks.metal_nodes', 'list'),
+    'linkers': ('building_blocks.linkers', 'list'),
+    'plausibility_flags': ('plausibility_flags', 'list'),
+}
+
+# (path in the mapped data, path in the record, expected type) of all fields, in
+# the order of the mapped data. Untyped fields are passed through by the tolerant
+# path, the validator only accepts lists for them.
+RECORD_FIELDS: list[tuple[str, str, type | None]] = [
+    ('common_name', 'common_name', str),
+    ('identifier', 'identifier', str),
+    ('transcriber', 'transcriber', None),
+    (
+        'compositional_information.metal_types',
+        'compositional_information.metal_types',
+        list,
+    ),
+    *(
+        (
+            f'{PORES}.{name}',
+            f'{PORES}.{name}',
+            float,
+        )
+        for name in ['PLD_angstrom', 'ASA_m2_cm3', 'NASA_m2_cm3', 'PV_cm3_g']
+    ),
+    *(
+        (
+            f'{TOPOLOGY}.{name}',
+            f'{TOPOLOGY}.{name}',
+            expected_type,
+        )
+        for name, expected_type in [
+            ('structure_dimension', int),
+            ('topology_single_nodes', str),
+            ('topology_all_nodes', str),
+            ('catenation', int),
+            ('dimension_by_topo', int),
+            ('hall', str),
+            ('number_spacegroup', int),
+        ]
+    ),
+    (
+        'calculation_properties.stability.thermal_stability_celsius',
+        'calculation_properties.stability.thermal_stability_celsius',
+        float,
+    ),
+    ('structural_data.unmodified', 'structural_data.unmodified', bool),
+    ('structural_data.cif_data', 'structural_data.cif_data', str),
+    ('reference_data.year', 'reference_data.year', int),
+    ('reference_data.publication', 'reference_data.publication', str),
+    ('reference_data.doi', 'reference_data.doi', str),
+    (
+        'synthesis_information.synthesis_method',
+        'synthesis_information.synthesis_method',
+        str,
+    ),
+    (
+        'synthesis_information.synthesis_parameter.starting_materials',
+        'synthesis_information.synthesis_parameter.starting_materials',
+        list,
+    ),
+    (
+        'synthesis_information.synthesis_parameter.temperature',
+        'synthesis_information.synthesis_parameter.temperature.normalized_c',
+        float,
+    ),
+    (
+        'synthesis_information.synthesis_parameter.time',
+        'synthesis_information.synthesis_parameter.time.normalized_h',
+        float,
+    ),
+]
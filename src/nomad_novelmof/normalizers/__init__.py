@@ -2,16 +2,23 @@ from nomad.config.models.plugins import NormalizerEntryPoint
 from pydantic import Field
 
 
-class NewNormalizerEntryPoint(NormalizerEntryPoint):
-    parameter: int = Field(0, description='Custom configuration parameter')
+class MOFNormalizerEntryPoint(NormalizerEntryPoint):
+    formula_from_cif: bool = Field(
+        True,
+        description='Derive the chemical formulas from `_chemical_formula_sum` of the CIF data.',
+    )
+    log_stage_timings: bool = Field(
+        False,
+        description='Log the duration of each normalization step as structured `stage_timings`.',
+    )
 
     def load(self):
-        from nomad_novelmof.normalizers.normalizer import NewNormalizer
+        from nomad_novelmof.normalizers.normalizer import MOFNormalizer
 
-        return NewNormalizer(**self.model_dump())
+        return MOFNormalizer(**self.model_dump())
 
 
-normalizer_entry_point = NewNormalizerEntryPoint(
-    name='NewNormalizer',
-    description='New normalizer entry point configuration.',
+normalizer_entry_point = MOFNormalizerEntryPoint(
+    name='MOFNormalizer',
+    description='Fills results.material of MOFArchive entries with formulas and pore descriptors.',
 )
@@ -0,0 +1,114 @@
+'''
+Batch computation of the `results.material` of MOFArchive entries.
+
+`populate_materials` fills the chemical formulas and the pore descriptor system
+of many materials at once: every distinct `_chemical_formula_sum` of the CIFs is
+parsed once and copied to all materials with that formula, and the pore limiting
+diameters and dimensionalities are converted and checked in one array operation
+each. Bulk ingestion runs it on all changed records of a delivery, before their
+sections are constructed, and writes the materials into the child archives.
+`MOFNormalizer` finds them there and runs it only for the entries of single
+record files and ELN entries, on a batch of one.
+'''
+
+import re
+from typing import TYPE_CHECKING
+
+import numpy as np
+from nomad.datamodel.results import Material, Relation, System
+
+if TYPE_CHECKING:
+    from structlog.stdlib import BoundLogger
+
+CIF_FORMULA_RE = re.compile(
+    r'^_chemical_formula_sum\s+[\'"]?([^\'"\n]+?)[\'"]?\s*$', re.MULTILINE
+)
+DESCRIPTOR_SYSTEM_ID = 'results/material/topology/0'
+# the formula quantities that `Formula.populate` sets, other than the composition
+FORMULA_QUANTITIES = [
+    'elements',
+    'chemical_formula_hill',
+    'chemical_formula_reduced',
+    'chemical_formula_iupac',
+    'chemical_formula_anonymous',
+    'chemical_formula_descriptive',
+]
+ANGSTROM_IN_M = 1e-10
+
+
+def formula_from_cif(cif_data: str) -> str | None:
+    '''
+    Returns the `_chemical_formula_sum` of a CIF block without parsing the
+    structure, e.g. 'C24 H12 Cu3 O15' becomes 'C24H12Cu3O15'.
+    '''
+    if not isinstance(cif_data, str):
+        return None
+    match = CIF_FORMULA_RE.search(cif_data)
+    if not match:
+        return None
+    return match.group(1).replace(' ', '')
+
+
+def populate_materials(
+    materials: list[Material],
+    cifs: list[str | None] | None,
+    pld_angstrom: np.ndarray,
+    dimension: np.ndarray,
+    logger: 'BoundLogger',
+) -> None:
+    '''
+    Fills the formulas from the CIFs, unless `cifs` is None, and the pore
+    descriptor system of each material from its pore limiting diameter and
+    structure dimension, NaN where missing. Materials that already have a hill
+    formula or a topology keep them.
+    '''
+    from nomad.atomutils import Formula
+
+    if cifs is not None:
+        formulas = [
+            None if material.chemical_formula_hill else formula_from_cif(cif_data)
+            for material, cif_data in zip(materials, cifs)
+        ]
+        parsed: dict[str, Material | None] = {}
+        for formula in dict.fromkeys(formula for formula in formulas if formula):
+            parsed[formula] = Material()
+            try:
+                Formula(formula).populate(
+                    parsed[formula], descriptive_format='hill', overwrite=True
+                )
+            except Exception as e:
+                logger.warning(
+                    f'Could not derive a formula from the CIF data: {formula}.',
+                    exc_info=e,
+                )
+                parsed[formula] = None
+        for material, formula in zip(materials, formulas):
+            template = parsed.get(formula) if formula else None
+            if template is None:
+                continue
+            for name in FORMULA_QUANTITIES:
+                setattr(material, name, getattr(template, name))
+            material.elemental_composition = [
+                composition.m_copy() for composition in template.elemental_composition
+            ]
+
+    pld_m = np.asarray(pld_angstrom, dtype=np.float64) * ANGSTROM_IN_M
+    dimension = np.asarray(dimension, dtype=np.float64)
+    has_pld = np.isfinite(pld_m)
+    has_dimension = np.isin(dimension, (0, 1, 2, 3))
+    for index in np.flatnonzero(has_pld | has_dimension).tolist():
+        material = materials[index]
+        if material.topology:
+            continue
+        system = System(
+            system_id=DESCRIPTOR_SYSTEM_ID,
+            method='parser',
+            label='original',
+            description='Pore descriptors reported for the MOF.',
+            system_relation=Relation(type='root'),
+        )
+        if has_pld[index]:
+            system.pore_limiting_diameter = float(pld_m[index])
+        if has_dimension[index]:
+            system.dimensionality = f'{int(dimension[index])}D'
+        material.m_add_sub_section(Material.topology, system)
@@ -2,6 +2,8 @@ from typing import (
     TYPE_CHECKING,
 )
 
+import numpy as np
+
 if TYPE_CHECKING:
     from nomad.datamodel.datamodel import (
         EntryArchive,
@@ -11,16 +13,67 @@ if TYPE_CHECKING:
     )
 
 from nomad.config import config
+from nomad.datamodel.results import Material, Results
 from nomad.normalizing import Normalizer
 
+from nomad_novelmof.normalizers.material import populate_materials
+from nomad_novelmof.profiling import StageTimer
+from nomad_novelmof.schema_packages.novelmof_mofarch import MOFArchive
+
 configuration = config.get_plugin_entry_point(
     'nomad_novelmof.normalizers:normalizer_entry_point'
 )
 
 
-class NewNormalizer(Normalizer):
+class MOFNormalizer(Normalizer):
+    '''
+    Fills `results.material` of `MOFArchive` entries with chemical formulas and
+    pore descriptors. Bulk ingestion computes them for all records of a delivery
+    at once with `material.populate_materials` and writes them into the child
+    archives, so they are only computed here for the other entries. The elements
+    of `metal_types` are added by `MOFArchive.normalize` itself.
+    '''
+
     def normalize(self, archive: 'EntryArchive', logger: 'BoundLogger') -> None:
         super().normalize(archive, logger)
-        logger.info('NewNormalizer.normalize', parameter=configuration.parameter)
-        if archive.results and archive.results.material:
-            archive.results.material.elements = ['C', 'O']
+        if not isinstance(archive.data, MOFArchive):
+            return
+        if not archive.results:
+            archive.results = Results()
+        if not archive.results.material:
+            archive.results.material = Material()
+        material = archive.results.material
+        if material.chemical_formula_hill and material.topology:
+            return
+
+        timer = StageTimer('MOFNormalizer', configuration.log_stage_timings)
+        cifs = None
+        structural_data = archive.data.structural_data
+        formulas = configuration.formula_from_cif and not material.chemical_formula_hill
+        if formulas and structural_data:
+            with timer.span('read_cif'):
+                try:
+                    cifs = [structural_data.read_cif(archive)]
+                except Exception as e:
+                    logger.warning('Could not read the CIF file.', exc_info=e)
+        pld = self._magnitude(archive.data, 'pore_characteristics', 'PLD_angstrom')
+        dimension = self._magnitude(
+            archive.data,
+            'topological_and_crystallographic_information',
+            'structure_dimension',
+        )
+        with timer.span('materials'):
+            populate_materials(
+                [material], cifs, np.array([pld]), np.array([dimension]), logger
+            )
+        timer.log(logger)
+
+    @staticmethod
+    def _magnitude(data: MOFArchive, section: str, name: str) -> float:
+        structural = (
+            data.calculation_properties.structural_properties
+            if data.calculation_properties else None
+        )
+        section = getattr(structural, section, None) if structural else None
+        value = getattr(section, name, None) if section else None
+        return np.nan if value is None else getattr(value, 'magnitude', value)
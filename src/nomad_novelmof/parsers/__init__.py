@@ -52,6 +52,18 @@ class MOFArchJsParserEntryPoint(ParserEntryPoint):
     """
     Tandem Parser plugin entry point.
     """
+    log_stage_timings: bool = Field(
+        False,
+        description='Log the duration of each parsing stage as structured `stage_timings`.',
+    )
+    profile_memory: bool = Field(
+        False,
+        description='Trace the peak memory of every entry with `tracemalloc` and log the top allocation sites of outliers. Slows down processing.',
+    )
+    memory_threshold_mb: float = Field(
+        200,
+        description='Peak memory in MiB above which an entry is reported as an outlier.',
+    )
 
     def load(self):
         # lazy import to avoid circular dependencies
@@ -75,3 +87,54 @@ mofarch_json_parser = MOFArchJsParserEntryPoint(
     #     },
     # },
 )
+
+
+class MOFDescriptorParserEntryPoint(ParserEntryPoint):
+    """
+    Descriptor table parser plugin entry point.
+    """
+    log_stage_timings: bool = Field(
+        False,
+        description='Log the duration of each parsing stage as structured `stage_timings`.',
+    )
+    chunk_rows: int = Field(
+        65536,
+        description='Number of rows per chunk of the HDF5 datasets, also the number of rows converted at once.',
+    )
+    compression: str | None = Field(
+        'gzip',
+        description='HDF5 compression filter of the datasets, `None` to store them uncompressed.',
+    )
+
+    def load(self):
+        # lazy import to avoid circular dependencies
+        from nomad_novelmof.parsers.descriptor_parser import MOFDescriptorParser
+
+        return MOFDescriptorParser(**self.model_dump())
+
+
+mofarch_descriptor_parser = MOFDescriptorParserEntryPoint(
+    name='MOFDescriptorParser',
+    description='MOF descriptor table parser for screening datasets in .mofdesc.csv files.',
+    mainfile_name_re=r'.*\.mofdesc\.csv',
+)
+
+
+class MOFStatisticsParserEntryPoint(ParserEntryPoint):
+    """
+    Parser plugin entry point of the MOFArchiveStatistics entry of an upload.
+    """
+
+    def load(self):
+        # lazy import to avoid circular dependencies
+        from nomad_novelmof.parsers.statistics_parser import MOFStatisticsParser
+
+        return MOFStatisticsParser(**self.model_dump())
+
+
+mofarch_statistics_parser = MOFStatisticsParserEntryPoint(
+    name='MOFStatisticsParser',
+    description='Processes the MOFArchive statistics of an upload after its entries.',
+    mainfile_name_re=r'(.*/)?mofarch_statistics\.archive\.json',
+    level=1,
+)
@@ -0,0 +1,114 @@
+'''
+Record level delta ingestion of bulk `.mofarch.json` files.
+
+A bulk file holds a JSON list of records, and every record becomes a child
+MOFArchive entry, written as `<bulk file>.<identifier>.archive.json` next to
+the bulk file. Upstream re-delivers the full dataset although only a few records
+change, so a manifest `<bulk file>.manifest.json` keeps the content hash of every
+record by identifier. On re-delivery, only the child archives of new and changed
+records are written and processed, the children of records that are gone are
+replaced by `RemovedMOFRecord` entries, and unchanged records are left alone.
+Processing cannot delete entries of its upload, so the removed records stay as
+entries that are not MOFArchives and drop out of all MOFArchive queries.
+
+The hash is taken from the record as delivered, so unchanged records are not
+even mapped. Changed records are mapped into the column buffers of
+`parsers.columns.MappedColumns` while the file is scanned, and their raw records
+are released, so only the interned codes of repetitive strings are held until
+the child sections are constructed. The vocabularies are kept in
+`<bulk file>.vocabularies.json`, so codes stay stable across deliveries and the
+columnar export and query tools can use them. Manifests of another
+`MANIFEST_VERSION` are ignored, so increasing it, e.g. when the mapping changes,
+rewrites all children on the next delivery.
+
+Before the children are written, the descriptors of all changed records are
+checked at once with `plausibility.plausibility_flags`, and the flags of a record
+are stored in the `plausibility_flags` of its child. The medians and MADs of the
+outlier checks are computed only from complete deliveries, where every record is
+mapped, e.g. the first one, and kept in `<bulk file>.plausibility.json`, so a
+re-delivery with only a few changed records is checked against the statistics
+of the whole dataset rather than of the changed records.
+'''
+
+import json
+import os
+import re
+from typing import NamedTuple
+
+from nomad_novelmof.schema_packages.cache import content_hash
+
+MANIFEST_VERSION = 1
+BULK_SUFFIX = '.mofarch.json'
+
+
+def record_hash(record: dict) -> str:
+    return content_hash(json.dumps(record, sort_keys=True, separators=(',', ':')))
+
+
+def bulk_name(mainfile: str) -> str:
+    '''
+    The name of a bulk file without the `.mofarch.json` suffix.
+    '''
+    name = os.path.basename(mainfile)
+    return name[: -len(BULK_SUFFIX)] if name.endswith(BULK_SUFFIX) else name
+
+
+def manifest_file_name(mainfile: str) -> str:
+    return f'{bulk_name(mainfile)}.manifest.json'
+
+
+def vocabulary_file_name(mainfile: str) -> str:
+    return f'{bulk_name(mainfile)}.vocabularies.json'
+
+
+def plausibility_file_name(mainfile: str) -> str:
+    return f'{bulk_name(mainfile)}.plausibility.json'
+
+
+def child_file_name(mainfile: str, identifier: str) -> str:
+    '''
+    The file of the child archive of a record, relative to the bulk file.
+    Characters that are not safe in file names are replaced, and then a short
+    hash of the identifier keeps the names unique.
+    '''
+    name = re.sub(r'[^\w.-]', '_', identifier)
+    if name != identifier:
+        name = f'{name}_{content_hash(identifier)[:8]}'
+    return f'{bulk_name(mainfile)}.{name}.archive.json'
+
+
+class BulkDelta(NamedTuple):
+    created: list[str]
+    updated: list[str]
+    deleted: list[str]
+    unchanged: list[str]
+
+
+def diff_manifest(old: dict[str, str], new: dict[str, str]) -> BulkDelta:
+    '''
+    Compares the `{identifier: hash}` of the last and the current delivery.
+    '''
+    created, updated, unchanged = [], [], []
+    for identifier, hash in new.items():
+        if identifier not in old:
+            created.append(identifier)
+        elif old[identifier] != hash:
+            updated.append(identifier)
+        else:
+            unchanged.append(identifier)
+    deleted = [identifier for identifier in old if identifier not in new]
+    return BulkDelta(created, updated, deleted, unchanged)
+
+
+def build_manifest(records: dict[str, str]) -> dict:
+    return dict(version=MANIFEST_VERSION, records=records)
+
+
+def manifest_records(manifest: dict | None) -> dict[str, str]:
+    '''
+    The `{identifier: hash}` of a stored manifest, empty if there is none or if it
+    was written by another version.
+    '''
+    if not manifest or manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest.get('records') or {}
@@ -0,0 +1,181 @@
+'''
+Column buffers of mapped `.mofarch.json` records for bulk ingestion.
+
+Instead of keeping one nested dict per mapped record, `MappedColumns` keeps one
+typed buffer per field of `RECORD_FIELDS`: `array` buffers for numbers and
+booleans, codes of the per-column vocabularies of `vocabulary.Vocabularies` for
+the repetitive strings, and plain lists only for free text. `record` decodes a
+row back into the mapped dict when its section is constructed. Values that do
+not fit the buffer of their field, e.g. a boolean in an integer field that the
+tolerant mapping passed through or an integer beyond int64, are kept as they
+are, so decoding is exact.
+`numeric` and `descriptors` return number fields of all or selected rows as
+arrays for the vectorized checks of `plausibility` and the batch computation of
+the materials, `objects` the free text fields, e.g. the CIFs.
+'''
+
+from array import array
+from typing import Any
+
+import numpy as np
+
+from nomad_novelmof.fields import COLUMNS, RECORD_FIELDS
+from nomad_novelmof.parsers.validator import set_path
+from nomad_novelmof.plausibility import CHECKED_COLUMNS, max_cell_length
+from nomad_novelmof.vocabulary import INTERNED_COLUMNS, NO_CODE, Vocabularies
+
+NO_INT = -(2**63)
+# ints from NO_INT on have no place in the int64 buffers
+MAX_INT = 2**63
+NO_BOOL = -1
+# what the buffers of each kind store for None
+NULLS = {'code': NO_CODE, 'float': float('nan'), 'int': NO_INT, 'bool': NO_BOOL}
+INTERNED_PATHS = {COLUMNS[column][0]: column for column in INTERNED_COLUMNS}
+
+
+class MappedColumns:
+    def __init__(self, vocabularies: Vocabularies | None = None):
+        self.vocabularies = vocabularies if vocabularies is not None else Vocabularies()
+        self.n_rows = 0
+        # (target, keys, kind, buffer) of every field
+        self.fields: list[tuple[str, tuple[str, ...], str, Any]] = []
+        self.overflow: dict[tuple[str, int], Any] = {}
+        for target, _, expected_type in RECORD_FIELDS:
+            column = INTERNED_PATHS.get(target)
+            if column and expected_type is list:
+                kind, buffer = 'terms', (array('q', [0]), array('i'))
+            elif column:
+                kind, buffer = 'code', array('i')
+            elif expected_type is float:
+                kind, buffer = 'float', array('d')
+            elif expected_type is int:
+                kind, buffer = 'int', array('q')
+            elif expected_type is bool:
+                kind, buffer = 'bool', array('b')
+            else:
+                kind, buffer = 'object', []
+            self.fields.append((target, tuple(target.split('.')), kind, buffer))
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def append(self, data: dict) -> None:
+        '''
+        Adds a record as mapped by `MOFArchJsParser.map_json_to_schema_with_type_check`.
+        '''
+        row = self.n_rows
+        for target, keys, kind, buffer in self.fields:
+            value = data
+            for key in keys:
+                value = value.get(key) if isinstance(value, dict) else None
+            if kind == 'object':
+                buffer.append(value)
+                continue
+            if kind == 'terms':
+                offsets, codes = buffer
+                if value is None:
+                    codes.append(NO_CODE)
+                elif type(value) is list and all(type(term) is str for term in value):
+                    vocabulary = self.vocabularies[INTERNED_PATHS[target]]
+                    codes.extend(vocabulary.encode(term) for term in value)
+                else:
+                    self.overflow[(target, row)] = value
+                offsets.append(len(codes))
+                continue
+            if value is None:
+                stored = NULLS[kind]
+            elif kind == 'code' and type(value) is str:
+                stored = self.vocabularies[INTERNED_PATHS[target]].encode(value)
+            elif kind == 'float' and type(value) is float and value == value:
+                stored = value
+            elif kind == 'int' and type(value) is int and NO_INT < value < MAX_INT:
+                stored = value
+            elif kind == 'bool' and type(value) is bool:
+                stored = value
+            else:
+                self.overflow[(target, row)] = value
+                stored = NULLS[kind]
+            buffer.append(stored)
+        self.n_rows += 1
+
+    def numeric(self, target: str, rows: list[int] | None = None) -> np.ndarray:
+        '''
+        The values of a number field in all rows, or in `rows`, as floats, NaN
+        where missing or not a number, without decoding the rows.
+        '''
+        for target_, _, kind, buffer in self.fields:
+            if target_ != target:
+                continue
+            if kind == 'float':
+                values = np.frombuffer(buffer, dtype=np.float64).copy()
+            elif kind == 'int':
+                ints = np.frombuffer(buffer, dtype=np.int64)
+                values = np.where(ints == NO_INT, np.nan, ints.astype(np.float64))
+            else:
+                raise ValueError(f'{target} is not a number field.')
+            for (target_, row), value in self.overflow.items():
+                if target_ == target:
+                    values[row] = np.nan
+            return values if rows is None else values[rows]
+        raise KeyError(target)
+
+    def descriptors(self, rows: list[int] | None = None) -> dict[str, np.ndarray]:
+        '''
+        The columns of `plausibility.CHECKED_COLUMNS` of all rows, or of `rows`,
+        with the longest cell edges read from the CIFs.
+        '''
+        descriptors = {
+            column: self.numeric(COLUMNS[column][0], rows)
+            for column in CHECKED_COLUMNS
+            if column in COLUMNS
+        }
+        descriptors['max_cell_length_angstrom'] = np.array(
+            [
+                max_cell_length(cif_data) if type(cif_data) is str else np.nan
+                for cif_data in self.objects('structural_data.cif_data', rows)
+            ],
+            dtype=np.float64,
+        )
+        return descriptors
+
+    def objects(self, target: str, rows: list[int] | None = None) -> list:
+        '''
+        The values of a free text field in all rows, or in `rows`.
+        '''
+        for target_, _, kind, buffer in self.fields:
+            if target_ != target:
+                continue
+            if kind != 'object':
+                raise ValueError(f'{target} is not a free text field.')
+            return list(buffer) if rows is None else [buffer[row] for row in rows]
+        raise KeyError(target)
+
+    def record(self, row: int) -> dict:
+        '''
+        Decodes a row into the mapped dict it was appended as.
+        '''
+        data: dict = {}
+        for target, _, kind, buffer in self.fields:
+            if (target, row) in self.overflow:
+                value = self.overflow[(target, row)]
+            elif kind == 'object':
+                value = buffer[row]
+            elif kind == 'terms':
+                offsets, codes = buffer
+                run = codes[offsets[row] : offsets[row + 1]]
+                if len(run) == 1 and run[0] == NO_CODE:
+                    value = None
+                else:
+                    terms = self.vocabularies[INTERNED_PATHS[target]].terms
+                    value = [terms[code] for code in run]
+            elif kind == 'code':
+                value = self.vocabularies[INTERNED_PATHS[target]].decode(buffer[row])
+            elif kind == 'float':
+                value = buffer[row]
+                value = None if value != value else value
+            elif kind == 'int':
+                value = None if buffer[row] == NO_INT else buffer[row]
+            else:
+                value = None if buffer[row] == NO_BOOL else bool(buffer[row])
+            set_path(data, target, value)
+        return data
@@ -0,0 +1,151 @@
+'''
+Parser of MOF descriptor tables of screening studies.
+
+A `*.mofdesc.csv` file has a header row with column names of
+`descriptor_table.TABLE_COLUMNS` and one row per MOF. The rows are streamed into
+the HDF5 file `<name>.h5` next to the CSV file, one chunk at a time, and the
+entry of the CSV file becomes a single `MOFDescriptorTable` that refers to it.
+Each chunk is converted column by column with numpy; values that are empty,
+cannot be converted or are out of the range of an integer column are stored as
+missing and counted in one warning.
+'''
+
+import csv
+from typing import TYPE_CHECKING
+
+import numpy as np
+from nomad.config import config
+from nomad.parsing.parser import MatchingParser
+
+from nomad_novelmof.parsers.utils import is_client_context, sibling_file_name
+from nomad_novelmof.profiling import StageTimer
+from nomad_novelmof.schema_packages.descriptor_table import (
+    TABLE_COLUMNS,
+    DescriptorTableWriter,
+    missing_value,
+)
+from nomad_novelmof.schema_packages.novelmof_mofarch import MOFDescriptorTable
+
+if TYPE_CHECKING:
+    from nomad.datamodel.datamodel import EntryArchive
+    from structlog.stdlib import BoundLogger
+
+configuration = config.get_plugin_entry_point(
+    'nomad_novelmof.parsers:mofarch_descriptor_parser'
+)
+
+DESCRIPTOR_SUFFIX = '.mofdesc.csv'
+
+
+def table_file_name(mainfile: str) -> str:
+    name = mainfile.rsplit('/', 1)[-1]
+    if name.endswith(DESCRIPTOR_SUFFIX):
+        name = name[: -len(DESCRIPTOR_SUFFIX)]
+    return f'{name}.h5'
+
+
+def convert_column(values: list[str], dtype) -> tuple[np.ndarray, int]:
+    '''
+    Converts the strings of a column to its dtype. Returns the values and the
+    number of non-empty values that could not be converted.
+    '''
+    if dtype is str:
+        return np.array(values, dtype=object), 0
+    missing = missing_value(dtype)
+    try:
+        floats = np.array([value or 'nan' for value in values], dtype=np.float64)
+        invalid = 0
+    except ValueError:
+        floats = np.empty(len(values), dtype=np.float64)
+        invalid = 0
+        for index, value in enumerate(values):
+            try:
+                floats[index] = float(value) if value else np.nan
+            except ValueError:
+                floats[index] = np.nan
+                invalid += 1
+    if np.issubdtype(dtype, np.floating):
+        return floats.astype(dtype), invalid
+    info = np.iinfo(dtype)
+    integral = (
+        np.isfinite(floats)
+        & (floats == np.round(floats))
+        & (floats >= info.min)
+        & (floats <= info.max)
+    )
+    invalid += int(np.count_nonzero(np.isfinite(floats) & ~integral))
+    return np.where(integral, floats, missing).astype(dtype), invalid
+
+
+class MOFDescriptorParser(MatchingParser):
+    '''
+    Streams a `*.mofdesc.csv` descriptor table into HDF5 and creates its
+    `MOFDescriptorTable` entry.
+    '''
+
+    def parse(
+        self,
+        mainfile: str,
+        archive: 'EntryArchive',
+        logger: 'BoundLogger',
+        child_archives: dict[str, 'EntryArchive'] = None,
+    ) -> None:
+        timer = StageTimer('MOFDescriptorParser', configuration.log_stage_timings)
+        file_name = sibling_file_name(archive, mainfile, table_file_name(mainfile))
+        with (
+            open(mainfile, newline='') as csv_file,
+            open(file_name, 'w+b')
+            if is_client_context(archive)
+            else archive.m_context.raw_file(file_name, 'w+b') as h5_file,
+        ):
+            reader = csv.reader(csv_file)
+            header = [name.strip() for name in next(reader, [])]
+            unknown = [name for name in header if name not in TABLE_COLUMNS]
+            if unknown:
+                logger.warning(
+                    'Ignored unknown descriptor table columns.', columns=unknown
+                )
+            positions = {
+                column: header.index(column)
+                for column in TABLE_COLUMNS
+                if column in header
+            }
+            invalid = dict.fromkeys(positions, 0)
+            with DescriptorTableWriter(
+                h5_file, configuration.chunk_rows, configuration.compression
+            ) as writer:
+                while True:
+                    with timer.span('read_csv'):
+                        chunk = [
+                            row
+                            for _, row in zip(range(configuration.chunk_rows), reader)
+                        ]
+                    if not chunk:
+                        break
+                    with timer.span('convert'):
+                        columns = {}
+                        for column, position in positions.items():
+                            values, n_invalid = convert_column(
+                                [
+                                    row[position] if position < len(row) else ''
+                                    for row in chunk
+                                ],
+                                TABLE_COLUMNS[column][0],
+                            )
+                            columns[column] = values
+                            invalid[column] += n_invalid
+                        if 'identifier' not in columns:
+                            columns['identifier'] = [''] * len(chunk)
+                    with timer.span('write_hdf5'):
+                        writer.append_columns(columns)
+            n_rows = writer.n_rows
+
+        invalid = {column: count for column, count in invalid.items() if count}
+        if invalid:
+            logger.warning(
+                'Stored unconvertible descriptor values as missing.', counts=invalid
+            )
+        table = MOFDescriptorTable()
+        table.set_file(file_name, n_rows, configuration.chunk_rows)
+        archive.data = table
+        timer.log(logger, mainfile=mainfile, n_rows=n_rows)
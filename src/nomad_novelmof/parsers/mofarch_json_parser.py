@@ -1,20 +1,62 @@
 import json
+import os
+from datetime import datetime, timezone
+
 import numpy as np
 from typing import TYPE_CHECKING, Optional
 
 from jmespath import search
+from nomad.config import config
 from nomad.datamodel.datamodel import EntryArchive
 from nomad.parsing.parser import MatchingParser
 
-from nomad_novelmof.parsers.utils import create_archive
+from nomad_novelmof.fields import PORES, TOPOLOGY
+from nomad_novelmof.parsers.bulk import (
+    BulkDelta,
+    child_file_name,
+    diff_manifest,
+    build_manifest,
+    manifest_file_name,
+    manifest_records,
+    plausibility_file_name,
+    record_hash,
+    vocabulary_file_name,
+)
+from nomad_novelmof.parsers.columns import MappedColumns
+from nomad_novelmof.parsers.utils import (
+    create_archive,
+    get_entry_id_from_file_name,
+    is_client_context,
+    read_json_file,
+    sibling_file_name,
+    write_json_file,
+)
+from nomad_novelmof.parsers.validator import (
+    MISSING_KEY_MESSAGE,
+    RECORD_FIELDS,
+    set_path,
+    validate_record,
+)
+from nomad_novelmof.plausibility import plausibility_flags, robust_statistics
+from nomad_novelmof.profiling import MemoryProfile, StageTimer
 
+from nomad_novelmof.schema_packages.cache import content_hash
+from nomad_novelmof.vocabulary import Vocabularies
 from nomad_novelmof.schema_packages.novelmof_mofarch import (
 MOFArchive,
+MOFArchiveStatistics,
+MOFPublication,
+RemovedMOFRecord,
 )
 
 if TYPE_CHECKING:
+    from nomad.datamodel.results import Results
     from structlog.stdlib import BoundLogger
 
+configuration = config.get_plugin_entry_point(
+    'nomad_novelmof.parsers:mofarch_json_parser'
+)
+
 # parser的工作流是怎么样的？
 ## MOFArchJsParserEntryPoint 中内置对于文件的检测判断，决定是否启动该项ParserEntryPoint ，同时内部调用相对应的Parser进行处理
 # parser的工作流是：
@@ -44,6 +86,20 @@ if TYPE_CHECKING:
 
 
 
+# the archive file of the MOFArchiveStatistics entry, at the top of the upload
+STATISTICS_FILE_NAME = 'mofarch_statistics.archive.json'
+# the quantities of the processed statistics entry that its replacement keeps
+STATISTICS_STATE = ['rebuild', 'n_entries', 'last_update', 'accumulators']
+
+
+def publication_file_name(doi: str) -> str:
+    '''
+    The archive file of the shared publication entry of a DOI, at the top of the
+    upload.
+    '''
+    return f'publication_{content_hash(doi.strip().lower())[:16]}.archive.json'
+
+
 class MOFArchJsParser(MatchingParser):
     """
     Parser for MOFArch JSON files and creating instances of MOFArchive.
@@ -59,15 +115,176 @@ class MOFArchJsParser(MatchingParser):
         child_archives: dict[str, 'EntryArchive'] = None,
     ) -> None:
 
-        # Load the JSON file
-        with open(mainfile) as file:
-            source_dict = json.load(file)
-
-        update_dict = self.map_json_to_schema_with_type_check(source_dict,logger)
-        mof_entry = MOFArchive()
-        mof_entry.m_update_from_dict(update_dict)
-
-        archive.data = mof_entry
+        timer = StageTimer('MOFArchJsParser', configuration.log_stage_timings)
+        memory = MemoryProfile(
+            configuration.profile_memory, configuration.memory_threshold_mb * 1024**2
+        )
+
+        with memory:
+            # Load the JSON file
+            with timer.span('json_load'), open(mainfile) as file:
+                source_dict = json.load(file)
+
+            if isinstance(source_dict, list):
+                self.parse_bulk(source_dict, mainfile, archive, logger, timer)
+                timer.log(logger, mainfile=mainfile, n_records=len(source_dict))
+                return
+
+            with timer.span('map_json_to_schema'):
+                update_dict = self.map_json_to_schema_with_type_check(source_dict,logger)
+            with timer.span('link_publication'):
+                self.link_publication(update_dict, mainfile, archive, logger, {})
+            with timer.span('m_update_from_dict'):
+                mof_entry = MOFArchive()
+                mof_entry.m_update_from_dict(update_dict)
+
+            archive.data = mof_entry
+            with timer.span('statistics'):
+                self.create_statistics(mainfile, archive, logger)
+        timer.log(logger, mainfile=mainfile, identifier=mof_entry.identifier)
+        memory.log(
+            logger, 'MOFArchJsParser', mainfile=mainfile, identifier=mof_entry.identifier
+        )
+
+    def parse_bulk(
+        self,
+        records: list,
+        mainfile: str,
+        archive: 'EntryArchive',
+        logger: 'BoundLogger',
+        timer: StageTimer,
+    ) -> BulkDelta:
+        """
+        Creates, updates and deletes the child MOFArchive entries of a bulk file
+        for the records that changed since the last delivery, see `parsers.bulk`.
+        """
+        manifest_name = sibling_file_name(archive, mainfile, manifest_file_name(mainfile))
+        old = manifest_records(read_json_file(archive, manifest_name))
+
+        vocabulary_name = sibling_file_name(archive, mainfile, vocabulary_file_name(mainfile))
+        columns = MappedColumns(Vocabularies(read_json_file(archive, vocabulary_name)))
+
+        with timer.span('bulk_hash'):
+            hashes = {}
+            # the rows of the changed records in `columns`
+            changed = {}
+            for index, record in enumerate(records):
+                identifier = record.get('identifier') if isinstance(record, dict) else None
+                if identifier is None or identifier == '':
+                    logger.warning('Skipped a bulk record without identifier.')
+                    continue
+                identifier = str(identifier)
+                if identifier in hashes:
+                    logger.warning(
+                        'Duplicate identifier in bulk file, the last record is used.',
+                        identifier=identifier,
+                    )
+                hashes[identifier] = record_hash(record)
+                if old.get(identifier) != hashes[identifier]:
+                    changed[identifier] = len(columns)
+                    columns.append(self.map_json_to_schema_with_type_check(record, logger))
+                else:
+                    changed.pop(identifier, None)
+                records[index] = None
+        delta = diff_manifest(old, hashes)
+
+        plausibility_name = sibling_file_name(
+            archive, mainfile, plausibility_file_name(mainfile)
+        )
+        with timer.span('bulk_plausibility'):
+            # rows of earlier copies of duplicate identifiers are not checked
+            rows = sorted(changed.values())
+            descriptors = columns.descriptors(rows)
+            # only a delivery whose records were all mapped gives the statistics of
+            # the dataset, the others are checked against the stored ones
+            complete = not delta.unchanged
+            if complete:
+                statistics = robust_statistics(descriptors)
+            else:
+                statistics = read_json_file(archive, plausibility_name) or {}
+            flags = {
+                rows[index]: row_flags
+                for index, row_flags in plausibility_flags(
+                    descriptors, len(rows), statistics
+                ).items()
+            }
+            del descriptors
+
+        with timer.span('bulk_materials'):
+            materials = self.bulk_materials(columns, rows, logger)
+
+        with timer.span('bulk_write'):
+            publications = {}
+            for identifier, row in changed.items():
+                try:
+                    data = columns.record(row)
+                    data['plausibility_flags'] = flags.get(row)
+                    self.link_publication(data, mainfile, archive, logger, publications)
+                    mof_entry = MOFArchive()
+                    mof_entry.m_update_from_dict(data)
+                    create_archive(
+                        mof_entry,
+                        archive,
+                        sibling_file_name(
+                            archive, mainfile, child_file_name(mainfile, identifier)
+                        ),
+                        overwrite=True,
+                        results=materials.get(row),
+                    )
+                except Exception as e:
+                    logger.error(
+                        'Could not create the entry of a bulk record.',
+                        identifier=identifier,
+                        exc_info=e,
+                    )
+                    # retried on the next delivery
+                    if identifier in old:
+                        hashes[identifier] = old[identifier]
+                    else:
+                        del hashes[identifier]
+
+        with timer.span('bulk_delete'):
+            removed_at = datetime.now(timezone.utc)
+            for identifier in delta.deleted:
+                try:
+                    create_archive(
+                        RemovedMOFRecord(
+                            identifier=identifier,
+                            bulk_file=os.path.basename(mainfile),
+                            removed_at=removed_at,
+                        ),
+                        archive,
+                        sibling_file_name(
+                            archive, mainfile, child_file_name(mainfile, identifier)
+                        ),
+                        overwrite=True,
+                    )
+                except Exception as e:
+                    logger.error(
+                        'Could not replace the entry of a removed bulk record.',
+                        identifier=identifier,
+                        exc_info=e,
+                    )
+                    # retried on the next delivery
+                    hashes[identifier] = old[identifier]
+
+        write_json_file(archive, manifest_name, build_manifest(hashes))
+        write_json_file(archive, vocabulary_name, columns.vocabularies.to_dict())
+        if complete:
+            write_json_file(archive, plausibility_name, statistics)
+        if delta.created or delta.updated or delta.deleted:
+            with timer.span('statistics'):
+                self.create_statistics(mainfile, archive, logger)
+        logger.info(
+            'Ingested bulk file.',
+            created=len(delta.created),
+            updated=len(delta.updated),
+            deleted=len(delta.deleted),
+            unchanged=len(delta.unchanged),
+            flagged=sum(1 for row in changed.values() if row in flags),
+            skipped=len(records) - len(delta.created) - len(delta.updated) - len(delta.unchanged),
+        )
+        return delta
 
 
 
@@ -81,11 +298,123 @@ class MOFArchJsParser(MatchingParser):
 
 
     @staticmethod
-    def map_json_to_schema_with_type_check(source: dict,logger) -> dict:
+    def bulk_materials(
+        columns: MappedColumns, rows: list[int], logger: 'BoundLogger'
+    ) -> dict[int, 'Results']:
+        '''
+        The `results.material` of the records in `rows`, computed at once with
+        `normalizers.material.populate_materials`, by row.
+        '''
+        from nomad.datamodel.results import Material, Results
+
+        from nomad_novelmof.normalizers.material import populate_materials
+
+        normalizer = config.get_plugin_entry_point(
+            'nomad_novelmof.normalizers:normalizer_entry_point'
+        )
+        materials = [Material() for _ in rows]
+        populate_materials(
+            materials,
+            columns.objects('structural_data.cif_data', rows)
+            if normalizer.formula_from_cif else None,
+            columns.numeric(f'{PORES}.PLD_angstrom', rows),
+            columns.numeric(f'{TOPOLOGY}.structure_dimension', rows),
+            logger,
+        )
+        return {
+            row: Results(material=material)
+            for row, material in zip(rows, materials)
+            if material.chemical_formula_hill or material.topology
+        }
+
+    @staticmethod
+    def link_publication(
+        data: dict,
+        mainfile: str,
+        archive: 'EntryArchive',
+        logger: 'BoundLogger',
+        publications: dict[str, str],
+    ) -> None:
+        """
+        Refers the reference data of a mapped record to the shared publication
+        entry of its DOI, and creates the entry if the upload has none yet.
+        `publications` holds the references of the DOIs seen in this parse run,
+        by normalized DOI.
+        """
+        reference_data = data.get('reference_data') or {}
+        doi = reference_data.get('doi')
+        if not doi:
+            return
+        # DOIs are case insensitive
+        key = doi.strip().lower()
+        if key not in publications:
+            file_name = publication_file_name(key)
+            try:
+                create_archive(
+                    MOFPublication(
+                        doi=doi,
+                        year=reference_data.get('year'),
+                        publication=reference_data.get('publication'),
+                    ),
+                    archive,
+                    sibling_file_name(archive, mainfile, file_name)
+                    if is_client_context(archive) else file_name,
+                )
+            except Exception as e:
+                # e.g. created at the same time while parsing another file
+                logger.info('Could not create the publication entry.', doi=doi, exc_info=e)
+            publications[key] = f'../upload/archive/mainfile/{file_name}#/data'
+        reference_data['publication_entry'] = publications[key]
+
+    @staticmethod
+    def create_statistics(
+        mainfile: str, archive: 'EntryArchive', logger: 'BoundLogger'
+    ) -> None:
+        '''
+        Creates or replaces the MOFArchiveStatistics entry of the upload, so that it
+        is processed again after all entries, see `parsers.statistics_parser`. The
+        replacement keeps the running statistics of the last processing, so only
+        the entries added since are read, unless entries were updated or deleted.
+        '''
+        statistics = MOFArchiveStatistics()
+        if is_client_context(archive):
+            file_name = sibling_file_name(archive, mainfile, STATISTICS_FILE_NAME)
+        else:
+            file_name = STATISTICS_FILE_NAME
+            try:
+                previous = archive.m_context.load_archive(
+                    get_entry_id_from_file_name(file_name, archive),
+                    archive.metadata.upload_id,
+                    None,
+                ).data
+            except Exception:
+                # not processed yet
+                previous = None
+            if isinstance(previous, MOFArchiveStatistics):
+                for name in STATISTICS_STATE:
+                    setattr(statistics, name, getattr(previous, name))
+        try:
+            create_archive(statistics, archive, file_name, overwrite=True)
+        except Exception as e:
+            # e.g. created at the same time while parsing another file
+            logger.info('Could not create the statistics entry.', exc_info=e)
+
+    @staticmethod
+    def map_json_to_schema_with_type_check(source: dict, logger, fast_path: bool = True) -> dict:
         """
         Maps the JSON data to the MOFArchive schema using search calls,
         with robust type checking and conversion.
+
+        Well-formed records are mapped in a single pass by `validate_record`
+        first, unless `fast_path` is disabled.
         """
+        if fast_path:
+            missing = []
+            data = validate_record(source, missing)
+            if data is not None:
+                for key, path in missing:
+                    logger.info(MISSING_KEY_MESSAGE.format(key=key, path=path))
+                return data
 
         def search(path: str, data: dict, default=None, expected_type=None) -> Optional[object]:
             """
@@ -115,6 +444,8 @@ class MOFArchJsParser(MatchingParser):
                     check_type = bool
                 elif expected_type == str:
                     check_type = str
+                elif expected_type == list:
+                    check_type = list
 
                 if check_type:
                     if current is None:  # Allow None if the schema permits (e.g., cif_data)
@@ -129,7 +460,16 @@ class MOFArchJsParser(MatchingParser):
                             if check_type == float:
                                 current = float(current)
                             elif check_type == int:
-                                current = int(current)
+                                # int('2011.0') fails, so strings go through float, but
+                                # '2011.7' must not be truncated to 2011
+                                number = float(current)
+                                if not number.is_integer():
+                                    logger.warning(
+                                        f"Ignored the non-integral value '{current}' at path '{path}', "
+                                        f"expected {expected_type.__name__}."
+                                    )
+                                    return default
+                                current = int(number)
                             elif check_type == bool:
                                 # Convert common string representations of boolean
                                 if isinstance(current, str):
@@ -175,95 +515,11 @@ class MOFArchJsParser(MatchingParser):
 
 
         data = {}
-
-        # Top-level properties
-        data['common_name'] = search('common_name', source, expected_type=str)
-        data['identifier'] = search('identifier', source, expected_type=str)
-
-        # Transcriber: Handle list conversion if it's a string
-        transcriber_val = search('transcriber', source)
-        if isinstance(transcriber_val, str):
-            transcriber_val = transcriber_val.replace(' and ', ',')
-            transcriber_val = [t.strip() for t in transcriber_val.split(',') if t.strip()]
-        data['transcriber'] = transcriber_val  # The schema defines it as shape=['*'], so keep it a list
-
-        # Compositional Information
-        data['compositional_information'] = {
-            'metal_types': search('compositional_information.metal_types', source, expected_type=list),
-        }
-
-        # Calculational Structural Properties and Stability
-        data['calculation_properties'] = {
-            "structural_properties": {
-                'pore_characteristics': {
-                    "PLD_angstrom": search(
-                        'calculation_properties.structural_properties.pore_characteristics.PLD_angstrom',
-                        source, expected_type=float),
-                    "ASA_m2_cm3": search(
-                        'calculation_properties.structural_properties.pore_characteristics.ASA_m2_cm3',
-                        source, expected_type=float),
-                    "NASA_m2_cm3": search(
-                        'calculation_properties.structural_properties.pore_characteristics.NASA_m2_cm3',
-                        source, expected_type=float),
-                    "PV_cm3_g": search(
-                        'calculation_properties.structural_properties.pore_characteristics.PV_cm3_g',
-                        source, expected_type=float),
-                },
-                'topological_and_crystallographic_information': {
-                    "structure_dimension": search(
-                        'calculation_properties.structural_properties.topological_and_crystallographic_information.structure_dimension',
-                        source, expected_type=int),
-                    "topology_single_nodes": search(
-                        'calculation_properties.structural_properties.topological_and_crystallographic_information.topology_single_nodes',
-                        source, expected_type=str),
-                    "topology_all_nodes": search(
-                        'calculation_properties.structural_properties.topological_and_crystallographic_information.topology_all_nodes',
-                        source, expected_type=str),
-                    "catenation": search(
-                        'calculation_properties.structural_properties.topological_and_crystallographic_information.catenation',
-                        source, expected_type=int),
-                    "dimension_by_topo": search(
-                        'calculation_properties.structural_properties.topological_and_crystallographic_information.dimension_by_topo',
-                        source, expected_type=int),
-                    "hall": search(
-                        'calculation_properties.structural_properties.topological_and_crystallographic_information.hall',
-                        source, expected_type=str),
-                    "number_spacegroup": search(
-                        'calculation_properties.structural_properties.topological_and_crystallographic_information.number_spacegroup',
-                        source, expected_type=int),
-                }
-            },
-            'stability': {
-                "thermal_stability_celsius": search(
-                    'calculation_properties.stability.thermal_stability_celsius', source,
-                    expected_type=float),
-            },
-        }
-
-        # Structural Data
-        data['structural_data'] = {
-            "unmodified": search('structural_data.unmodified', source, expected_type=bool),
-            "cif_data": search('structural_data.cif_data', source, expected_type=str),
-            # Can be null, so str is fine if None
-        }
-
-        # Reference Data
-        data['reference_data'] = {
-            "year": search('reference_data.year', source, expected_type=str),
-            "publication": search('reference_data.publication', source, expected_type=str),
-            "doi": search('reference_data.doi', source, expected_type=str),
-        }
-
-        # Synthesis Information
-        data['synthesis_information'] = {
-            "synthesis_method": search('synthesis_information.synthesis_method', source, expected_type=str),
-            "synthesis_parameter": {
-                "starting_materials": search('synthesis_information.synthesis_parameter.starting_materials', source,expected_type=list),
-                "temperature": search('synthesis_information.synthesis_parameter.temperature.normalized_c', source,
-                                      expected_type=float),
-                "time": search('synthesis_information.synthesis_parameter.time.normalized_h', source,
-                               expected_type=float),
-            }
-        }
+        for target, path, expected_type in RECORD_FIELDS:
+            value = search(path, source, expected_type=expected_type)
+            if target == 'transcriber' and isinstance(value, str):
+                # the schema defines it as shape=['*'], so keep it a list
+                value = [t.strip() for t in value.replace(' and ', ',').split(',') if t.strip()]
+            set_path(data, target, value)
 
         return data
\ No newline at end of file
@@ -0,0 +1,32 @@
+'''
+Parser of the `MOFArchiveStatistics` entry of an upload.
+
+The MOFArchive parser writes `mofarch_statistics.archive.json` again whenever it
+adds, updates or removes entries, so that the statistics are processed again.
+NOMAD processes a file written during parsing right away, unless its parser has
+a higher level than the parser that wrote it. The statistics file therefore has
+this parser of level 1 instead of NOMAD's archive parser: it is processed after
+all MOFArchive entries of the upload were processed and indexed, including the
+entry whose parsing wrote it, and only once per processing of the upload.
+'''
+
+import json
+from typing import TYPE_CHECKING
+
+from nomad.parsing.parser import MatchingParser
+
+if TYPE_CHECKING:
+    from nomad.datamodel.datamodel import EntryArchive
+    from structlog.stdlib import BoundLogger
+
+
+class MOFStatisticsParser(MatchingParser):
+    def parse(
+        self,
+        mainfile: str,
+        archive: 'EntryArchive',
+        logger: 'BoundLogger',
+        child_archives: dict[str, 'EntryArchive'] = None,
+    ) -> None:
+        with open(mainfile) as file:
+            archive.m_update_from_dict(json.load(file))
@@ -25,6 +25,8 @@ from typing import (
     TYPE_CHECKING,
     Any,
 )
+
+import numpy as np
 from nomad.units import ureg
 
 if TYPE_CHECKING:
@@ -34,6 +36,7 @@ if TYPE_CHECKING:
     from nomad.datamodel.datamodel import (
         EntryArchive,
     )
+    from nomad.datamodel.results import Results
     from structlog.stdlib import (
         BoundLogger,
     )
@@ -48,22 +51,67 @@ def get_entry_id_from_file_name(file_name: str, archive: 'EntryArchive') -> str:
     return hash(archive.metadata.upload_id, file_name)
 
 
+def is_client_context(archive: 'EntryArchive') -> bool:
+    from nomad.datamodel.context import ClientContext
+    return isinstance(archive.m_context, ClientContext)
+
+
+def sibling_file_name(archive: 'EntryArchive', mainfile: str, file_name: str) -> str:
+    '''
+    The path of a file next to the mainfile, as used by the context of the archive:
+    relative to the upload on a server, a local path otherwise.
+    '''
+    if is_client_context(archive):
+        return os.path.join(os.path.dirname(mainfile), file_name)
+    return os.path.join(os.path.dirname(archive.metadata.mainfile), file_name)
+
+
+def read_json_file(archive: 'EntryArchive', file_name: str) -> Any:
+    import json
+    if is_client_context(archive):
+        if not os.path.exists(file_name):
+            return None
+        with open(file_name) as infile:
+            return json.load(infile)
+    if not archive.m_context.raw_path_exists(file_name):
+        return None
+    with archive.m_context.raw_file(file_name, 'r') as infile:
+        return json.load(infile)
+
+
+def write_json_file(archive: 'EntryArchive', file_name: str, data: Any) -> None:
+    import json
+    if is_client_context(archive):
+        with open(file_name, 'w') as outfile:
+            json.dump(data, outfile)
+        return
+    with archive.m_context.raw_file(file_name, 'w') as outfile:
+        json.dump(data, outfile)
+
+
 def create_archive(
         entity: 'ArchiveSection',
         archive: 'EntryArchive',
         file_name: str,
+        overwrite: bool = False,
+        results: 'Results' = None,
     ) -> str:
+    '''
+    Writes `entity` as the data of the archive file `file_name` and processes it,
+    with `results`, e.g. computed for many entries at once, if given.
+    '''
     import json
-    from nomad.datamodel.context import ClientContext
-    entity_entry = entity.m_to_dict(with_root_def=True)
-    if isinstance(archive.m_context, ClientContext):
+    entry = {"data": entity.m_to_dict(with_root_def=True)}
+    if results is not None:
+        entry["results"] = results.m_to_dict()
+    if is_client_context(archive):
         with open(file_name, 'w') as outfile:
-            json.dump({"data": entity_entry}, outfile, indent=4)
+            json.dump(entry, outfile, indent=4)
         return os.path.abspath(file_name)
-    if not archive.m_context.raw_path_exists(file_name):
+    if overwrite or not archive.m_context.raw_path_exists(file_name):
         with archive.m_context.raw_file(file_name, 'w') as outfile:
-            json.dump({"data": entity_entry}, outfile)
-        archive.m_context.process_updated_raw_file(file_name)
+            json.dump(entry, outfile)
+        archive.m_context.process_updated_raw_file(file_name, allow_modify=overwrite)
     return get_reference(
         archive.metadata.upload_id,
         get_entry_id_from_file_name(file_name, archive)
@@ -92,7 +140,8 @@ def merge_sections(
             section.m_set(quantity, update.m_get(quantity))
         elif (
             quantity.is_scalar and section.m_get(quantity) != update.m_get(quantity)
-            or quantity.repeats and (section.m_get(quantity) != update.m_get(quantity)).any()
+            or not quantity.is_scalar
+            and not np.array_equal(section.m_get(quantity), update.m_get(quantity))
         ):
             warning = f'Merging sections with different values for quantity "{name}".'
             if logger:
@@ -0,0 +1,112 @@
+'''
+Single pass validation and mapping of well-formed `.mofarch.json` records.
+
+`MOFArchJsParser.map_json_to_schema_with_type_check` maps every field with a
+tolerant `search` that converts strings to numbers, parses booleans and list
+literals and logs every conversion. Most records need none of that. From the
+field table `RECORD_FIELDS`, a validator is generated as straight-line Python
+code that walks a record once, checks that every present value already has its
+exact type and builds the mapped data at the same time. Records that pass are
+mapped without any coercion logic; for any other record the validator returns
+`None` and the tolerant path maps it.
+
+A record passes if it is a JSON object whose sections are objects and whose
+values have the expected type or are `null`. Missing fields and sections are
+allowed and reported as the tolerant path does.
+'''
+
+from typing import Any
+
+from nomad_novelmof.fields import RECORD_FIELDS
+
+MISSING_KEY_MESSAGE = (
+    "Key '{key}' not found in path '{path}'. Returning default value 'None'."
+)
+
+
+def set_path(data: dict, path: str, value: Any) -> None:
+    *sections, name = path.split('.')
+    for section in sections:
+        data = data.setdefault(section, {})
+    data[name] = value
+
+
+def _tree(fields: list[tuple[str, str, type | None]]) -> dict:
+    '''
+    The record paths as nested dicts, with the index of the field at the leaves.
+    '''
+    tree: dict = {}
+    for index, (_, path, _) in enumerate(fields):
+        *sections, name = path.split('.')
+        node = tree
+        for section in sections:
+            node = node.setdefault(section, {})
+        node[name] = index
+    return tree
+
+
+def _leaves(node: dict | int) -> list[int]:
+    if isinstance(node, int):
+        return [node]
+    return [index for child in node.values() for index in _leaves(child)]
+
+
+def compile_validator(fields: list[tuple[str, str, type | None]] = RECORD_FIELDS):
+    '''
+    Generates the validator of records with the given fields. It is called with
+    the record and a list to which the `(key, path)` of missing fields are
+    appended, and returns the mapped data or `None` if the record is not
+    well-formed.
+    '''
+    lines = [
+        'def validate(source, missing):',
+        '    if type(source) is not dict:',
+        '        return None',
+    ]
+    lines += [f'    v{index} = None' for index in range(len(fields))]
+    constants: dict[str, Any] = {'_missing': object()}
+
+    def emit(node: dict, variable: str, depth: int, indent: str) -> None:
+        for key, child in node.items():
+            name = f'x{depth}_{len(lines)}'
+            lines.append(f'{indent}{name} = {variable}.get({key!r}, _missing)')
+            leaves = _leaves(child)
+            missing = tuple((key, fields[index][1]) for index in leaves)
+            constants[f'm_{name}'] = missing
+            lines.append(f'{indent}if {name} is _missing:')
+            lines.append(f'{indent}    missing.extend(m_{name})')
+            if isinstance(child, int):
+                expected_type = fields[child][2]
+                constants[f't{child}'] = expected_type or list
+                lines.append(f'{indent}elif {name} is not None:')
+                lines.append(f'{indent}    if type({name}) is not t{child}:')
+                lines.append(f'{indent}        return None')
+                lines.append(f'{indent}    v{child} = {name}')
+            else:
+                lines.append(f'{indent}elif type({name}) is not dict:')
+                lines.append(f'{indent}    return None')
+                lines.append(f'{indent}else:')
+                emit(child, name, depth + 1, indent + '    ')
+
+    emit(_tree(fields), 'source', 0, '    ')
+
+    result: dict = {}
+    for index, (target, _, _) in enumerate(fields):
+        set_path(result, target, f'v{index}')
+
+    def literal(node: dict | str) -> str:
+        if isinstance(node, str):
+            return node
+        items = ', '.join(f'{key!r}: {literal(value)}' for key, value in node.items())
+        return '{' + items + '}'
+
+    lines.append(f'    return {literal(result)}')
+    code = '\n'.join(lines)
+    namespace = dict(constants)
+    exec(compile(code, '<mofarch record validator>', 'exec'), namespace)
+    validate = namespace['validate']
+    validate.source = code
+    return validate
+
+
+validate_record = compile_validator()
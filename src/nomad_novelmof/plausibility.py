@@ -0,0 +1,166 @@
+'''
+Dataset-wide plausibility checks of MOFArchive descriptors.
+
+Per-entry parsing accepts every value of the right type, so implausible values
+like negative pore volumes, a PLD larger than the unit cell, synthesis
+temperatures in kelvin stored as celsius or dimensions above 3 slip through.
+`plausibility_flags` checks whole columns at once: every rule of `RULES` is one
+vectorized comparison, and values far from the bulk of their column are outliers
+by their modified z-score, computed from the median and the median absolute
+deviation (MAD) of the column (Iglewicz and Hoaglin). Only the rows with flags
+are visited one by one, so a million records are screened in seconds.
+
+Columns are addressed by the names of `fields.COLUMNS`, plus
+`max_cell_length_angstrom`, the longest cell edge read from the CIF.
+'''
+
+import re
+from collections.abc import Callable
+
+import numpy as np
+
+# record columns that the checks read
+CHECKED_COLUMNS = [
+    'PLD_angstrom',
+    'ASA_m2_cm3',
+    'NASA_m2_cm3',
+    'PV_cm3_g',
+    'structure_dimension',
+    'catenation',
+    'dimension_by_topo',
+    'number_spacegroup',
+    'thermal_stability_celsius',
+    'synthesis_temperature_celsius',
+    'synthesis_time_h',
+    'max_cell_length_angstrom',
+]
+# columns with outlier detection
+OUTLIER_COLUMNS = [
+    'PLD_angstrom',
+    'ASA_m2_cm3',
+    'NASA_m2_cm3',
+    'PV_cm3_g',
+    'thermal_stability_celsius',
+    'synthesis_temperature_celsius',
+    'synthesis_time_h',
+]
+# modified z-score above which a value is an outlier
+OUTLIER_Z = 3.5
+# minimum number of values of a column to estimate its median and MAD
+MIN_OUTLIER_ROWS = 30
+# MOF syntheses, including ionothermal and high temperature routes, stay below
+# this many degrees celsius. Values above it are only plausible as kelvin, up to
+# the same temperature in kelvin, so no valid celsius value is taken for kelvin;
+# kelvin values below it are left to the outlier check.
+MAX_SYNTHESIS_CELSIUS = 400.0
+
+# (flag, rule) of the rules, a rule returns the mask of offending rows
+RULES: list[tuple[str, Callable[[dict[str, np.ndarray]], np.ndarray]]] = [
+    *(
+        (f'negative_{column}', lambda c, column=column: c[column] < 0)
+        for column in [
+            'PLD_angstrom',
+            'ASA_m2_cm3',
+            'NASA_m2_cm3',
+            'PV_cm3_g',
+            'synthesis_time_h',
+        ]
+    ),
+    (
+        'PLD_exceeds_cell',
+        lambda c: c['PLD_angstrom'] > c['max_cell_length_angstrom'],
+    ),
+    (
+        'structure_dimension_out_of_range',
+        lambda c: (c['structure_dimension'] < 0) | (c['structure_dimension'] > 3),
+    ),
+    (
+        'dimension_by_topo_out_of_range',
+        lambda c: (c['dimension_by_topo'] < 0) | (c['dimension_by_topo'] > 3),
+    ),
+    ('negative_catenation', lambda c: c['catenation'] < 0),
+    (
+        'number_spacegroup_out_of_range',
+        lambda c: (c['number_spacegroup'] < 1) | (c['number_spacegroup'] > 230),
+    ),
+    (
+        'synthesis_temperature_in_kelvin',
+        lambda c: (c['synthesis_temperature_celsius'] > MAX_SYNTHESIS_CELSIUS)
+        & (c['synthesis_temperature_celsius'] <= MAX_SYNTHESIS_CELSIUS + 273.15),
+    ),
+    (
+        'synthesis_temperature_out_of_range',
+        lambda c: c['synthesis_temperature_celsius'] > MAX_SYNTHESIS_CELSIUS + 273.15,
+    ),
+    (
+        'synthesis_temperature_below_absolute_zero',
+        lambda c: c['synthesis_temperature_celsius'] < -273.15,
+    ),
+]
+
+CELL_LENGTH_PATTERN = re.compile(r'^\s*_cell_length_[abc]\s+([0-9.]+)', re.MULTILINE)
+
+
+def max_cell_length(cif_data: str | None) -> float:
+    '''
+    The longest cell edge in a CIF, read from its `_cell_length_*` items without
+    parsing the structure. NaN if there is none.
+    '''
+    if not cif_data:
+        return np.nan
+    lengths = [float(length) for length in CELL_LENGTH_PATTERN.findall(cif_data)]
+    return max(lengths) if lengths else np.nan
+
+
+def robust_statistics(columns: dict[str, np.ndarray]) -> dict[str, list[float]]:
+    '''
+    The `[median, MAD]` of the outlier columns with at least `MIN_OUTLIER_ROWS`
+    finite values.
+    '''
+    statistics = {}
+    for column in OUTLIER_COLUMNS:
+        values = columns.get(column)
+        if values is None:
+            continue
+        values = values[np.isfinite(values)]
+        if len(values) < MIN_OUTLIER_ROWS:
+            continue
+        median = np.median(values)
+        statistics[column] = [float(median), float(np.median(np.abs(values - median)))]
+    return statistics
+
+
+def plausibility_flags(
+    columns: dict[str, np.ndarray],
+    n_rows: int,
+    statistics: dict[str, list[float]] | None = None,
+) -> dict[int, list[str]]:
+    '''
+    The flags of all rows with at least one, by row. Missing columns and NaN
+    values pass all checks. Outliers are detected with the given `statistics`
+    of `robust_statistics`, by default those of the columns themselves.
+    '''
+    nan = np.full(n_rows, np.nan)
+    columns = {
+        column: np.asarray(columns[column], dtype=float) if column in columns else nan
+        for column in CHECKED_COLUMNS
+    }
+    if statistics is None:
+        statistics = robust_statistics(columns)
+    names, masks = [], []
+    with np.errstate(invalid='ignore'):
+        for name, rule in RULES:
+            names.append(name)
+            masks.append(rule(columns))
+        for column, (median, mad) in statistics.items():
+            if column not in columns or not mad > 0:
+                continue
+            names.append(f'{column}_outlier')
+            masks.append(np.abs(0.6745 * (columns[column] - median) / mad) > OUTLIER_Z)
+    flags: dict[int, list[str]] = {}
+    if not masks:
+        return flags
+    rows, checks = np.nonzero(np.column_stack(masks))
+    for row, check in zip(rows.tolist(), checks.tolist()):
+        flags.setdefault(row, []).append(names[check])
+    return flags
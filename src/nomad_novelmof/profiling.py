@@ -0,0 +1,245 @@
+'''
+Lightweight instrumentation of parsing and normalization.
+
+A `StageTimer` measures the wall time of the named stages of processing one
+entry and logs them as one structured event with a `stage_timings` field, so they
+end up in the processing logs of the entry. A disabled timer hands out a shared
+no-op context manager, so the spans can stay in the code at negligible cost.
+`TimingReport` aggregates the timings of many entries into percentiles per stage.
+
+A `MemoryProfile` records the peak memory allocated while processing one entry
+with `tracemalloc` and, for entries above a threshold, the source lines that hold
+the most memory at the end, so pathological records can be found before they run
+a worker out of memory. Tracing slows down processing considerably and is meant
+to be switched on temporarily. `tracemalloc` and `numpy` are only imported when
+they are used, as the parsers and the schema import this module on load.
+'''
+
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+from contextlib import nullcontext
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from structlog.stdlib import BoundLogger
+
+STAGE_TIMINGS_EVENT = 'Stage timings.'
+MEMORY_PROFILE_EVENT = 'Memory profile.'
+
+_disabled_span = nullcontext()
+
+
+class _Span:
+    __slots__ = ('durations', 'stage', 'start')
+
+    def __init__(self, durations: dict[str, float], stage: str):
+        self.durations = durations
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *args):
+        elapsed = time.perf_counter() - self.start
+        self.durations[self.stage] = self.durations.get(self.stage, 0.0) + elapsed
+
+
+class StageTimer:
+    '''
+    Collects the durations of the stages of processing one entry by one
+    component, e.g. a parser. Stages are named `<component>.<stage>`, and repeated
+    spans of the same stage add up.
+
+        timer = StageTimer('MOFArchJsParser', configuration.log_stage_timings)
+        with timer.span('json_load'):
+            ...
+        timer.log(logger, mainfile=mainfile)
+    '''
+
+    def __init__(self, component: str, enabled: bool = True):
+        self.component = component
+        self.enabled = enabled
+        self.durations: dict[str, float] = {}
+
+    def span(self, stage: str):
+        if not self.enabled:
+            return _disabled_span
+        return _Span(self.durations, f'{self.component}.{stage}')
+
+    def log(self, logger: 'BoundLogger', **fields) -> None:
+        if self.enabled and self.durations:
+            logger.info(
+                STAGE_TIMINGS_EVENT,
+                stage_timings={
+                    stage: round(duration, 6)
+                    for stage, duration in self.durations.items()
+                },
+                **fields,
+            )
+
+
+class TimingReport:
+    '''
+    Count, median, 95th percentile and maximum duration per stage over many
+    entries.
+    '''
+
+    def __init__(self):
+        self.durations: dict[str, list[float]] = defaultdict(list)
+
+    def add(self, stage_timings: dict[str, float]) -> None:
+        for stage, duration in stage_timings.items():
+            self.durations[stage].append(duration)
+
+    def add_logs(self, processing_logs: Iterable[dict]) -> None:
+        '''
+        Adds the stage timings from the processing logs of an entry.
+        '''
+        for event in processing_logs:
+            if event.get('event') == STAGE_TIMINGS_EVENT:
+                self.add(event.get('stage_timings') or {})
+
+    def summary(self) -> dict[str, dict]:
+        import numpy as np
+
+        summary = {}
+        for stage, durations in self.durations.items():
+            p50, p95 = np.percentile(durations, [50, 95])
+            summary[stage] = dict(
+                count=len(durations),
+                p50=float(p50),
+                p95=float(p95),
+                max=float(np.max(durations)),
+            )
+        return summary
+
+    def format(self) -> str:
+        lines = [f'{"stage":<40}{"count":>8}{"p50 ms":>12}{"p95 ms":>12}{"max ms":>12}']
+        for stage, row in sorted(self.summary().items()):
+            lines.append(
+                f'{stage:<40}{row["count"]:>8}{row["p50"] * 1e3:>12.2f}'
+                f'{row["p95"] * 1e3:>12.2f}{row["max"] * 1e3:>12.2f}'
+            )
+        return '\n'.join(lines)
+
+
+# the enclosing profiles, whose peaks a nested profile must not lose
+_open_profiles: list['MemoryProfile'] = []
+
+
+def _reset_peak() -> None:
+    '''
+    Resets the peak of `tracemalloc`, after keeping it in the open profiles.
+    '''
+    import tracemalloc
+
+    peak = tracemalloc.get_traced_memory()[1]
+    for profile in _open_profiles:
+        profile._peak = max(profile._peak, peak)
+    tracemalloc.reset_peak()
+
+
+class MemoryProfile:
+    '''
+    Context manager that records the peak traced memory of processing one entry.
+    Starts `tracemalloc` if it is not running and stops it again afterwards.
+    Profiles can be nested, e.g. for the child entries that a bulk parser
+    processes, and the peak of the outer one includes those of the inner ones.
+
+        with MemoryProfile(configuration.profile_memory, threshold) as profile:
+            ...
+        profile.log(logger, identifier=identifier)
+    '''
+
+    def __init__(self, enabled: bool, threshold_bytes: float, top_sites: int = 10):
+        self.enabled = enabled
+        self.threshold_bytes = threshold_bytes
+        self.top_sites = top_sites
+        self.peak_bytes: int | None = None
+        self.sites: list[str] = []
+        self._started = False
+
+    def __enter__(self) -> 'MemoryProfile':
+        if self.enabled:
+            import tracemalloc
+
+            self._started = not tracemalloc.is_tracing()
+            if self._started:
+                tracemalloc.start()
+            _reset_peak()
+            self._peak = 0
+            self._baseline = tracemalloc.get_traced_memory()[0]
+            _open_profiles.append(self)
+        return self
+
+    def __exit__(self, *args) -> None:
+        if not self.enabled:
+            return
+        import tracemalloc
+
+        _open_profiles.remove(self)
+        peak = max(self._peak, tracemalloc.get_traced_memory()[1])
+        self.peak_bytes = peak - self._baseline
+        if self.peak_bytes > self.threshold_bytes:
+            # leave out tracemalloc itself and modules imported on first use
+            snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+            ])
+            self.sites = [
+                f'{stat.traceback[0].filename}:{stat.traceback[0].lineno} '
+                f'{stat.size / 1024**2:.1f} MiB in {stat.count} blocks'
+                for stat in snapshot.statistics('lineno')[: self.top_sites]
+            ]
+        if self._started:
+            tracemalloc.stop()
+
+    @property
+    def is_outlier(self) -> bool:
+        return self.peak_bytes is not None and self.peak_bytes > self.threshold_bytes
+
+    def log(self, logger: 'BoundLogger', component: str, **fields) -> None:
+        if self.peak_bytes is None:
+            return
+        log = logger.warning if self.is_outlier else logger.info
+        log(
+            MEMORY_PROFILE_EVENT,
+            component=component,
+            peak_bytes=self.peak_bytes,
+            outlier=self.is_outlier,
+            top_allocation_sites=self.sites,
+            **fields,
+        )
+
+
+class MemoryReport:
+    '''
+    The peak memory of the entries of an upload, from their processing logs.
+    '''
+
+    def __init__(self):
+        self.peaks: list[tuple[int, str, str]] = []
+
+    def add_logs(self, processing_logs: Iterable[dict], entry: str = '') -> None:
+        for event in processing_logs:
+            if event.get('event') == MEMORY_PROFILE_EVENT:
+                self.peaks.append((
+                    event.get('peak_bytes') or 0,
+                    event.get('identifier') or entry,
+                    event.get('component', ''),
+                ))
+
+    def outliers(self, threshold_bytes: float = 0, size: int = 20) -> list[tuple]:
+        '''
+        The `(peak_bytes, identifier, component)` of the entries with the highest
+        peak above `threshold_bytes`, highest first.
+        '''
+        peaks = [peak for peak in self.peaks if peak[0] > threshold_bytes]
+        return sorted(peaks, reverse=True)[:size]
+
+    def format(self, threshold_bytes: float = 0, size: int = 20) -> str:
+        lines = [f'{"peak MiB":>10}  {"component":<16}identifier']
+        for peak, identifier, component in self.outliers(threshold_bytes, size):
+            lines.append(f'{peak / 1024**2:>10.1f}  {component:<16}{identifier}')
+        return '\n'.join(lines)
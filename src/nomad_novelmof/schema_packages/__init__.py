@@ -1,4 +1,5 @@
 from nomad.config.models.plugins import SchemaPackageEntryPoint
+from pydantic import Field
 # from pydantic import Field
 #
 #
@@ -16,7 +17,73 @@ from nomad.config.models.plugins import SchemaPackageEntryPoint
 #     description='New schema package entry point configuration.',
 # )
 
+# The MOFArchive quantities that apps filter, sort or aggregate on. Free text and
+# bulk quantities like `transcriber` or
+# `synthesis_information.synthesis_parameter.starting_materials` are left out on
+# purpose. The CIF text is not stored in `data` after processing, see
+# `StructuralData`, so it is not indexed either.
+SEARCHABLE_QUANTITIES = [
+    'data.common_name',
+    'data.identifier',
+    'data.calculation_properties.structural_properties.pore_characteristics.PLD_angstrom',
+    'data.calculation_properties.structural_properties.pore_characteristics.ASA_m2_cm3',
+    'data.calculation_properties.structural_properties.pore_characteristics.NASA_m2_cm3',
+    'data.calculation_properties.structural_properties.pore_characteristics.PV_cm3_g',
+    'data.calculation_properties.structural_properties.topological_and_crystallographic_information.structure_dimension',
+    'data.calculation_properties.structural_properties.topological_and_crystallographic_information.topology_single_nodes',
+    'data.calculation_properties.structural_properties.topological_and_crystallographic_information.topology_all_nodes',
+    'data.calculation_properties.structural_properties.topological_and_crystallographic_information.catenation',
+    'data.calculation_properties.structural_properties.topological_and_crystallographic_information.dimension_by_topo',
+    'data.calculation_properties.structural_properties.topological_and_crystallographic_information.hall',
+    'data.calculation_properties.structural_properties.topological_and_crystallographic_information.number_spacegroup',
+    'data.calculation_properties.structural_properties.topological_and_crystallographic_information.crystal_system',
+    'data.calculation_properties.stability.thermal_stability_celsius',
+    'data.structural_data.unmodified',
+    'data.structural_data.structure_formula',
+    'data.structural_data.structure_hash',
+    'data.reference_data.year',
+    'data.reference_data.publication',
+    'data.reference_data.doi',
+    'data.synthesis_information.synthesis_method',
+    'data.synthesis_information.synthesis_parameter.temperature',
+    'data.synthesis_information.synthesis_parameter.time',
+    'data.building_blocks.metal_nodes',
+    'data.building_blocks.linkers',
+    'data.building_blocks.topology',
+    'data.plausibility_flags',
+]
+
+
 class NovelMOFSchemaEntryPoint(SchemaPackageEntryPoint):
+    structure_from_cif: bool = Field(
+        False,
+        description='Derive formulas, symmetry and the structure system of results.material from the CIF of MOFArchive entries.',
+    )
+    fingerprint_structures: bool = Field(
+        False,
+        description='Fingerprint the structure in the CIF of MOFArchive entries and look up entries with the same structure hash.',
+    )
+    cache_path: str | None = Field(
+        None,
+        description='Path of an SQLite file that caches the results of structure analyses across processes. No caching if not set.',
+    )
+    cache_max_bytes: int = Field(
+        1024**3,
+        description='Maximum size of the cached results, the least recently used results are evicted first.',
+    )
+    log_stage_timings: bool = Field(
+        False,
+        description='Log the duration of each normalization stage as structured `stage_timings`.',
+    )
+    profile_memory: bool = Field(
+        False,
+        description='Trace the peak memory of every entry with `tracemalloc` and log the top allocation sites of outliers. Slows down processing.',
+    )
+    memory_threshold_mb: float = Field(
+        200,
+        description='Peak memory in MiB above which an entry is reported as an outlier.',
+    )
+
     def load(self):
         from nomad_novelmof.schema_packages.novelmof_mofarch import m_package
 
@@ -0,0 +1,276 @@
+'''
+Persistent cache for results of structure analyses, shared by all processes.
+
+NOMAD normalizes entries in many worker processes, so in-memory memoization of
+CIF parsing, symmetry or porosity analysis is lost between workers and restarts.
+Results are stored instead in an SQLite file in WAL mode, which allows concurrent
+readers and writers from different processes. Entries are keyed by the analysis,
+its version and the hash of the analysed structure, so bumping the version of an
+analysis invalidates its old results. The total size is bounded by evicting the
+least recently used entries, and hits and misses are counted per analysis.
+
+Reads do not write: the access times of hits and the hit and miss counts are
+collected in memory and written in one transaction every `FLUSH_EVERY` reads or
+`FLUSH_SECONDS` seconds, before an eviction and when the process exits. Access
+times can thus lag a little behind between processes, which only makes the
+eviction order approximate.
+
+Values must be JSON serializable. Any error of the cache itself is logged and
+treated as a miss, so the cache never fails a normalization.
+'''
+
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from structlog.stdlib import BoundLogger
+
+DEFAULT_MAX_BYTES = 1024**3
+# eviction frees space down to this fraction of the maximum size, so that it does
+# not run again on the next write
+EVICTION_TARGET = 0.9
+FLUSH_EVERY = 100
+FLUSH_SECONDS = 10.0
+
+
+def content_hash(structure: str | bytes) -> str:
+    '''
+    The key of a structure: the hash of the content of its structure file.
+    '''
+    if isinstance(structure, str):
+        structure = structure.encode()
+    return hashlib.sha1(structure).hexdigest()
+
+
+class StructureCache:
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(
+            '''
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access);
+            CREATE TABLE IF NOT EXISTS total (
+                id INTEGER PRIMARY KEY CHECK (id = 0),
+                size INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO total VALUES (0, 0);
+            CREATE TRIGGER IF NOT EXISTS results_insert AFTER INSERT ON results
+            BEGIN UPDATE total SET size = size + new.size; END;
+            CREATE TRIGGER IF NOT EXISTS results_update AFTER UPDATE OF size ON results
+            BEGIN UPDATE total SET size = size + new.size - old.size; END;
+            CREATE TRIGGER IF NOT EXISTS results_delete AFTER DELETE ON results
+            BEGIN UPDATE total SET size = size - old.size; END;
+            CREATE TABLE IF NOT EXISTS metrics (
+                analysis TEXT PRIMARY KEY,
+                hits INTEGER NOT NULL DEFAULT 0,
+                misses INTEGER NOT NULL DEFAULT 0
+            );
+            '''
+        )
+        # access times and hit and miss counts not written yet
+        self.accessed: dict[str, float] = {}
+        self.counts: dict[str, list[int]] = {}
+        self.n_pending = 0
+        self.flushed = time.monotonic()
+
+    def close(self) -> None:
+        self.flush()
+        self.connection.close()
+
+    @staticmethod
+    def key(analysis: str, version: int | str, structure_key: str) -> str:
+        return f'{analysis}:{version}:{structure_key}'
+
+    def get(self, analysis: str, version: int | str, structure_key: str) -> Any | None:
+        key = self.key(analysis, version, structure_key)
+        row = self.connection.execute(
+            'SELECT value FROM results WHERE key = ?', (key,)
+        ).fetchone()
+        if row is not None:
+            self.accessed[key] = time.time()
+        self.counts.setdefault(analysis, [0, 0])[0 if row is not None else 1] += 1
+        self.n_pending += 1
+        if (
+            self.n_pending >= FLUSH_EVERY
+            or time.monotonic() - self.flushed >= FLUSH_SECONDS
+        ):
+            self.flush()
+        return None if row is None else json.loads(row[0])
+
+    def flush(self) -> None:
+        '''
+        Writes the collected access times and hit and miss counts.
+        '''
+        if not self.n_pending:
+            return
+        accessed, counts = self.accessed, self.counts
+        self.accessed, self.counts, self.n_pending = {}, {}, 0
+        self.flushed = time.monotonic()
+        self.connection.execute('BEGIN')
+        try:
+            self.connection.executemany(
+                'UPDATE results SET last_access = MAX(last_access, ?) WHERE key = ?',
+                [(last_access, key) for key, last_access in accessed.items()],
+            )
+            self.connection.executemany(
+                'INSERT INTO metrics VALUES (?, ?, ?) ON CONFLICT (analysis) DO UPDATE '
+                'SET hits = hits + excluded.hits, misses = misses + excluded.misses',
+                [(analysis, *counts_) for analysis, counts_ in counts.items()],
+            )
+        except sqlite3.Error:
+            self.connection.execute('ROLLBACK')
+            raise
+        self.connection.execute('COMMIT')
+
+    def set(self, analysis: str, version: int | str, structure_key: str, value) -> None:
+        data = json.dumps(value, separators=(',', ':'))
+        self.connection.execute(
+            'INSERT INTO results VALUES (?, ?, ?, ?) ON CONFLICT (key) DO UPDATE '
+            'SET value = excluded.value, size = excluded.size, '
+            'last_access = excluded.last_access',
+            (self.key(analysis, version, structure_key), data, len(data), time.time()),
+        )
+        self.evict()
+
+    def evict(self) -> int:
+        '''
+        Removes least recently used results if the total size exceeds `max_bytes`.
+        Returns the number of removed results.
+        '''
+        total = self.size()
+        if total <= self.max_bytes:
+            return 0
+        self.flush()
+        target = EVICTION_TARGET * self.max_bytes
+        removed = 0
+        while total > target:
+            rows = self.connection.execute(
+                'SELECT key, size FROM results ORDER BY last_access LIMIT 1000'
+            ).fetchall()
+            if not rows:
+                break
+            keys = []
+            for key, size in rows:
+                if total <= target:
+                    break
+                keys.append((key,))
+                total -= size
+            self.connection.executemany('DELETE FROM results WHERE key = ?', keys)
+            removed += len(keys)
+        return removed
+
+    def size(self) -> int:
+        return self.connection.execute('SELECT size FROM total').fetchone()[0]
+
+    def metrics(self) -> dict[str, dict]:
+        '''
+        Hits, misses and hit rate per analysis.
+        '''
+        self.flush()
+        return {
+            analysis: dict(
+                hits=hits,
+                misses=misses,
+                hit_rate=hits / (hits + misses) if hits + misses else None,
+            )
+            for analysis, hits, misses in self.connection.execute(
+                'SELECT analysis, hits, misses FROM metrics'
+            )
+        }
+
+    def cached(
+        self,
+        analysis: str,
+        version: int | str,
+        structure_key: str,
+        compute: Callable[[], Any],
+        logger: 'BoundLogger | None' = None,
+    ) -> Any:
+        '''
+        Returns the cached result of an analysis, or computes and stores it.
+        '''
+        try:
+            value = self.get(analysis, version, structure_key)
+        except sqlite3.Error as e:
+            if logger:
+                logger.warning('Could not read from the structure cache.', exc_info=e)
+            return compute()
+        if value is not None:
+            return value
+        value = compute()
+        if value is not None:
+            try:
+                self.set(analysis, version, structure_key, value)
+            except sqlite3.Error as e:
+                if logger:
+                    logger.warning('Could not write to the structure cache.', exc_info=e)
+        return value
+
+
+_caches: dict[tuple[int, str], StructureCache] = {}
+
+
+def get_cache(
+    path: str | None,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    logger: 'BoundLogger | None' = None,
+) -> StructureCache | None:
+    '''
+    The cache at `path` for the current process, or `None` if no path is
+    configured or the cache cannot be opened. Connections are not shared with
+    forked processes.
+    '''
+    if not path:
+        return None
+    key = (os.getpid(), path)
+    if key not in _caches:
+        try:
+            cache = StructureCache(path, max_bytes)
+        except (OSError, sqlite3.Error) as e:
+            if logger:
+                logger.warning('Could not open the structure cache.', exc_info=e)
+            return None
+        atexit.register(_flush, cache)
+        _caches[key] = cache
+    return _caches[key]
+
+
+def _flush(cache: StructureCache) -> None:
+    try:
+        cache.flush()
+    except sqlite3.Error:
+        pass
+
+
+def cached(
+    cache: StructureCache | None,
+    analysis: str,
+    version: int | str,
+    structure_key: str,
+    compute: Callable[[], Any],
+    logger: 'BoundLogger | None' = None,
+) -> Any:
+    '''
+    `StructureCache.cached` that just computes the result without a cache.
+    '''
+    if cache is None:
+        return compute()
+    return cache.cached(analysis, version, structure_key, compute, logger)
@@ -0,0 +1,268 @@
+'''
+HDF5 storage of MOF descriptor tables with millions of rows.
+
+Screening studies produce millions of hypothetical MOFs with nothing but their
+descriptors, for which one `MOFArchive` entry per row is far too heavy. A
+descriptor table keeps one chunked, compressed HDF5 dataset per column of
+`TABLE_COLUMNS` in the group `/descriptors` of a single file, which a
+`MOFDescriptorTable` entry refers to.
+
+`DescriptorTableWriter` streams rows into the datasets one chunk at a time, so
+writing needs memory for one chunk per column independent of the number of
+rows. `DescriptorTable` reads slices and filters the table chunk by chunk, so
+only the chunks of the touched rows are read and decompressed, never the whole
+table:
+
+    with DescriptorTable(path) as table:
+        rows = table.filter(ranges={'PLD_angstrom': (3, 8)}, equals={'catenation': [1]})
+        selected = table.take(rows, ['identifier', 'PLD_angstrom'])
+
+Missing floats are stored as NaN, missing integers as -1 and missing strings as
+empty strings. The small integer columns are stored as int16, and values out of
+its range are rejected instead of wrapped around.
+
+Memory-mapped access is not provided: the datasets are chunked and compressed,
+so reads always go through h5py and decompress whole chunks.
+'''
+
+from collections.abc import Iterable, Iterator
+from typing import IO, Any
+
+import numpy as np
+
+GROUP = 'descriptors'
+CHUNK_ROWS = 65536
+MISSING_INT = -1
+
+# column -> (numpy dtype, unit); the dtype `str` is stored as variable length UTF-8
+TABLE_COLUMNS: dict[str, tuple[Any, str | None]] = {
+    'identifier': (str, None),
+    'PLD_angstrom': (np.float64, 'angstrom'),
+    'ASA_m2_cm3': (np.float64, 'm**2/cm**3'),
+    'NASA_m2_cm3': (np.float64, 'm**2/cm**3'),
+    'PV_cm3_g': (np.float64, 'cm**3/g'),
+    'structure_dimension': (np.int16, None),
+    'catenation': (np.int16, None),
+    'number_spacegroup': (np.int16, None),
+}
+
+
+def missing_value(dtype) -> Any:
+    if dtype is str:
+        return ''
+    return np.nan if np.issubdtype(dtype, np.floating) else MISSING_INT
+
+
+def column_array(values: Iterable, dtype) -> np.ndarray:
+    '''
+    The values of a column as an array of its stored dtype, with `None` replaced
+    by the missing value.
+    '''
+    if dtype is str:
+        if isinstance(values, np.ndarray):
+            return values.astype(object, copy=False)
+        return np.array(
+            ['' if value is None else value for value in values], dtype=object
+        )
+    if not isinstance(values, np.ndarray):
+        missing = missing_value(dtype)
+        values = np.asarray(
+            [missing if value is None else value for value in values], dtype=object
+        )
+    if np.issubdtype(dtype, np.integer) and len(values):
+        # numpy wraps around silently when casting arrays
+        info = np.iinfo(dtype)
+        numbers = values.astype(np.float64)
+        if np.any((numbers < info.min) | (numbers > info.max)):
+            raise ValueError(f'Values out of the range of {np.dtype(dtype)}.')
+    return values.astype(dtype, copy=False)
+
+
+class DescriptorTableWriter:
+    '''
+    Writes a descriptor table into a new HDF5 file, given as path or binary file
+    object. Rows are buffered and written one chunk at a time.
+
+        with DescriptorTableWriter(path) as writer:
+            for row in rows:
+                writer.append(row)
+    '''
+
+    def __init__(
+        self,
+        file: str | IO[bytes],
+        chunk_rows: int = CHUNK_ROWS,
+        compression: str | None = 'gzip',
+    ):
+        import h5py
+
+        self.h5 = h5py.File(file, 'w')
+        self.group = self.h5.create_group(GROUP)
+        self.chunk_rows = chunk_rows
+        self.n_rows = 0
+        self.buffers: dict[str, list] = {column: [] for column in TABLE_COLUMNS}
+        for column, (dtype, unit) in TABLE_COLUMNS.items():
+            dataset = self.group.create_dataset(
+                column,
+                shape=(0,),
+                maxshape=(None,),
+                chunks=(chunk_rows,),
+                dtype=h5py.string_dtype() if dtype is str else dtype,
+                compression=compression,
+                shuffle=compression is not None and dtype is not str,
+                fillvalue=None if dtype is str else missing_value(dtype),
+            )
+            if unit:
+                dataset.attrs['units'] = unit
+
+    def __enter__(self) -> 'DescriptorTableWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def append(self, row: dict) -> None:
+        '''
+        Adds a row as a dict from column to value. Missing columns are missing
+        values.
+        '''
+        for column, buffer in self.buffers.items():
+            buffer.append(row.get(column))
+        if len(self.buffers['identifier']) >= self.chunk_rows:
+            self.flush()
+
+    def append_columns(self, columns: dict[str, np.ndarray | list]) -> None:
+        '''
+        Adds rows given as one array per column, e.g. a chunk of converted values.
+        Missing columns are missing values.
+        '''
+        self.flush()
+        self._write(columns, len(next(iter(columns.values()))))
+
+    def flush(self) -> None:
+        n = len(self.buffers['identifier'])
+        if n:
+            self._write(self.buffers, n)
+            for buffer in self.buffers.values():
+                buffer.clear()
+
+    def _write(self, columns: dict[str, np.ndarray | list], n: int) -> None:
+        for column, (dtype, _) in TABLE_COLUMNS.items():
+            values = columns.get(column)
+            dataset = self.group[column]
+            dataset.resize((self.n_rows + n,))
+            dataset[self.n_rows :] = column_array(
+                [None] * n if values is None else values, dtype
+            )
+        self.n_rows += n
+
+    def close(self) -> None:
+        self.flush()
+        self.group.attrs['n_rows'] = self.n_rows
+        self.h5.close()
+
+
+class DescriptorTable:
+    '''
+    Read access to a descriptor table in an HDF5 file, given as path or binary
+    file object. Slices and filters only read the chunks they touch.
+    '''
+
+    def __init__(self, file: str | IO[bytes]):
+        import h5py
+
+        self.file = file
+        self.h5 = h5py.File(file, 'r')
+        self.group = self.h5[GROUP]
+        self.n_rows = int(self.group.attrs.get('n_rows', 0))
+        self.chunk_rows = self.group['identifier'].chunks[0]
+
+    def __enter__(self) -> 'DescriptorTable':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def close(self) -> None:
+        self.h5.close()
+
+    @property
+    def columns(self) -> list[str]:
+        return [column for column in TABLE_COLUMNS if column in self.group]
+
+    def column(self, name: str, start: int = 0, stop: int | None = None) -> np.ndarray:
+        '''
+        The values of a column in the rows `start` to `stop`.
+        '''
+        dataset = self.group[name]
+        if TABLE_COLUMNS[name][0] is str:
+            dataset = dataset.asstr()
+        return np.asarray(dataset[start:stop])
+
+    def iter_chunks(
+        self, columns: Iterable[str] | None = None
+    ) -> Iterator[tuple[int, dict[str, np.ndarray]]]:
+        '''
+        Yields the first row and the values of the columns of every chunk.
+        '''
+        columns = self.columns if columns is None else list(columns)
+        for start in range(0, self.n_rows, self.chunk_rows):
+            stop = min(start + self.chunk_rows, self.n_rows)
+            yield (
+                start,
+                {column: self.column(column, start, stop) for column in columns},
+            )
+
+    def filter(
+        self,
+        ranges: dict[str, tuple[float | None, float | None]] | None = None,
+        equals: dict[str, Iterable] | None = None,
+    ) -> np.ndarray:
+        '''
+        The indices of the rows with every column of `ranges` within its inclusive
+        `(min, max)` range (`None` for an open end) and every column of `equals`
+        equal to one of its values. Only the filtered columns are read.
+        '''
+        ranges = ranges or {}
+        equals = {column: list(values) for column, values in (equals or {}).items()}
+        rows = []
+        for start, values in self.iter_chunks([*ranges, *equals]):
+            mask = np.ones(min(self.chunk_rows, self.n_rows - start), dtype=bool)
+            for column, (lower, upper) in ranges.items():
+                if lower is not None:
+                    mask &= values[column] >= lower
+                if upper is not None:
+                    mask &= values[column] <= upper
+            for column, wanted in equals.items():
+                mask &= np.isin(values[column], wanted)
+            rows.append(np.flatnonzero(mask) + start)
+        return np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+
+    def take(
+        self, rows: np.ndarray, columns: Iterable[str] | None = None
+    ) -> dict[str, np.ndarray]:
+        '''
+        The values of the columns in the given rows, reading only the chunks that
+        contain them.
+        '''
+        rows = np.unique(np.asarray(rows, dtype=np.int64))
+        columns = list(columns or self.columns)
+        rows = rows[(rows >= 0) & (rows < self.n_rows)]
+        # the sorted rows split at the chunk boundaries
+        boundaries = np.flatnonzero(np.diff(rows // self.chunk_rows)) + 1
+        parts: dict[str, list[np.ndarray]] = {column: [] for column in columns}
+        for chunk_rows in np.split(rows, boundaries) if len(rows) else []:
+            start = int(chunk_rows[0]) // self.chunk_rows * self.chunk_rows
+            stop = min(start + self.chunk_rows, self.n_rows)
+            selected = chunk_rows - start
+            for column in columns:
+                parts[column].append(self.column(column, start, stop)[selected])
+        return {
+            column: np.concatenate(values)
+            if values
+            else column_array([], TABLE_COLUMNS[column][0])
+            for column, values in parts.items()
+        }
@@ -0,0 +1,131 @@
+'''
+Structure fingerprints for finding duplicate and near-duplicate CIFs.
+
+A fingerprint is the empirical formula plus a radial distribution: the number of
+neighbours per atom as a function of distance up to `R_MAX`, broadened with a
+Gaussian so that small displacements only cause small changes. Both are
+independent of the choice of unit cell, origin and atom order, so the same
+framework given in a different setting or as a supercell has the same
+fingerprint. The hash of the
+formula and the rounded distribution identifies exact duplicates; near duplicates
+share the formula and have a small distance between their distributions.
+
+The hash is only stable for structures that agree to numerical noise. Every value
+of the distribution is rounded to 0.1, so a value close to a rounding boundary,
+e.g. 1.05, can end up on either side of it for two CIFs of the same structure
+with a few more digits or a relaxed geometry, and the hashes differ. Equal hashes
+are thus a safe sign of a duplicate, different hashes are not a safe sign of
+different structures; `tools.duplicates` compares the distributions of all
+structures with the same formula for that.
+'''
+
+import hashlib
+from io import StringIO
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from ase import Atoms
+
+# version of the fingerprint, to be increased on changes of the settings below
+FINGERPRINT_VERSION = 2
+R_MAX = 8.0
+BIN_WIDTH = 0.1
+BROADENING = 0.1
+# maximum relative L1 distance between the distributions of near duplicates
+NEAR_DUPLICATE_DISTANCE = 0.05
+
+
+def atoms_from_cif(cif_data: str) -> 'Atoms':
+    import ase.io
+
+    return ase.io.read(StringIO(cif_data), format='cif')
+
+
+def radial_distribution(atoms: 'Atoms') -> np.ndarray:
+    '''
+    Number of neighbours per atom, broadened by `BROADENING`, sampled every
+    `BIN_WIDTH` up to `R_MAX`.
+    '''
+    from ase.neighborlist import neighbor_list
+
+    fine_width = BIN_WIDTH / 10
+    n_fine = int(round(R_MAX / fine_width))
+    if not len(atoms):
+        return np.zeros(n_fine // 10)
+    if atoms.pbc.all():
+        distances = neighbor_list('d', atoms, R_MAX)
+    else:
+        distances = atoms.get_all_distances()[np.triu_indices(len(atoms), k=1)]
+        distances = distances[distances < R_MAX]
+        distances = np.concatenate([distances, distances])
+    # the clip only catches distances that round up to R_MAX
+    counts = np.bincount(
+        np.minimum((distances / fine_width).astype(int), n_fine - 1), minlength=n_fine
+    )
+    offsets = np.arange(-4 * BROADENING, 4 * BROADENING + fine_width, fine_width)
+    kernel = np.exp(-0.5 * (offsets / BROADENING) ** 2)
+    smoothed = np.convolve(counts, kernel / kernel.sum(), mode='same')
+    return smoothed[5::10] * 10 / len(atoms)
+
+
+def structure_fingerprint(atoms: 'Atoms') -> tuple[str, str, np.ndarray]:
+    '''
+    Returns the empirical formula, the exact duplicate hash and the radial
+    distribution of a structure.
+    '''
+    formula = atoms.get_chemical_formula('hill', empirical=True)
+    distribution = radial_distribution(atoms)
+    rounded = np.round(distribution, 1).tolist()
+    structure_hash = hashlib.sha1(f'{formula}:{rounded}'.encode()).hexdigest()
+    return formula, structure_hash, distribution
+
+
+def fingerprint_distance(distribution: np.ndarray, others: np.ndarray) -> np.ndarray:
+    '''
+    Relative L1 distance between one radial distribution and each row of `others`.
+    '''
+    others = np.atleast_2d(others)
+    total = np.abs(distribution).sum() + np.abs(others).sum(axis=1)
+    return 2 * np.abs(others - distribution).sum(axis=1) / np.maximum(total, 1e-12)
+
+
+def find_duplicates(
+    structure_hash: str,
+    schema: str,
+    upload_id: str | None = None,
+    exclude: str | None = None,
+    limit: int = 10,
+) -> list[str]:
+    '''
+    The ids of up to `limit` indexed entries of `schema` with the given structure
+    hash, other than `exclude`, that are published or in the upload `upload_id`.
+    This is a term lookup in the search index.
+    '''
+    from nomad.app.v1.models import MetadataRequired
+    from nomad.search import search_iterator
+
+    visible: list[dict] = [{'published': True}]
+    if upload_id is not None:
+        visible.append({'upload_id': upload_id})
+    query = {
+        'and': [
+            {f'data.structural_data.structure_hash#{schema}': structure_hash},
+            {'or': visible},
+        ]
+    }
+    entries = search_iterator(
+        # no owner restriction: processing also sees the unpublished entries of
+        # its own upload, the query limits it to those and the published ones
+        owner=None,
+        query=query,
+        required=MetadataRequired(include=['entry_id']),
+    )
+    duplicates = []
+    for entry in entries:
+        if entry['entry_id'] != exclude:
+            duplicates.append(entry['entry_id'])
+        if len(duplicates) >= limit:
+            break
+    return duplicates
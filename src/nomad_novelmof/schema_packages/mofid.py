@@ -0,0 +1,77 @@
+'''
+Decomposition of MOFid identifiers into their building blocks.
+
+A MOFid has the form
+
+    [Cu][Cu].[O-]C(=O)c1cc(cc(c1)C(=O)[O-])C(=O)[O-] MOFid-v1.tbo.cat0;HKUST-1
+
+i.e. the SMILES of the building blocks separated by `.`, followed by the version,
+the RCSR topology code, the degree of catenation and an optional name. Building
+blocks with a metal atom are metal nodes (SBUs), all others are linkers.
+
+The building blocks are canonicalized textually: surrounding whitespace is
+removed, duplicates are dropped and the blocks are sorted, so MOFids that only
+differ in the order of their blocks decompose equally. The SMILES themselves are
+kept as written by the MOFid tool, which already writes canonical SMILES.
+Topology codes are lowercased; the placeholders of the MOFid tool for unknown
+topologies are dropped. A MOFid with the topology `ERROR` is the output of a
+failed run of the MOFid tool, whose building blocks cannot be trusted either, so
+it is not decomposed at all.
+'''
+
+import re
+
+MOFID_PATTERN = re.compile(
+    r'^(?P<smiles>\S+)\s+MOFid-v\d+\.(?P<topology>[^.;\s]+)'
+    r'(?:\.cat(?P<catenation>\d+|N/?A))?(?:;(?P<name>.*))?$'
+)
+# atoms in SMILES: bracket atoms, then the two letter and one letter organic subset
+ATOM_PATTERN = re.compile(
+    r'\[(?:\d+)?([A-Z][a-z]?|[a-z][a-z]?)|(Cl|Br|[BCNOPSFI]|[bcnops])'
+)
+NON_METALS = {
+    'H', 'He', 'B', 'C', 'N', 'O', 'F', 'Ne', 'Si', 'P', 'S', 'Cl', 'Ar', 'As',
+    'Se', 'Br', 'Kr', 'Te', 'I', 'Xe', 'At', 'Rn', '*',
+}
+# the topology of MOFids for which the MOFid tool failed
+ERROR_TOPOLOGY = 'error'
+NO_TOPOLOGY = {'unknown', 'na', 'n/a', 'mismatch'}
+
+
+def smiles_elements(smiles: str) -> set[str]:
+    '''
+    The elements of the atoms in a SMILES string.
+    '''
+    elements = set()
+    for bracket, organic in ATOM_PATTERN.findall(smiles):
+        element = bracket or organic
+        # aromatic atoms are written in lower case
+        elements.add(element[0].upper() + element[1:])
+    return elements
+
+
+def is_metal_node(smiles: str) -> bool:
+    return bool(smiles_elements(smiles) - NON_METALS)
+
+
+def decompose_mofid(identifier: str | None) -> dict | None:
+    '''
+    The canonical `metal_nodes`, `linkers`, `topology` and `catenation` of a
+    MOFid, or `None` if the identifier is not a MOFid or an `ERROR` MOFid.
+    '''
+    if not identifier:
+        return None
+    match = MOFID_PATTERN.match(identifier.strip())
+    if match is None:
+        return None
+    topology = match['topology'].strip().lower()
+    if topology == ERROR_TOPOLOGY:
+        return None
+    blocks = {block.strip() for block in match['smiles'].split('.')} - {'', '*'}
+    catenation = match['catenation'] or ''
+    return dict(
+        metal_nodes=sorted(block for block in blocks if is_metal_node(block)),
+        linkers=sorted(block for block in blocks if not is_metal_node(block)),
+        topology=None if topology in NO_TOPOLOGY else topology,
+        catenation=int(catenation) if catenation.isdigit() else None,
+    )
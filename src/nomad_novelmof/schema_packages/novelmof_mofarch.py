@@ -1,7 +1,13 @@
+import functools
+import hashlib
+import json
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from itertools import islice
 from typing import TYPE_CHECKING
-import numpy as np
-from numpy import flexible
-from ase.data import  chemical_symbols
+from ase.data import chemical_symbols
 
 
 from nomad.datamodel.results import (
@@ -11,12 +17,31 @@ if TYPE_CHECKING:
     from nomad.datamodel.datamodel import EntryArchive
     from structlog.stdlib import BoundLogger
 
+    from nomad_novelmof.schema_packages.descriptor_table import DescriptorTable
+
 from nomad.config import config
 from nomad.datamodel.data import Schema
 from nomad.datamodel.metainfo.annotations import ELNAnnotation, ELNComponentEnum
-from nomad.metainfo import Quantity, SchemaPackage, MEnum # 导入 MEnum 用于定义枚举类型
 from nomad.datamodel.data import ArchiveSection
-from nomad.metainfo import Datetime, MEnum, Quantity, Section, SubSection,JSON
+from nomad.datamodel.hdf5 import HDF5Reference
+from nomad.metainfo import (
+    JSON,
+    Datetime,
+    MEnum,
+    Quantity,
+    SchemaPackage,
+    Section,
+    SubSection,
+)
+
+# the analyses, tables and statistics below are imported where they are used, so
+# that loading the schema package in every NOMAD process stays cheap, see
+# `tools.import_budget`
+from nomad_novelmof.schema_packages.utils import (
+    MATERIAL_VERSION,
+    material_from_atoms,
+    update_material,
+)
 
 configuration = config.get_plugin_entry_point(
     'nomad_novelmof.schema_packages:novel_mof_schema'
@@ -24,6 +49,20 @@ configuration = config.get_plugin_entry_point(
 
 m_package = SchemaPackage()
 
+# flagged entries listed in the statistics entry of an upload, the others are only
+# counted
+MAX_FLAGGED_ENTRIES = 1000
+
+
+def stage_fingerprint(*inputs) -> str:
+    '''
+    Returns a stable hash of the input quantities of a normalization stage.
+    Two calls with equal inputs give the same fingerprint, so a stage whose
+    fingerprint did not change since the last run can be skipped.
+    '''
+    payload = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
 
 class CompositionalInformation(ArchiveSection):
     '''
@@ -97,6 +136,19 @@ class TopologicalAndCrystallographicInformation(ArchiveSection):
         type=int,
         description="International Union of Crystallography (IUC) space group number."
     )
+    crystal_system = Quantity(
+        # the crystal systems of `spacegroups.CRYSTAL_SYSTEMS`
+        type=MEnum([
+            'triclinic',
+            'monoclinic',
+            'orthorhombic',
+            'tetragonal',
+            'trigonal',
+            'hexagonal',
+            'cubic',
+        ]),
+        description="Crystal system of the space group."
+    )
 
 
 class StructuralProperties(ArchiveSection):
@@ -141,6 +193,10 @@ class CalculationProperties(ArchiveSection):
 class StructuralData(ArchiveSection):
     '''
     Structural data including modification status and CIF.
+
+    NOMAD indexes every scalar string of `data` in the search quantities of an
+    entry, so the CIF text given in `cif_data` is moved into the raw file
+    `cif_file` on the server. Use `read_cif` to get it either way.
     '''
     unmodified = Quantity(
         type=bool,
@@ -148,16 +204,120 @@ class StructuralData(ArchiveSection):
     )
     cif_data = Quantity(
         type=str, # Or MProxy('nomad.datamodel.results.Symmetry') if you want to store parsed CIF data
-        description="Crystallographic Information File (CIF) data."
+        description="Crystallographic Information File (CIF) data. Moved into `cif_file` during processing."
+    )
+    cif_file = Quantity(
+        type=str,
+        description="Path of the CIF in the upload.",
+        a_eln=ELNAnnotation(component=ELNComponentEnum.FileEditQuantity),
+    )
+    structure_formula = Quantity(
+        type=str,
+        description="Empirical formula of the structure in the CIF.",
+    )
+    structure_hash = Quantity(
+        type=str,
+        description="Hash of the structure fingerprint of the CIF. Entries with the same hash have the same structure, but the same structure may get a different hash, see `fingerprint`.",
+    )
+    radial_distribution = Quantity(
+        type=float,
+        shape=['*'],
+        description="Broadened number of neighbours per atom by distance, the fingerprint used to compare structures.",
+    )
+    duplicates = Quantity(
+        type=str,
+        shape=['*'],
+        description="Entry ids of other entries with the same structure hash at the time of processing.",
     )
 
+    def normalize(self, archive, logger):
+        super().normalize(archive, logger)
+        from nomad.datamodel.context import ClientContext
+
+        mainfile = archive.metadata.mainfile if archive.metadata else None
+        if not self.cif_data or not mainfile or archive.m_context is None:
+            return
+        if isinstance(archive.m_context, ClientContext):
+            return
+        stem = re.sub(r'(\.archive)?\.(json|yaml|yml)$', '', mainfile)
+        self.cif_file = f'{stem}.cif'
+        with archive.m_context.raw_file(self.cif_file, 'w') as f:
+            f.write(self.cif_data)
+        self.cif_data = None
+
+    def read_cif(self, archive) -> str | None:
+        '''
+        The CIF text, from `cif_data` or the raw file `cif_file`.
+        '''
+        if self.cif_data or not self.cif_file or archive.m_context is None:
+            return self.cif_data
+        with archive.m_context.raw_file(self.cif_file) as f:
+            return f.read()
+
+
+class MOFPublication(Schema):
+    '''
+    A publication that MOFArchive entries refer to. The parser creates one entry
+    per DOI and upload, instead of repeating the publication in every MOF.
+    '''
+    doi = Quantity(
+        type=str,
+        description="Digital Object Identifier (DOI) of the publication."
+    )
+    year = Quantity(
+        type=int,
+        description="Year of publication."
+    )
+    publication = Quantity(
+        type=str,
+        description="Journal or publication venue (e.g., ACS, RSC)."
+    )
+
+    def normalize(self, archive, logger):
+        super().normalize(archive, logger)
+        if self.doi and archive.metadata:
+            archive.metadata.entry_name = f'Publication {self.doi}'
+
+
+class RemovedMOFRecord(Schema):
+    '''
+    Replaces the child entry of a bulk record that is gone from the latest
+    delivery. The entry keeps its mainfile, so it is not a MOFArchive anymore and
+    drops out of the app, the statistics and the duplicate lookup, and it becomes
+    a MOFArchive again if the record is delivered again.
+    '''
+    identifier = Quantity(
+        type=str,
+        description="Identifier of the removed record."
+    )
+    bulk_file = Quantity(
+        type=str,
+        description="The bulk file that no longer holds the record."
+    )
+    removed_at = Quantity(
+        type=Datetime,
+        description="When the delivery without the record was parsed."
+    )
+
+    def normalize(self, archive, logger):
+        super().normalize(archive, logger)
+        if self.identifier and archive.metadata:
+            archive.metadata.entry_name = f'Removed MOF record {self.identifier}'
+
 
 class ReferenceData(ArchiveSection):
     '''
     Reference data for the MOF, typically publication details.
+
+    `year`, `publication` and `doi` are a denormalized copy of the shared
+    `MOFPublication` entry, kept inline for search and the app.
     '''
+    publication_entry = Quantity(
+        type=MOFPublication,
+        description="The shared entry of the publication with this DOI in the upload."
+    )
     year = Quantity(
-        type=str,
+        type=int,
         description="Year of publication."
     )
     publication = Quantity(
@@ -205,6 +365,30 @@ class SynthesisInformation(ArchiveSection):
     )
 
 
+class BuildingBlocks(ArchiveSection):
+    '''
+    The building blocks of the MOF, decomposed from its MOFid `identifier`.
+    '''
+    metal_nodes = Quantity(
+        type=str,
+        shape=['*'],
+        description="Canonical SMILES of the metal nodes (SBUs)."
+    )
+    linkers = Quantity(
+        type=str,
+        shape=['*'],
+        description="Canonical SMILES of the organic linkers."
+    )
+    topology = Quantity(
+        type=str,
+        description="RCSR topology code of the MOFid (e.g., pcu, tbo)."
+    )
+    catenation = Quantity(
+        type=int,
+        description="Degree of catenation of the MOFid."
+    )
+
+
 class MOFArchive(Schema):
     '''
     A schema describing structural, synthesis, and calculational properties of Metal-Organic Frameworks (MOFs)
@@ -243,17 +427,681 @@ class MOFArchive(Schema):
         section_def=SynthesisInformation,
         description="Detailed information about the synthesis of the MOF."
     )
+    building_blocks = SubSection(
+        section_def=BuildingBlocks,
+        description="Metal nodes, linkers, topology and catenation decomposed from the MOFid identifier."
+    )
+    plausibility_flags = Quantity(
+        type=str,
+        shape=['*'],
+        description="Failed plausibility checks of the descriptors, e.g. negative_PV_cm3_g or PLD_angstrom_outlier. The rules are checked for every entry, outliers by the dataset-wide checks of bulk ingestion.",
+    )
+
+    normalization_fingerprints = Quantity(
+        type=JSON,
+        description="Fingerprints of the inputs of each normalization stage, used to skip unchanged stages.",
+    )
 
     def normalize(self, archive, logger):
+        from nomad_novelmof.profiling import MemoryProfile
+
+        memory = MemoryProfile(
+            configuration.profile_memory, configuration.memory_threshold_mb * 1024**2
+        )
+        with memory:
+            self._normalize(archive, logger)
+        memory.log(logger, 'MOFArchive', identifier=self.identifier)
+
+    def _normalize(self, archive, logger):
+        from nomad_novelmof.profiling import StageTimer
+        from nomad_novelmof.schema_packages.cache import content_hash, get_cache
+        from nomad_novelmof.schema_packages.fingerprint import (
+            FINGERPRINT_VERSION,
+            atoms_from_cif,
+        )
+
         super().normalize(archive, logger)
+        timer = StageTimer('MOFArchive', configuration.log_stage_timings)
         if not archive.results.material:
             archive.results.material = Material()
-        if self.compositional_information.metal_types:
-            for i in self.compositional_information.metal_types:
-                if i not in chemical_symbols:
-                    logger.warning(
-                        message=f'Unknown metal type for {i} in metal_types.'
-                    )
-                archive.results.material.elements += [i]
+        fingerprints = dict(self.normalization_fingerprints or {})
+        metal_types = (
+            list(self.compositional_information.metal_types or [])
+            if self.compositional_information else []
+        )
+        # cheap stages run every time, only the structure analyses are fingerprinted
+        with timer.span('elements'):
+            self._normalize_elements(archive, logger, metal_types)
+        with timer.span('building_blocks'):
+            self._normalize_building_blocks(logger)
+        topology = self._topology()
+        if topology is not None:
+            with timer.span('space_group'):
+                self._normalize_space_group(logger, topology)
+        structural_data = self.structural_data
+        cif_data = self._read_cif(archive, logger)
+        with timer.span('plausibility'):
+            self._normalize_plausibility(cif_data)
+        if cif_data:
+            cache = get_cache(
+                configuration.cache_path, configuration.cache_max_bytes, logger
+            )
+            cif_key = content_hash(cif_data)
+            read_atoms = functools.cache(lambda: atoms_from_cif(cif_data))
+            if configuration.fingerprint_structures:
+                self._run_stage(
+                    'structure_fingerprint',
+                    stage_fingerprint(cif_key, FINGERPRINT_VERSION),
+                    fingerprints,
+                    timer,
+                    is_done=lambda: structural_data.structure_hash is not None,
+                    run=lambda: self._normalize_structure_fingerprint(
+                        logger, structural_data, read_atoms, cache, cif_key
+                    ),
+                )
+                # other entries come and go, so duplicates are looked up every time
+                if structural_data.structure_hash is not None:
+                    with timer.span('duplicates'):
+                        self._normalize_duplicates(archive, logger, structural_data)
+            if configuration.structure_from_cif:
+                self._run_stage(
+                    'material',
+                    stage_fingerprint(cif_key, MATERIAL_VERSION),
+                    fingerprints,
+                    timer,
+                    is_done=lambda: bool(archive.results.material.topology),
+                    run=lambda: self._normalize_material(
+                        archive, logger, read_atoms, cache, cif_key
+                    ),
+                )
+        self.normalization_fingerprints = fingerprints
+        timer.log(logger, identifier=self.identifier)
+
+    def _read_cif(self, archive, logger) -> str | None:
+        if self.structural_data is None:
+            return None
+        try:
+            return self.structural_data.read_cif(archive)
+        except Exception as e:
+            logger.warning('Could not read the CIF file.', exc_info=e)
+            return None
+
+    @staticmethod
+    def _run_stage(name, fingerprint, fingerprints, timer, is_done, run):
+        '''
+        Runs an expensive normalization stage unless its input fingerprint matches
+        the stored one and its results are already present in the archive. Results
+        outside of `data` are rebuilt on every processing, so `is_done` must check
+        where they are kept.
+        '''
+        if fingerprints.get(name) == fingerprint and is_done():
+            return
+        with timer.span(name):
+            run()
+        fingerprints[name] = fingerprint
+
+    @staticmethod
+    def _normalize_elements(archive, logger, metal_types):
+        elements = list(archive.results.material.elements or [])
+        for metal in metal_types:
+            if metal not in chemical_symbols:
+                logger.warning(f'Unknown metal type for {metal} in metal_types.')
+            elif metal not in elements:
+                elements.append(metal)
+        archive.results.material.elements = elements
+
+    def _topology(self) -> TopologicalAndCrystallographicInformation | None:
+        structural = (
+            self.calculation_properties.structural_properties
+            if self.calculation_properties else None
+        )
+        return (
+            structural.topological_and_crystallographic_information
+            if structural else None
+        )
+
+    def _normalize_building_blocks(self, logger):
+        from nomad_novelmof.schema_packages.mofid import decompose_mofid
+
+        components = decompose_mofid(self.identifier)
+        if components is None:
+            self.building_blocks = None
+            return
+        self.building_blocks = BuildingBlocks(**components)
+        topology = self._topology()
+        if topology is None:
+            return
+        # cross-check the topology fields with the MOFid
+        topologies = {
+            code.lower()
+            for code in (topology.topology_single_nodes, topology.topology_all_nodes)
+            if code
+        }
+        if components['topology'] and topologies and components['topology'] not in topologies:
+            logger.warning(
+                f'The MOFid topology {components["topology"]} matches neither '
+                f'topology_single_nodes nor topology_all_nodes.'
+            )
+        if components['catenation'] is not None:
+            if topology.catenation is None:
+                topology.catenation = components['catenation']
+            elif topology.catenation != components['catenation']:
+                logger.warning(
+                    f'The catenation {topology.catenation} differs from the '
+                    f'MOFid catenation {components["catenation"]}.'
+                )
+
+    @staticmethod
+    def _normalize_space_group(logger, topology):
+        '''
+        Checks the Hall symbol and the space group number against each other with
+        the tables of `spacegroups`, fills a missing one and the crystal system.
+        A missing Hall symbol is filled with the standard setting.
+        '''
+        from nomad_novelmof.schema_packages.spacegroups import (
+            crystal_system,
+            hall_setting,
+            standard_hall,
+        )
+
+        number = topology.number_spacegroup
+        if number is not None and not 1 <= number <= 230:
+            logger.warning(f'Ignored the invalid space group number {number}.')
+            number = None
+        if topology.hall:
+            setting = hall_setting(topology.hall)
+            if setting is None:
+                logger.warning(f'Unknown Hall symbol {topology.hall}.')
+            elif number is None:
+                number = topology.number_spacegroup = setting[1]
+            elif number != setting[1]:
+                logger.warning(
+                    f'The space group number {number} contradicts the Hall symbol '
+                    f'{topology.hall} of space group {setting[1]}.'
+                )
+        elif number is not None:
+            topology.hall = standard_hall(number)
+        topology.crystal_system = crystal_system(number)
+
+    def _normalize_plausibility(self, cif_data):
+        '''
+        Applies the rules of `plausibility.RULES` to this entry, so that entries of
+        single record files and ELN entries are flagged like bulk records. The
+        outlier flags of bulk ingestion are kept, outliers of the other entries
+        are listed by the upload-level check of `MOFArchiveStatistics`.
+        '''
+        import numpy as np
+
+        from nomad_novelmof.fields import COLUMNS
+        from nomad_novelmof.plausibility import (
+            CHECKED_COLUMNS,
+            max_cell_length,
+            plausibility_flags,
+        )
+
+        columns = {}
+        for column in CHECKED_COLUMNS:
+            if column not in COLUMNS:
+                continue
+            value = self
+            for name in COLUMNS[column][0].split('.'):
+                value = getattr(value, name, None)
+                if value is None:
+                    break
+            value = getattr(value, 'magnitude', value)
+            number = type(value) in (int, float) or isinstance(value, np.number)
+            columns[column] = np.array([value if number else np.nan], dtype=float)
+        columns['max_cell_length_angstrom'] = np.array([max_cell_length(cif_data)])
+        flags = plausibility_flags(columns, 1, statistics={}).get(0, [])
+        outliers = [
+            flag for flag in self.plausibility_flags or [] if flag.endswith('_outlier')
+        ]
+        self.plausibility_flags = flags + outliers or None
+
+    @staticmethod
+    def _normalize_structure_fingerprint(
+        logger, structural_data, read_atoms, cache, cif_key
+    ):
+        import numpy as np
+
+        from nomad_novelmof.schema_packages.cache import cached
+        from nomad_novelmof.schema_packages.fingerprint import (
+            FINGERPRINT_VERSION,
+            structure_fingerprint,
+        )
+
+        try:
+            fingerprint = cached(
+                cache,
+                'structure_fingerprint',
+                FINGERPRINT_VERSION,
+                cif_key,
+                lambda: [
+                    value.tolist() if isinstance(value, np.ndarray) else value
+                    for value in structure_fingerprint(read_atoms())
+                ],
+                logger,
+            )
+        except Exception as e:
+            logger.warning('Could not read the structure in the CIF.', exc_info=e)
+            return
+        formula, structure_hash, distribution = fingerprint
+        structural_data.structure_formula = formula
+        structural_data.structure_hash = structure_hash
+        structural_data.radial_distribution = distribution
+
+    @staticmethod
+    def _normalize_duplicates(archive, logger, structural_data):
+        from nomad_novelmof.schema_packages.fingerprint import find_duplicates
+
+        metadata = archive.metadata
+        try:
+            duplicates = find_duplicates(
+                structural_data.structure_hash,
+                MOFArchive.m_def.qualified_name(),
+                upload_id=metadata.upload_id if metadata else None,
+                exclude=metadata.entry_id if metadata else None,
+            )
+        except Exception as e:
+            logger.info('Could not look up duplicate structures.', exc_info=e)
+            return
+        structural_data.duplicates = duplicates
+        if duplicates:
+            logger.warning(
+                f'The structure in the CIF duplicates entries {", ".join(duplicates)}.'
+            )
+
+    @staticmethod
+    def _normalize_material(archive, logger, read_atoms, cache, cif_key):
+        from nomad_novelmof.schema_packages.cache import cached
+
+        def compute():
+            material = Material()
+            material_from_atoms(read_atoms(), material, logger)
+            return material.m_to_dict()
+
+        try:
+            data = cached(cache, 'material', MATERIAL_VERSION, cif_key, compute, logger)
+        except Exception as e:
+            logger.warning('Could not read the structure in the CIF.', exc_info=e)
+            return
+        update_material(archive.results.material, data)
+
+
+class MOFDescriptorTable(Schema):
+    '''
+    The descriptors of many MOFs in one entry, e.g. of a screening study with
+    millions of hypothetical MOFs. The rows are stored as chunked, compressed
+    HDF5 datasets, see `schema_packages.descriptor_table`, and the column
+    quantities are HDF5 references `<file>#/descriptors/<column>` to them.
+    '''
+    file = Quantity(
+        type=str,
+        description="Path of the HDF5 file with the table in the upload."
+    )
+    n_rows = Quantity(
+        type=int,
+        description="Number of rows, i.e. MOFs, in the table."
+    )
+    chunk_rows = Quantity(
+        type=int,
+        description="Number of rows per chunk of the HDF5 datasets."
+    )
+    identifier = Quantity(
+        type=HDF5Reference,
+        description="Dataset of the MOF identifiers of the rows."
+    )
+    PLD_angstrom = Quantity(
+        type=HDF5Reference,
+        description="Dataset of the Pore Limiting Diameters (PLD) in Angstroms."
+    )
+    ASA_m2_cm3 = Quantity(
+        type=HDF5Reference,
+        description="Dataset of the Accessible Surface Areas (ASA) per unit volume."
+    )
+    NASA_m2_cm3 = Quantity(
+        type=HDF5Reference,
+        description="Dataset of the Non-Accessible Surface Areas (NASA) per unit volume."
+    )
+    PV_cm3_g = Quantity(
+        type=HDF5Reference,
+        description="Dataset of the Pore Volumes (PV) per unit mass."
+    )
+    structure_dimension = Quantity(
+        type=HDF5Reference,
+        description="Dataset of the dimensionalities of the structures."
+    )
+    catenation = Quantity(
+        type=HDF5Reference,
+        description="Dataset of the degrees of catenation."
+    )
+    number_spacegroup = Quantity(
+        type=HDF5Reference,
+        description="Dataset of the space group numbers."
+    )
+
+    def set_file(self, file: str, n_rows: int, chunk_rows: int) -> None:
+        '''
+        Refers the entry to a table written by `DescriptorTableWriter`.
+        '''
+        from nomad_novelmof.schema_packages.descriptor_table import (
+            GROUP,
+            TABLE_COLUMNS,
+        )
+
+        self.file = file
+        self.n_rows = n_rows
+        self.chunk_rows = chunk_rows
+        for column in TABLE_COLUMNS:
+            setattr(self, column, f'{file}#/{GROUP}/{column}')
+
+    @contextmanager
+    def open_table(self, archive) -> Iterator['DescriptorTable']:
+        '''
+        Opens the table for slicing and filtering without loading it.
+
+            with entry.open_table(archive) as table:
+                rows = table.filter(ranges={'PLD_angstrom': (3, 8)})
+        '''
+        from nomad.datamodel.context import ClientContext
+
+        from nomad_novelmof.schema_packages.descriptor_table import DescriptorTable
+
+        if archive.m_context is None or isinstance(archive.m_context, ClientContext):
+            with DescriptorTable(self.file) as table:
+                yield table
+            return
+        with (
+            archive.m_context.raw_file(self.file, 'rb') as file,
+            DescriptorTable(file) as table,
+        ):
+            yield table
+
+    def normalize(self, archive, logger):
+        super().normalize(archive, logger)
+        if self.n_rows is not None and archive.metadata:
+            archive.metadata.entry_name = f'MOF descriptor table ({self.n_rows} MOFs)'
+
+
+class DescriptorStatistics(ArchiveSection):
+    '''
+    Streaming statistics of one numeric MOFArchive quantity.
+    '''
+    m_def = Section(label_quantity='label')
+
+    name = Quantity(
+        type=str,
+        description="Path of the summarized quantity."
+    )
+    label = Quantity(
+        type=str,
+        description="Human readable name of the summarized quantity."
+    )
+    unit = Quantity(
+        type=str,
+        description="Unit of all values of this section."
+    )
+    count = Quantity(
+        type=int,
+        description="Number of entries with a value."
+    )
+    minimum = Quantity(
+        type=float,
+        description="Smallest value."
+    )
+    maximum = Quantity(
+        type=float,
+        description="Largest value."
+    )
+    mean = Quantity(
+        type=float,
+        description="Mean of the values."
+    )
+    variance = Quantity(
+        type=float,
+        description="Sample variance of the values."
+    )
+    bin_edges = Quantity(
+        type=float,
+        shape=['*'],
+        description="Edges of the fixed histogram bins."
+    )
+    bin_counts = Quantity(
+        type=int,
+        shape=['*'],
+        description="Number of values per histogram bin."
+    )
+
+
+class TermStatistics(ArchiveSection):
+    '''
+    The most frequent terms of one categorical MOFArchive quantity.
+    '''
+    m_def = Section(label_quantity='label')
+
+    name = Quantity(
+        type=str,
+        description="Path of the summarized quantity."
+    )
+    label = Quantity(
+        type=str,
+        description="Human readable name of the summarized quantity."
+    )
+    terms = Quantity(
+        type=str,
+        shape=['*'],
+        description="The most frequent terms, most frequent first."
+    )
+    counts = Quantity(
+        type=int,
+        shape=['*'],
+        description="Number of entries per term."
+    )
+
+
+class FlaggedEntry(ArchiveSection):
+    '''
+    A MOFArchive entry of the upload that fails plausibility checks.
+    '''
+    entry = Quantity(
+        type=MOFArchive,
+        description="The flagged entry."
+    )
+    flags = Quantity(
+        type=str,
+        shape=['*'],
+        description="The failed plausibility checks."
+    )
+
+
+class MOFArchiveStatistics(Schema):
+    '''
+    Precomputed statistics of all MOFArchive entries of an upload, for dashboards
+    and reports that should not aggregate over all entries on every request.
+
+    The statistics are read from the search index and updated incrementally: each
+    normalization only adds the entries created since the last update. If entries
+    summarized before were deleted or processed again since, it recomputes them
+    from all entries. The MOFArchive parser writes the entry of an upload again
+    for every record file and bulk delivery that changes entries, and it is
+    processed after all entries of the upload, see `parsers.statistics_parser`.
+
+    Each normalization also runs the plausibility checks over the descriptors of
+    all entries of the upload in vectorized passes, and lists the flagged ones.
+    '''
+    rebuild = Quantity(
+        type=bool,
+        default=False,
+        description="Recompute the statistics from all entries with the next save.",
+        a_eln=ELNAnnotation(component=ELNComponentEnum.BoolEditQuantity),
+    )
+    n_entries = Quantity(
+        type=int,
+        description="Number of summarized MOFArchive entries."
+    )
+    last_update = Quantity(
+        type=Datetime,
+        description="Time of the last update of the statistics."
+    )
+    accumulators = Quantity(
+        type=JSON,
+        description="Internal state of the streaming statistics, used for incremental updates.",
+    )
+    descriptors = SubSection(
+        section_def=DescriptorStatistics,
+        repeats=True,
+    )
+    terms = SubSection(
+        section_def=TermStatistics,
+        repeats=True,
+    )
+    n_flagged = Quantity(
+        type=int,
+        description="Number of MOFArchive entries that fail plausibility checks."
+    )
+    flag_counts = Quantity(
+        type=JSON,
+        description="Number of entries per failed plausibility check."
+    )
+    outlier_statistics = Quantity(
+        type=JSON,
+        description="Median and MAD of the outlier checks over all MOFArchive entries of the upload.",
+    )
+    flagged_entries = SubSection(
+        section_def=FlaggedEntry,
+        repeats=True,
+        description=f"The first {MAX_FLAGGED_ENTRIES} flagged entries.",
+    )
+
+    def normalize(self, archive, logger):
+        from nomad_novelmof.schema_packages.statistics import (
+            DESCRIPTORS,
+            TERMS,
+            TOP_K,
+            MOFStatistics,
+            iter_upload_records,
+        )
+
+        super().normalize(archive, logger)
+        upload_id = archive.metadata.upload_id
+        schema = MOFArchive.m_def.qualified_name()
+        incremental = bool(self.accumulators) and not self.rebuild
+        if incremental:
+            try:
+                incremental = self._unchanged(upload_id, schema)
+            except Exception as e:
+                logger.warning(
+                    'Could not read the MOFArchive entries of the upload.', exc_info=e
+                )
+                return
+            if not incremental:
+                logger.info('Recomputing the statistics of updated or deleted entries.')
+        statistics = (
+            MOFStatistics.from_dict(self.accumulators) if incremental
+            else MOFStatistics()
+        )
+        update_time = datetime.now(timezone.utc)
+        records = iter_upload_records(
+            upload_id, schema, since=self.last_update if incremental else None
+        )
+        try:
+            while batch := list(islice(records, 1000)):
+                statistics.update(batch)
+        except Exception as e:
+            logger.warning('Could not read the MOFArchive entries of the upload.', exc_info=e)
+            return
+
+        self.rebuild = False
+        self.last_update = update_time
+        self.accumulators = statistics.to_dict()
+        self.n_entries = statistics.n_entries
+        self.descriptors = []
+        for path, running in statistics.descriptors.items():
+            label, unit, _, _ = DESCRIPTORS[path]
+            self.descriptors.append(DescriptorStatistics(
+                name=path,
+                label=label,
+                unit=unit,
+                count=running.count,
+                minimum=running.minimum if running.count else None,
+                maximum=running.maximum if running.count else None,
+                mean=running.mean if running.count else None,
+                variance=running.variance,
+                bin_edges=running.bin_edges,
+                bin_counts=running.bin_counts,
+            ))
+        self.terms = []
+        for path, counts in statistics.terms.items():
+            top = counts.top(TOP_K)
+            self.terms.append(TermStatistics(
+                name=path,
+                label=TERMS[path],
+                terms=[term for term, _ in top],
+                counts=[count for _, count in top],
+            ))
+        self._normalize_plausibility(upload_id, schema, logger)
+
+    def _normalize_plausibility(self, upload_id: str, schema: str, logger):
+        '''
+        Checks the descriptors of all MOFArchive entries of the upload at once,
+        also those of single record files and ELN entries, which bulk ingestion
+        does not see. The CIFs are not in the search index, so the PLD is not
+        compared with the unit cell here.
+        '''
+        from collections import Counter
+
+        from nomad_novelmof.fields import COLUMNS
+        from nomad_novelmof.plausibility import (
+            CHECKED_COLUMNS,
+            plausibility_flags,
+            robust_statistics,
+        )
+        from nomad_novelmof.schema_packages.statistics import read_upload_columns
+
+        paths = {
+            column: f'data.{COLUMNS[column][0]}'
+            for column in CHECKED_COLUMNS
+            if column in COLUMNS
+        }
+        try:
+            entry_ids, columns = read_upload_columns(upload_id, schema, paths)
+        except Exception as e:
+            logger.warning(
+                'Could not read the MOFArchive entries of the upload.', exc_info=e
+            )
+            return
+        statistics = robust_statistics(columns)
+        flags = plausibility_flags(columns, len(entry_ids), statistics)
+        self.outlier_statistics = statistics
+        self.n_flagged = len(flags)
+        self.flag_counts = dict(
+            Counter(flag for row_flags in flags.values() for flag in row_flags)
+        )
+        self.flagged_entries = [
+            FlaggedEntry(
+                entry=f'../upload/archive/{entry_ids[row]}#/data', flags=row_flags
+            )
+            for row, row_flags in islice(flags.items(), MAX_FLAGGED_ENTRIES)
+        ]
+
+    def _unchanged(self, upload_id: str, schema: str) -> bool:
+        '''
+        Whether the entries summarized at the last update are all still there and
+        none of them was processed again since.
+        '''
+        from nomad_novelmof.schema_packages.statistics import count_upload_entries
+
+        summarized = count_upload_entries(
+            upload_id, schema, created_before=self.last_update
+        )
+        if summarized != self.n_entries:
+            return False
+        return not count_upload_entries(
+            upload_id,
+            schema,
+            created_before=self.last_update,
+            processed_after=self.last_update,
+        )
+
 
 m_package.__init_metainfo__()
\ No newline at end of file
@@ -25,16 +25,19 @@ from nomad.datamodel.metainfo.annotations import (
     ELNAnnotation,
     ELNComponentEnum,
 )
-import ase
-from nomad.normalizing import normalizers
+from nomad.config import config
 from nomad.units import ureg
-from nomad.datamodel.metainfo import runschema
 # from nomad.normalizing.common import load_structure_file
-from nomad.normalizing.porosity import create_topology_porosity
+from nomad_novelmof.schema_packages.cache import cached, content_hash, get_cache
+from nomad_novelmof.schema_packages.utils import MATERIAL_VERSION, material_from_atoms
 # from nomad.datamodel.results import Material
 # from nomad.atomutils import load_structure_file
 m_package = Package(name='MOF Parser', version='version_0.0.1')
 
+configuration = config.get_plugin_entry_point(
+    'nomad_novelmof.schema_packages:novel_mof_schema'
+)
+
 
 # class MofAtoms(ArchiveSection):
 #     """
@@ -114,7 +117,17 @@ def load_structure_file(upload_file):
     convert it into a nomad atom and then parse
     it to a system
     """
-    read_atom = ase.io.read(upload_file)
+    import ase.io
+
+    return system_from_atoms(ase.io.read(upload_file))
+
+
+def system_from_atoms(read_atom):
+    """
+    Converts ase atoms into a nomad system, as needed by the porosity analysis
+    """
+    from nomad.datamodel.metainfo import runschema
+
     atoms = runschema.system.Atoms()
     system = runschema.system.System(atoms=atoms)
     system.atoms.positions = read_atom.get_positions() * ureg.angstrom
@@ -369,28 +382,44 @@ class MOFData(EntryData):
     def normalize(self, archive, logger):
         super(MOFData, self).normalize(archive, logger)
         if self.structure_file:
-            with archive.m_context.raw_file(self.structure_file) as f:
+            import ase.io
+
+            try:
+                from nomad.normalizing.porosity import create_topology_porosity
+            except ImportError:
+                # the porosity analysis is not part of every nomad-lab version
+                create_topology_porosity = None
+            with archive.m_context.raw_file(self.structure_file, 'rb') as f:
+                structure_key = content_hash(f.read())
                 try:
-                    system =  load_structure_file(f.name)
+                    atoms = ase.io.read(f.name)
                 except Exception as e:
                     raise ValueError('could not read structure file') from e
-            if system.atoms:
-                run = runschema.run.Run()
-                run.system.append(system)
-                archive.run.append(run)
-                system_normalizer = None
-                for normalizer in normalizers:
-                    if normalizer.python_package == 'systemnormalizer':
-                        system_normalizer = normalizer
-                        break
-                    if system_normalizer is not None:
-                        system_normalizer(archive).normalize()
-
-                created_system = create_topology_porosity(system)
-                material = archive.m_setdefault('results.material')
-                if created_system:
-                    for system in created_system:
-                        material.m_add_sub_section(Material.topology, system)
+            if len(atoms):
+                def analyse():
+                    material = Material()
+                    if create_topology_porosity is not None:
+                        created_system = create_topology_porosity(system_from_atoms(atoms))
+                        for system in created_system or []:
+                            material.m_add_sub_section(Material.topology, system)
+                    material_from_atoms(atoms, material, logger)
+                    return material.m_to_dict()
+
+                if create_topology_porosity is None:
+                    logger.info('Skipped the porosity analysis, it is not available.')
+
+                cache = get_cache(
+                    configuration.cache_path, configuration.cache_max_bytes, logger
+                )
+                data = cached(
+                    cache,
+                    'material' if create_topology_porosity is None else 'material_porosity',
+                    MATERIAL_VERSION,
+                    structure_key,
+                    analyse,
+                    logger,
+                )
+                archive.m_setdefault('results.material').m_update_from_dict(data)
 
 
 m_package.__init_metainfo__()
\ No newline at end of file
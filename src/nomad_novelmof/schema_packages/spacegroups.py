@@ -0,0 +1,599 @@
+'''
+Precomputed tables of the 530 Hall settings of the 230 space groups.
+
+`HALL_SETTINGS` lists the Hall symbol, the space group number and the short
+Hermann-Mauguin symbol of every setting in the order of the Hall numbers of
+spglib, so the first setting of a space group is its standard setting. With the
+lookups built from it, the Hall symbol, space group number and crystal system
+of a MOF are checked against each other without reading its structure.
+
+Generated with spglib 2.8 from `spglib.get_spacegroup_type(hall_number)`.
+'''
+
+# (Hall symbol, space group number, short Hermann-Mauguin symbol) by Hall number - 1
+HALL_SETTINGS: list[tuple[str, int, str]] = [
+    ('P 1', 1, 'P1'),
+    ('-P 1', 2, 'P-1'),
+    ('P 2y', 3, 'P2'),
+    ('P 2', 3, 'P2'),
+    ('P 2x', 3, 'P2'),
+    ('P 2yb', 4, 'P2_1'),
+    ('P 2c', 4, 'P2_1'),
+    ('P 2xa', 4, 'P2_1'),
+    ('C 2y', 5, 'C2'),
+    ('A 2y', 5, 'C2'),
+    ('I 2y', 5, 'C2'),
+    ('A 2', 5, 'C2'),
+    ('B 2', 5, 'C2'),
+    ('I 2', 5, 'C2'),
+    ('B 2x', 5, 'C2'),
+    ('C 2x', 5, 'C2'),
+    ('I 2x', 5, 'C2'),
+    ('P -2y', 6, 'Pm'),
+    ('P -2', 6, 'Pm'),
+    ('P -2x', 6, 'Pm'),
+    ('P -2yc', 7, 'Pc'),
+    ('P -2yac', 7, 'Pc'),
+    ('P -2ya', 7, 'Pc'),
+    ('P -2a', 7, 'Pc'),
+    ('P -2ab', 7, 'Pc'),
+    ('P -2b', 7, 'Pc'),
+    ('P -2xb', 7, 'Pc'),
+    ('P -2xbc', 7, 'Pc'),
+    ('P -2xc', 7, 'Pc'),
+    ('C -2y', 8, 'Cm'),
+    ('A -2y', 8, 'Cm'),
+    ('I -2y', 8, 'Cm'),
+    ('A -2', 8, 'Cm'),
+    ('B -2', 8, 'Cm'),
+    ('I -2', 8, 'Cm'),
+    ('B -2x', 8, 'Cm'),
+    ('C -2x', 8, 'Cm'),
+    ('I -2x', 8, 'Cm'),
+    ('C -2yc', 9, 'Cc'),
+    ('A -2yab', 9, 'Cc'),
+    ('I -2ya', 9, 'Cc'),
+    ('A -2ya', 9, 'Cc'),
+    ('C -2yac', 9, 'Cc'),
+    ('I -2yc', 9, 'Cc'),
+    ('A -2a', 9, 'Cc'),
+    ('B -2ab', 9, 'Cc'),
+    ('I -2b', 9, 'Cc'),
+    ('B -2b', 9, 'Cc'),
+    ('A -2ab', 9, 'Cc'),
+    ('I -2a', 9, 'Cc'),
+    ('B -2xb', 9, 'Cc'),
+    ('C -2xac', 9, 'Cc'),
+    ('I -2xc', 9, 'Cc'),
+    ('C -2xc', 9, 'Cc'),
+    ('B -2xab', 9, 'Cc'),
+    ('I -2xb', 9, 'Cc'),
+    ('-P 2y', 10, 'P2/m'),
+    ('-P 2', 10, 'P2/m'),
+    ('-P 2x', 10, 'P2/m'),
+    ('-P 2yb', 11, 'P2_1/m'),
+    ('-P 2c', 11, 'P2_1/m'),
+    ('-P 2xa', 11, 'P2_1/m'),
+    ('-C 2y', 12, 'C2/m'),
+    ('-A 2y', 12, 'C2/m'),
+    ('-I 2y', 12, 'C2/m'),
+    ('-A 2', 12, 'C2/m'),
+    ('-B 2', 12, 'C2/m'),
+    ('-I 2', 12, 'C2/m'),
+    ('-B 2x', 12, 'C2/m'),
+    ('-C 2x', 12, 'C2/m'),
+    ('-I 2x', 12, 'C2/m'),
+    ('-P 2yc', 13, 'P2/c'),
+    ('-P 2yac', 13, 'P2/c'),
+    ('-P 2ya', 13, 'P2/c'),
+    ('-P 2a', 13, 'P2/c'),
+    ('-P 2ab', 13, 'P2/c'),
+    ('-P 2b', 13, 'P2/c'),
+    ('-P 2xb', 13, 'P2/c'),
+    ('-P 2xbc', 13, 'P2/c'),
+    ('-P 2xc', 13, 'P2/c'),
+    ('-P 2ybc', 14, 'P2_1/c'),
+    ('-P 2yn', 14, 'P2_1/c'),
+    ('-P 2yab', 14, 'P2_1/c'),
+    ('-P 2ac', 14, 'P2_1/c'),
+    ('-P 2n', 14, 'P2_1/c'),
+    ('-P 2bc', 14, 'P2_1/c'),
+    ('-P 2xab', 14, 'P2_1/c'),
+    ('-P 2xn', 14, 'P2_1/c'),
+    ('-P 2xac', 14, 'P2_1/c'),
+    ('-C 2yc', 15, 'C2/c'),
+    ('-A 2yab', 15, 'C2/c'),
+    ('-I 2ya', 15, 'C2/c'),
+    ('-A 2ya', 15, 'C2/c'),
+    ('-C 2yac', 15, 'C2/c'),
+    ('-I 2yc', 15, 'C2/c'),
+    ('-A 2a', 15, 'C2/c'),
+    ('-B 2ab', 15, 'C2/c'),
+    ('-I 2b', 15, 'C2/c'),
+    ('-B 2b', 15, 'C2/c'),
+    ('-A 2ab', 15, 'C2/c'),
+    ('-I 2a', 15, 'C2/c'),
+    ('-B 2xb', 15, 'C2/c'),
+    ('-C 2xac', 15, 'C2/c'),
+    ('-I 2xc', 15, 'C2/c'),
+    ('-C 2xc', 15, 'C2/c'),
+    ('-B 2xab', 15, 'C2/c'),
+    ('-I 2xb', 15, 'C2/c'),
+    ('P 2 2', 16, 'P222'),
+    ('P 2c 2', 17, 'P222_1'),
+    ('P 2a 2a', 17, 'P2_122'),
+    ('P 2 2b', 17, 'P22_12'),
+    ('P 2 2ab', 18, 'P2_12_12'),
+    ('P 2bc 2', 18, 'P22_12_1'),
+    ('P 2ac 2ac', 18, 'P2_122_1'),
+    ('P 2ac 2ab', 19, 'P2_12_12_1'),
+    ('C 2c 2', 20, 'C222_1'),
+    ('A 2a 2a', 20, 'A2_122'),
+    ('B 2 2b', 20, 'B22_12'),
+    ('C 2 2', 21, 'C222'),
+    ('A 2 2', 21, 'A222'),
+    ('B 2 2', 21, 'B222'),
+    ('F 2 2', 22, 'F222'),
+    ('I 2 2', 23, 'I222'),
+    ('I 2b 2c', 24, 'I2_12_12_1'),
+    ('P 2 -2', 25, 'Pmm2'),
+    ('P -2 2', 25, 'P2mm'),
+    ('P -2 -2', 25, 'Pm2m'),
+    ('P 2c -2', 26, 'Pmc2_1'),
+    ('P 2c -2c', 26, 'Pcm2_1'),
+    ('P -2a 2a', 26, 'P2_1ma'),
+    ('P -2 2a', 26, 'P2_1am'),
+    ('P -2 -2b', 26, 'Pb2_1m'),
+    ('P -2b -2', 26, 'Pm2_1b'),
+    ('P 2 -2c', 27, 'Pcc2'),
+    ('P -2a 2', 27, 'P2aa'),
+    ('P -2b -2b', 27, 'Pb2b'),
+    ('P 2 -2a', 28, 'Pma2'),
+    ('P 2 -2b', 28, 'Pbm2'),
+    ('P -2b 2', 28, 'P2mb'),
+    ('P -2c 2', 28, 'P2cm'),
+    ('P -2c -2c', 28, 'Pc2m'),
+    ('P -2a -2a', 28, 'Pm2a'),
+    ('P 2c -2ac', 29, 'Pca2_1'),
+    ('P 2c -2b', 29, 'Pbc2_1'),
+    ('P -2b 2a', 29, 'P2_1ab'),
+    ('P -2ac 2a', 29, 'P2_1ca'),
+    ('P -2bc -2c', 29, 'Pc2_1b'),
+    ('P -2a -2ab', 29, 'Pb2_1a'),
+    ('P 2 -2bc', 30, 'Pnc2'),
+    ('P 2 -2ac', 30, 'Pcn2'),
+    ('P -2ac 2', 30, 'P2na'),
+    ('P -2ab 2', 30, 'P2an'),
+    ('P -2ab -2ab', 30, 'Pb2n'),
+    ('P -2bc -2bc', 30, 'Pn2b'),
+    ('P 2ac -2', 31, 'Pmn2_1'),
+    ('P 2bc -2bc', 31, 'Pnm2_1'),
+    ('P -2ab 2ab', 31, 'P2_1mn'),
+    ('P -2 2ac', 31, 'P2_1nm'),
+    ('P -2 -2bc', 31, 'Pn2_1m'),
+    ('P -2ab -2', 31, 'Pm2_1n'),
+    ('P 2 -2ab', 32, 'Pba2'),
+    ('P -2bc 2', 32, 'P2cb'),
+    ('P -2ac -2ac', 32, 'Pc2a'),
+    ('P 2c -2n', 33, 'Pna2_1'),
+    ('P 2c -2ab', 33, 'Pbn2_1'),
+    ('P -2bc 2a', 33, 'P2_1nb'),
+    ('P -2n 2a', 33, 'P2_1cn'),
+    ('P -2n -2ac', 33, 'Pc2_1n'),
+    ('P -2ac -2n', 33, 'Pn2_1a'),
+    ('P 2 -2n', 34, 'Pnn2'),
+    ('P -2n 2', 34, 'P2nn'),
+    ('P -2n -2n', 34, 'Pn2n'),
+    ('C 2 -2', 35, 'Cmm2'),
+    ('A -2 2', 35, 'A2mm'),
+    ('B -2 -2', 35, 'Bm2m'),
+    ('C 2c -2', 36, 'Cmc2_1'),
+    ('C 2c -2c', 36, 'Ccm2_1'),
+    ('A -2a 2a', 36, 'A2_1ma'),
+    ('A -2 2a', 36, 'A2_1am'),
+    ('B -2 -2b', 36, 'Bb2_1m'),
+    ('B -2b -2', 36, 'Bm2_1b'),
+    ('C 2 -2c', 37, 'Ccc2'),
+    ('A -2a 2', 37, 'A2aa'),
+    ('B -2b -2b', 37, 'Bb2b'),
+    ('A 2 -2', 38, 'Amm2'),
+    ('B 2 -2', 38, 'Bmm2'),
+    ('B -2 2', 38, 'B2mm'),
+    ('C -2 2', 38, 'C2mm'),
+    ('C -2 -2', 38, 'Cm2m'),
+    ('A -2 -2', 38, 'Am2m'),
+    ('A 2 -2b', 39, 'Aem2'),
+    ('B 2 -2a', 39, 'Bme2'),
+    ('B -2a 2', 39, 'B2em'),
+    ('C -2a 2', 39, 'C2me'),
+    ('C -2a -2a', 39, 'Cm2e'),
+    ('A -2b -2b', 39, 'Ae2m'),
+    ('A 2 -2a', 40, 'Ama2'),
+    ('B 2 -2b', 40, 'Bbm2'),
+    ('B -2b 2', 40, 'B2mb'),
+    ('C -2c 2', 40, 'C2cm'),
+    ('C -2c -2c', 40, 'Cc2m'),
+    ('A -2a -2a', 40, 'Am2a'),
+    ('A 2 -2ab', 41, 'Aea2'),
+    ('B 2 -2ab', 41, 'Bbe2'),
+    ('B -2ab 2', 41, 'B2eb'),
+    ('C -2ac 2', 41, 'C2ce'),
+    ('C -2ac -2ac', 41, 'Cc2e'),
+    ('A -2ab -2ab', 41, 'Ae2a'),
+    ('F 2 -2', 42, 'Fmm2'),
+    ('F -2 2', 42, 'F2mm'),
+    ('F -2 -2', 42, 'Fm2m'),
+    ('F 2 -2d', 43, 'Fdd2'),
+    ('F -2d 2', 43, 'F2dd'),
+    ('F -2d -2d', 43, 'Fd2d'),
+    ('I 2 -2', 44, 'Imm2'),
+    ('I -2 2', 44, 'I2mm'),
+    ('I -2 -2', 44, 'Im2m'),
+    ('I 2 -2c', 45, 'Iba2'),
+    ('I -2a 2', 45, 'I2cb'),
+    ('I -2b -2b', 45, 'Ic2a'),
+    ('I 2 -2a', 46, 'Ima2'),
+    ('I 2 -2b', 46, 'Ibm2'),
+    ('I -2b 2', 46, 'I2mb'),
+    ('I -2c 2', 46, 'I2cm'),
+    ('I -2c -2c', 46, 'Ic2m'),
+    ('I -2a -2a', 46, 'Im2a'),
+    ('-P 2 2', 47, 'Pmmm'),
+    ('P 2 2 -1n', 48, 'Pnnn'),
+    ('-P 2ab 2bc', 48, 'Pnnn'),
+    ('-P 2 2c', 49, 'Pccm'),
+    ('-P 2a 2', 49, 'Pmaa'),
+    ('-P 2b 2b', 49, 'Pbmb'),
+    ('P 2 2 -1ab', 50, 'Pban'),
+    ('-P 2ab 2b', 50, 'Pban'),
+    ('P 2 2 -1bc', 50, 'Pncb'),
+    ('-P 2b 2bc', 50, 'Pncb'),
+    ('P 2 2 -1ac', 50, 'Pcna'),
+    ('-P 2a 2c', 50, 'Pcna'),
+    ('-P 2a 2a', 51, 'Pmma'),
+    ('-P 2b 2', 51, 'Pmmb'),
+    ('-P 2 2b', 51, 'Pbmm'),
+    ('-P 2c 2c', 51, 'Pcmm'),
+    ('-P 2c 2', 51, 'Pmcm'),
+    ('-P 2 2a', 51, 'Pmam'),
+    ('-P 2a 2bc', 52, 'Pnna'),
+    ('-P 2b 2n', 52, 'Pnnb'),
+    ('-P 2n 2b', 52, 'Pbnn'),
+    ('-P 2ab 2c', 52, 'Pcnn'),
+    ('-P 2ab 2n', 52, 'Pncn'),
+    ('-P 2n 2bc', 52, 'Pnan'),
+    ('-P 2ac 2', 53, 'Pmna'),
+    ('-P 2bc 2bc', 53, 'Pnmb'),
+    ('-P 2ab 2ab', 53, 'Pbmn'),
+    ('-P 2 2ac', 53, 'Pcnm'),
+    ('-P 2 2bc', 53, 'Pncm'),
+    ('-P 2ab 2', 53, 'Pman'),
+    ('-P 2a 2ac', 54, 'Pcca'),
+    ('-P 2b 2c', 54, 'Pccb'),
+    ('-P 2a 2b', 54, 'Pbaa'),
+    ('-P 2ac 2c', 54, 'Pcaa'),
+    ('-P 2bc 2b', 54, 'Pbcb'),
+    ('-P 2b 2ab', 54, 'Pbab'),
+    ('-P 2 2ab', 55, 'Pbam'),
+    ('-P 2bc 2', 55, 'Pmcb'),
+    ('-P 2ac 2ac', 55, 'Pcma'),
+    ('-P 2ab 2ac', 56, 'Pccn'),
+    ('-P 2ac 2bc', 56, 'Pnaa'),
+    ('-P 2bc 2ab', 56, 'Pbnb'),
+    ('-P 2c 2b', 57, 'Pbcm'),
+    ('-P 2c 2ac', 57, 'Pcam'),
+    ('-P 2ac 2a', 57, 'Pmca'),
+    ('-P 2b 2a', 57, 'Pmab'),
+    ('-P 2a 2ab', 57, 'Pbma'),
+    ('-P 2bc 2c', 57, 'Pcmb'),
+    ('-P 2 2n', 58, 'Pnnm'),
+    ('-P 2n 2', 58, 'Pmnn'),
+    ('-P 2n 2n', 58, 'Pnmn'),
+    ('P 2 2ab -1ab', 59, 'Pmmn'),
+    ('-P 2ab 2a', 59, 'Pmmn'),
+    ('P 2bc 2 -1bc', 59, 'Pnmm'),
+    ('-P 2c 2bc', 59, 'Pnmm'),
+    ('P 2ac 2ac -1ac', 59, 'Pmnm'),
+    ('-P 2c 2a', 59, 'Pmnm'),
+    ('-P 2n 2ab', 60, 'Pbcn'),
+    ('-P 2n 2c', 60, 'Pcan'),
+    ('-P 2a 2n', 60, 'Pnca'),
+    ('-P 2bc 2n', 60, 'Pnab'),
+    ('-P 2ac 2b', 60, 'Pbna'),
+    ('-P 2b 2ac', 60, 'Pcnb'),
+    ('-P 2ac 2ab', 61, 'Pbca'),
+    ('-P 2bc 2ac', 61, 'Pcab'),
+    ('-P 2ac 2n', 62, 'Pnma'),
+    ('-P 2bc 2a', 62, 'Pmnb'),
+    ('-P 2c 2ab', 62, 'Pbnm'),
+    ('-P 2n 2ac', 62, 'Pcmn'),
+    ('-P 2n 2a', 62, 'Pmcn'),
+    ('-P 2c 2n', 62, 'Pnam'),
+    ('-C 2c 2', 63, 'Cmcm'),
+    ('-C 2c 2c', 63, 'Ccmm'),
+    ('-A 2a 2a', 63, 'Amma'),
+    ('-A 2 2a', 63, 'Amam'),
+    ('-B 2 2b', 63, 'Bbmm'),
+    ('-B 2b 2', 63, 'Bmmb'),
+    ('-C 2ac 2', 64, 'Cmce'),
+    ('-C 2ac 2ac', 64, 'Ccme'),
+    ('-A 2ab 2ab', 64, 'Aema'),
+    ('-A 2 2ab', 64, 'Aeam'),
+    ('-B 2 2ab', 64, 'Bbem'),
+    ('-B 2ab 2', 64, 'Bmeb'),
+    ('-C 2 2', 65, 'Cmmm'),
+    ('-A 2 2', 65, 'Ammm'),
+    ('-B 2 2', 65, 'Bmmm'),
+    ('-C 2 2c', 66, 'Cccm'),
+    ('-A 2a 2', 66, 'Amaa'),
+    ('-B 2b 2b', 66, 'Bbmb'),
+    ('-C 2a 2', 67, 'Cmme'),
+    ('-C 2a 2a', 67, 'Cmme'),
+    ('-A 2b 2b', 67, 'Aemm'),
+    ('-A 2 2b', 67, 'Aemm'),
+    ('-B 2 2a', 67, 'Bmem'),
+    ('-B 2a 2', 67, 'Bmem'),
+    ('C 2 2 -1ac', 68, 'Ccce'),
+    ('-C 2a 2ac', 68, 'Ccce'),
+    ('C 2 2 -1ac', 68, 'Ccce'),
+    ('-C 2a 2c', 68, 'Ccce'),
+    ('A 2 2 -1ab', 68, 'Aeaa'),
+    ('-A 2a 2b', 68, 'Aeaa'),
+    ('A 2 2 -1ab', 68, 'Aeaa'),
+    ('-A 2ab 2b', 68, 'Aeaa'),
+    ('B 2 2 -1ab', 68, 'Bbeb'),
+    ('-B 2ab 2b', 68, 'Bbcb'),
+    ('B 2 2 -1ab', 68, 'Bbeb'),
+    ('-B 2b 2ab', 68, 'Bbeb'),
+    ('-F 2 2', 69, 'Fmmm'),
+    ('F 2 2 -1d', 70, 'Fddd'),
+    ('-F 2uv 2vw', 70, 'Fddd'),
+    ('-I 2 2', 71, 'Immm'),
+    ('-I 2 2c', 72, 'Ibam'),
+    ('-I 2a 2', 72, 'Imcb'),
+    ('-I 2b 2b', 72, 'Icma'),
+    ('-I 2b 2c', 73, 'Ibca'),
+    ('-I 2a 2b', 73, 'Icab'),
+    ('-I 2b 2', 74, 'Imma'),
+    ('-I 2a 2a', 74, 'Immb'),
+    ('-I 2c 2c', 74, 'Ibmm'),
+    ('-I 2 2b', 74, 'Icmm'),
+    ('-I 2 2a', 74, 'Imcm'),
+    ('-I 2c 2', 74, 'Imam'),
+    ('P 4', 75, 'P4'),
+    ('P 4w', 76, 'P4_1'),
+    ('P 4c', 77, 'P4_2'),
+    ('P 4cw', 78, 'P4_3'),
+    ('I 4', 79, 'I4'),
+    ('I 4bw', 80, 'I4_1'),
+    ('P -4', 81, 'P-4'),
+    ('I -4', 82, 'I-4'),
+    ('-P 4', 83, 'P4/m'),
+    ('-P 4c', 84, 'P4_2/m'),
+    ('P 4ab -1ab', 85, 'P4/n'),
+    ('-P 4a', 85, 'P4/n'),
+    ('P 4n -1n', 86, 'P4_2/n'),
+    ('-P 4bc', 86, 'P4_2/n'),
+    ('-I 4', 87, 'I4/m'),
+    ('I 4bw -1bw', 88, 'I4_1/a'),
+    ('-I 4ad', 88, 'I4_1/a'),
+    ('P 4 2', 89, 'P422'),
+    ('P 4ab 2ab', 90, 'P42_12'),
+    ('P 4w 2c', 91, 'P4_122'),
+    ('P 4abw 2nw', 92, 'P4_12_12'),
+    ('P 4c 2', 93, 'P4_222'),
+    ('P 4n 2n', 94, 'P4_22_12'),
+    ('P 4cw 2c', 95, 'P4_322'),
+    ('P 4nw 2abw', 96, 'P4_32_12'),
+    ('I 4 2', 97, 'I422'),
+    ('I 4bw 2bw', 98, 'I4_122'),
+    ('P 4 -2', 99, 'P4mm'),
+    ('P 4 -2ab', 100, 'P4bm'),
+    ('P 4c -2c', 101, 'P4_2cm'),
+    ('P 4n -2n', 102, 'P4_2nm'),
+    ('P 4 -2c', 103, 'P4cc'),
+    ('P 4 -2n', 104, 'P4nc'),
+    ('P 4c -2', 105, 'P4_2mc'),
+    ('P 4c -2ab', 106, 'P4_2bc'),
+    ('I 4 -2', 107, 'I4mm'),
+    ('I 4 -2c', 108, 'I4cm'),
+    ('I 4bw -2', 109, 'I4_1md'),
+    ('I 4bw -2c', 110, 'I4_1cd'),
+    ('P -4 2', 111, 'P-42m'),
+    ('P -4 2c', 112, 'P-42c'),
+    ('P -4 2ab', 113, 'P-42_1m'),
+    ('P -4 2n', 114, 'P-42_1c'),
+    ('P -4 -2', 115, 'P-4m2'),
+    ('P -4 -2c', 116, 'P-4c2'),
+    ('P -4 -2ab', 117, 'P-4b2'),
+    ('P -4 -2n', 118, 'P-4n2'),
+    ('I -4 -2', 119, 'I-4m2'),
+    ('I -4 -2c', 120, 'I-4c2'),
+    ('I -4 2', 121, 'I-42m'),
+    ('I -4 2bw', 122, 'I-42d'),
+    ('-P 4 2', 123, 'P4/mmm'),
+    ('-P 4 2c', 124, 'P4/mcc'),
+    ('P 4 2 -1ab', 125, 'P4/nbm'),
+    ('-P 4a 2b', 125, 'P4/nbm'),
+    ('P 4 2 -1n', 126, 'P4/nnc'),
+    ('-P 4a 2bc', 126, 'P4/nnc'),
+    ('-P 4 2ab', 127, 'P4/mbm'),
+    ('-P 4 2n', 128, 'P4/mnc'),
+    ('P 4ab 2ab -1ab', 129, 'P4/nmm'),
+    ('-P 4a 2a', 129, 'P4/nmm'),
+    ('P 4ab 2n -1ab', 130, 'P4/ncc'),
+    ('-P 4a 2ac', 130, 'P4/ncc'),
+    ('-P 4c 2', 131, 'P4_2/mmc'),
+    ('-P 4c 2c', 132, 'P4_2/mcm'),
+    ('P 4n 2c -1n', 133, 'P4_2/nbc'),
+    ('-P 4ac 2b', 133, 'P4_2/nbc'),
+    ('P 4n 2 -1n', 134, 'P4_2/nnm'),
+    ('-P 4ac 2bc', 134, 'P4_2/nnm'),
+    ('-P 4c 2ab', 135, 'P4_2/mbc'),
+    ('-P 4n 2n', 136, 'P4_2/mnm'),
+    ('P 4n 2n -1n', 137, 'P4_2/nmc'),
+    ('-P 4ac 2a', 137, 'P4_2/nmc'),
+    ('P 4n 2ab -1n', 138, 'P4_2/ncm'),
+    ('-P 4ac 2ac', 138, 'P4_2/ncm'),
+    ('-I 4 2', 139, 'I4/mmm'),
+    ('-I 4 2c', 140, 'I4/mcm'),
+    ('I 4bw 2bw -1bw', 141, 'I4_1/amd'),
+    ('-I 4bd 2', 141, 'I4_1/amd'),
+    ('I 4bw 2aw -1bw', 142, 'I4_1/acd'),
+    ('-I 4bd 2c', 142, 'I4_1/acd'),
+    ('P 3', 143, 'P3'),
+    ('P 31', 144, 'P3_1'),
+    ('P 32', 145, 'P3_2'),
+    ('R 3', 146, 'R3'),
+    ('P 3*', 146, 'R3'),
+    ('-P 3', 147, 'P-3'),
+    ('-R 3', 148, 'R-3'),
+    ('-P 3*', 148, 'R-3'),
+    ('P 3 2', 149, 'P312'),
+    ('P 3 2"', 150, 'P321'),
+    ('P 31 2 (0 0 4)', 151, 'P3_112'),
+    ('P 31 2"', 152, 'P3_121'),
+    ('P 32 2 (0 0 2)', 153, 'P3_212'),
+    ('P 32 2"', 154, 'P3_221'),
+    ('R 3 2"', 155, 'R32'),
+    ('P 3* 2', 155, 'R32'),
+    ('P 3 -2"', 156, 'P3m1'),
+    ('P 3 -2', 157, 'P31m'),
+    ('P 3 -2"c', 158, 'P3c1'),
+    ('P 3 -2c', 159, 'P31c'),
+    ('R 3 -2"', 160, 'R3m'),
+    ('P 3* -2', 160, 'R3m'),
+    ('R 3 -2"c', 161, 'R3c'),
+    ('P 3* -2n', 161, 'R3c'),
+    ('-P 3 2', 162, 'P-31m'),
+    ('-P 3 2c', 163, 'P-31c'),
+    ('-P 3 2"', 164, 'P-3m1'),
+    ('-P 3 2"c', 165, 'P-3c1'),
+    ('-R 3 2"', 166, 'R-3m'),
+    ('-P 3* 2', 166, 'R-3m'),
+    ('-R 3 2"c', 167, 'R-3c'),
+    ('-P 3* 2n', 167, 'R-3c'),
+    ('P 6', 168, 'P6'),
+    ('P 61', 169, 'P6_1'),
+    ('P 65', 170, 'P6_5'),
+    ('P 62', 171, 'P6_2'),
+    ('P 64', 172, 'P6_4'),
+    ('P 6c', 173, 'P6_3'),
+    ('P -6', 174, 'P-6'),
+    ('-P 6', 175, 'P6/m'),
+    ('-P 6c', 176, 'P6_3/m'),
+    ('P 6 2', 177, 'P622'),
+    ('P 61 2 (0 0 5)', 178, 'P6_122'),
+    ('P 65 2 (0 0 1)', 179, 'P6_522'),
+    ('P 62 2 (0 0 4)', 180, 'P6_222'),
+    ('P 64 2 (0 0 2)', 181, 'P6_422'),
+    ('P 6c 2c', 182, 'P6_322'),
+    ('P 6 -2', 183, 'P6mm'),
+    ('P 6 -2c', 184, 'P6cc'),
+    ('P 6c -2', 185, 'P6_3cm'),
+    ('P 6c -2c', 186, 'P6_3mc'),
+    ('P -6 2', 187, 'P-6m2'),
+    ('P -6c 2', 188, 'P-6c2'),
+    ('P -6 -2', 189, 'P-62m'),
+    ('P -6c -2c', 190, 'P-62c'),
+    ('-P 6 2', 191, 'P6/mmm'),
+    ('-P 6 2c', 192, 'P6/mcc'),
+    ('-P 6c 2', 193, 'P6_3/mcm'),
+    ('-P 6c 2c', 194, 'P6_3/mmc'),
+    ('P 2 2 3', 195, 'P23'),
+    ('F 2 2 3', 196, 'F23'),
+    ('I 2 2 3', 197, 'I23'),
+    ('P 2ac 2ab 3', 198, 'P2_13'),
+    ('I 2b 2c 3', 199, 'I2_13'),
+    ('-P 2 2 3', 200, 'Pm-3'),
+    ('P 2 2 3 -1n', 201, 'Pn-3'),
+    ('-P 2ab 2bc 3', 201, 'Pn-3'),
+    ('-F 2 2 3', 202, 'Fm-3'),
+    ('F 2 2 3 -1d', 203, 'Fd-3'),
+    ('-F 2uv 2vw 3', 203, 'Fd-3'),
+    ('-I 2 2 3', 204, 'Im-3'),
+    ('-P 2ac 2ab 3', 205, 'Pa-3'),
+    ('-I 2b 2c 3', 206, 'Ia-3'),
+    ('P 4 2 3', 207, 'P432'),
+    ('P 4n 2 3', 208, 'P4_232'),
+    ('F 4 2 3', 209, 'F432'),
+    ('F 4d 2 3', 210, 'F4_132'),
+    ('I 4 2 3', 211, 'I432'),
+    ('P 4acd 2ab 3', 212, 'P4_332'),
+    ('P 4bd 2ab 3', 213, 'P4_132'),
+    ('I 4bd 2c 3', 214, 'I4_132'),
+    ('P -4 2 3', 215, 'P-43m'),
+    ('F -4 2 3', 216, 'F-43m'),
+    ('I -4 2 3', 217, 'I-43m'),
+    ('P -4n 2 3', 218, 'P-43n'),
+    ('F -4a 2 3', 219, 'F-43c'),
+    ('I -4bd 2c 3', 220, 'I-43d'),
+    ('-P 4 2 3', 221, 'Pm-3m'),
+    ('P 4 2 3 -1n', 222, 'Pn-3n'),
+    ('-P 4a 2bc 3', 222, 'Pn-3n'),
+    ('-P 4n 2 3', 223, 'Pm-3n'),
+    ('P 4n 2 3 -1n', 224, 'Pn-3m'),
+    ('-P 4bc 2bc 3', 224, 'Pn-3m'),
+    ('-F 4 2 3', 225, 'Fm-3m'),
+    ('-F 4a 2 3', 226, 'Fm-3c'),
+    ('F 4d 2 3 -1d', 227, 'Fd-3m'),
+    ('-F 4vw 2vw 3', 227, 'Fd-3m'),
+    ('F 4d 2 3 -1ad', 228, 'Fd-3c'),
+    ('-F 4ud 2vw 3', 228, 'Fd-3c'),
+    ('-I 4 2 3', 229, 'Im-3m'),
+    ('-I 4bd 2c 3', 230, 'Ia-3d'),]
+
+# (largest space group number, crystal system)
+CRYSTAL_SYSTEMS = [
+    (2, 'triclinic'),
+    (15, 'monoclinic'),
+    (74, 'orthorhombic'),
+    (142, 'tetragonal'),
+    (167, 'trigonal'),
+    (194, 'hexagonal'),
+    (230, 'cubic'),
+]
+
+
+def normalize_hall(hall: str) -> str:
+    '''
+    The Hall symbol with single spaces, as written in `HALL_SETTINGS`.
+    '''
+    return ' '.join(hall.split())
+
+
+# the first Hall number of every Hall symbol, the two origin choices of some
+# settings of space group 68 share their symbol
+HALL_NUMBERS: dict[str, int] = {}
+# the Hall number of the standard setting of every space group
+STANDARD_HALL_NUMBERS: dict[int, int] = {}
+for _hall_number, (_hall, _number, _) in enumerate(HALL_SETTINGS, start=1):
+    HALL_NUMBERS.setdefault(normalize_hall(_hall), _hall_number)
+    STANDARD_HALL_NUMBERS.setdefault(_number, _hall_number)
+
+
+def hall_setting(hall: str | None) -> tuple[str, int, str] | None:
+    '''
+    The setting of a Hall symbol, or `None` if it is not one of the 530 settings.
+    '''
+    if not hall:
+        return None
+    hall_number = HALL_NUMBERS.get(normalize_hall(hall))
+    return HALL_SETTINGS[hall_number - 1] if hall_number else None
+
+
+def standard_hall(number: int | None) -> str | None:
+    '''
+    The Hall symbol of the standard setting of a space group number.
+    '''
+    hall_number = STANDARD_HALL_NUMBERS.get(number)
+    return HALL_SETTINGS[hall_number - 1][0] if hall_number else None
+
+
+def crystal_system(number: int | None) -> str | None:
+    if number is None or not 1 <= number <= 230:
+        return None
+    for largest, system in CRYSTAL_SYSTEMS:
+        if number <= largest:
+            return system
+    return None
@@ -0,0 +1,325 @@
+'''
+One-pass streaming statistics over MOFArchive descriptors.
+
+The accumulators only keep a constant amount of state per descriptor, so they can
+be updated incrementally as entries are added and be merged across batches or
+workers. Values are addressed by their quantity path, e.g.
+`data.reference_data.publication`, which is also the id of the corresponding
+search quantity without the schema suffix. Plugin quantities are indexed as
+dynamic `search_quantities` of an entry, which is where they are read from.
+'''
+
+from array import array
+from collections import Counter
+from collections.abc import Iterator
+from datetime import datetime
+
+import numpy as np
+
+PORES = 'data.calculation_properties.structural_properties.pore_characteristics'
+TOPOLOGY = (
+    'data.calculation_properties.structural_properties.'
+    'topological_and_crystallographic_information'
+)
+
+# quantity path -> (label, unit, lower and upper bound of the fixed bins)
+DESCRIPTORS = {
+    f'{PORES}.PLD_angstrom': ('Pore Limiting Diameter (PLD)', 'angstrom', 0, 50),
+    f'{PORES}.ASA_m2_cm3': ('Accessible Surface Area (ASA)', 'm**2/cm**3', 0, 5000),
+    f'{PORES}.NASA_m2_cm3': (
+        'Non-Accessible Surface Area (NASA)',
+        'm**2/cm**3',
+        0,
+        5000,
+    ),
+    f'{PORES}.PV_cm3_g': ('Pore Volume (PV)', 'cm**3/g', 0, 5),
+    'data.synthesis_information.synthesis_parameter.temperature': (
+        'Synthesis Temperature',
+        'celsius',
+        0,
+        500,
+    ),
+}
+# quantity path -> label
+TERMS = {
+    f'{TOPOLOGY}.hall': 'Hall Symbol',
+    'data.reference_data.publication': 'Publisher',
+}
+N_BINS = 100
+TOP_K = 20
+
+
+class RunningStatistics:
+    '''
+    Count, minimum, maximum, mean and variance of a stream of values, updated with
+    Welford's method, plus a histogram over fixed bins. Batches are combined with
+    the parallel form of the update (Chan et al.), which reduces to Welford's
+    update for single values.
+    '''
+
+    def __init__(self, lower: float, upper: float, n_bins: int = N_BINS):
+        self.bin_edges = np.linspace(lower, upper, n_bins + 1)
+        self.bin_counts = np.zeros(n_bins, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+
+    @property
+    def variance(self) -> float | None:
+        return self.m2 / (self.count - 1) if self.count > 1 else None
+
+    def update(self, values) -> None:
+        values = np.asarray(values, dtype=float)
+        values = values[np.isfinite(values)]
+        if not len(values):
+            return
+        batch_mean = values.mean()
+        self._combine(len(values), batch_mean, ((values - batch_mean) ** 2).sum())
+        self.minimum = min(self.minimum, values.min())
+        self.maximum = max(self.maximum, values.max())
+        self.bin_counts += np.histogram(values, bins=self.bin_edges)[0]
+        self.underflow += int((values < self.bin_edges[0]).sum())
+        self.overflow += int((values > self.bin_edges[-1]).sum())
+
+    def merge(self, other: 'RunningStatistics') -> None:
+        if not other.count:
+            return
+        self._combine(other.count, other.mean, other.m2)
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.bin_counts += other.bin_counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+
+    def _combine(self, count: int, mean: float, m2: float) -> None:
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta**2 * self.count * count / total
+        self.count = total
+
+    def to_dict(self) -> dict:
+        return dict(
+            bin_edges=self.bin_edges.tolist(),
+            bin_counts=self.bin_counts.tolist(),
+            underflow=self.underflow,
+            overflow=self.overflow,
+            count=self.count,
+            mean=float(self.mean),
+            m2=float(self.m2),
+            minimum=float(self.minimum) if self.count else None,
+            maximum=float(self.maximum) if self.count else None,
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'RunningStatistics':
+        statistics = cls(0, 1, len(data['bin_counts']))
+        statistics.bin_edges = np.asarray(data['bin_edges'], dtype=float)
+        statistics.bin_counts = np.asarray(data['bin_counts'], dtype=np.int64)
+        for name in ('underflow', 'overflow', 'count', 'mean', 'm2'):
+            setattr(statistics, name, data[name])
+        if statistics.count:
+            statistics.minimum = float(data['minimum'])
+            statistics.maximum = float(data['maximum'])
+        return statistics
+
+
+class TermCounts:
+    '''
+    Occurrences of the terms of a categorical quantity.
+    '''
+
+    def __init__(self):
+        self.counts = Counter()
+
+    def update(self, values) -> None:
+        self.counts.update(value for value in values if value is not None)
+
+    def merge(self, other: 'TermCounts') -> None:
+        self.counts.update(other.counts)
+
+    def top(self, k: int = TOP_K) -> list[tuple[str, int]]:
+        return self.counts.most_common(k)
+
+    def to_dict(self) -> dict:
+        return dict(self.counts)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'TermCounts':
+        terms = cls()
+        terms.counts.update(data)
+        return terms
+
+
+class MOFStatistics:
+    '''
+    The statistics of all `DESCRIPTORS` and `TERMS` of a set of MOFArchive
+    entries.
+    '''
+
+    def __init__(self):
+        self.n_entries = 0
+        self.descriptors = {
+            path: RunningStatistics(lower, upper)
+            for path, (_, _, lower, upper) in DESCRIPTORS.items()
+        }
+        self.terms = {path: TermCounts() for path in TERMS}
+
+    def update(self, records: list[dict]) -> None:
+        '''
+        Adds a batch of records, each a dict from quantity path to value.
+        '''
+        self.n_entries += len(records)
+        for path, statistics in self.descriptors.items():
+            statistics.update(
+                [record[path] for record in records if record.get(path) is not None]
+            )
+        for path, terms in self.terms.items():
+            terms.update(record.get(path) for record in records)
+
+    def merge(self, other: 'MOFStatistics') -> None:
+        self.n_entries += other.n_entries
+        for path, statistics in self.descriptors.items():
+            statistics.merge(other.descriptors[path])
+        for path, terms in self.terms.items():
+            terms.merge(other.terms[path])
+
+    def to_dict(self) -> dict:
+        return dict(
+            n_entries=self.n_entries,
+            descriptors={
+                path: statistics.to_dict()
+                for path, statistics in self.descriptors.items()
+            },
+            terms={path: terms.to_dict() for path, terms in self.terms.items()},
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'MOFStatistics':
+        statistics = cls()
+        statistics.n_entries = data.get('n_entries', 0)
+        for path, state in data.get('descriptors', {}).items():
+            if path in statistics.descriptors:
+                statistics.descriptors[path] = RunningStatistics.from_dict(state)
+        for path, state in data.get('terms', {}).items():
+            if path in statistics.terms:
+                statistics.terms[path] = TermCounts.from_dict(state)
+        return statistics
+
+
+def upload_query(
+    upload_id: str,
+    schema: str,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    processed_after: datetime | None = None,
+) -> dict:
+    '''
+    The search query for the entries of `schema` in an upload, optionally
+    restricted by their creation and last processing time.
+    '''
+    query: dict = {
+        'upload_id': upload_id,
+        'section_defs.definition_qualified_name': schema,
+    }
+    created = {}
+    if created_after is not None:
+        created['gt'] = created_after.isoformat()
+    if created_before is not None:
+        created['lte'] = created_before.isoformat()
+    if created:
+        query['entry_create_time'] = created
+    if processed_after is not None:
+        query['last_processing_time'] = {'gt': processed_after.isoformat()}
+    return query
+
+
+def count_upload_entries(upload_id: str, schema: str, **times) -> int:
+    '''
+    The number of entries of `schema` in an upload, see `upload_query`.
+    '''
+    from nomad.app.v1.models import MetadataPagination
+    from nomad.search import search
+
+    response = search(
+        # no owner restriction: processing reads the entries of its own, possibly
+        # unpublished upload
+        owner=None,
+        query=upload_query(upload_id, schema, **times),
+        pagination=MetadataPagination(page_size=0),
+    )
+    return response.pagination.total
+
+
+def search_quantity_values(entry: dict, schema: str, paths: list[str]) -> dict:
+    '''
+    The values of the given quantity paths from the dynamic `search_quantities`
+    of an entry of `schema` in the search index.
+    '''
+    ids = {f'{path}#{schema}': path for path in paths}
+    values = dict.fromkeys(paths)
+    for quantity in entry.get('search_quantities') or []:
+        path = ids.get(quantity.get('id'))
+        if path is None:
+            continue
+        for field in ('float_value', 'int_value', 'str_value', 'bool_value'):
+            if quantity.get(field) is not None:
+                values[path] = quantity[field]
+                break
+    return values
+
+
+def iter_upload_records(
+    upload_id: str, schema: str, since: datetime | None = None
+) -> Iterator[dict]:
+    '''
+    Yields the `DESCRIPTORS` and `TERMS` of the entries of `schema` in an upload,
+    read from the search index instead of the archives. With `since`, only entries
+    created after that time are returned.
+    '''
+    from nomad.app.v1.models import MetadataRequired
+    from nomad.search import search_iterator
+
+    paths = [*DESCRIPTORS, *TERMS]
+    entries = search_iterator(
+        owner=None,
+        query=upload_query(upload_id, schema, created_after=since),
+        required=MetadataRequired(include=['entry_id', 'search_quantities']),
+    )
+    for entry in entries:
+        yield search_quantity_values(entry, schema, paths)
+
+
+def read_upload_columns(
+    upload_id: str, schema: str, paths: dict[str, str]
+) -> tuple[list[str], dict[str, np.ndarray]]:
+    '''
+    The entry ids and, by column name, the values of the number quantities
+    `paths` of all entries of `schema` in an upload, read from the search index
+    into float arrays with NaN for missing values.
+    '''
+    from nomad.app.v1.models import MetadataRequired
+    from nomad.search import search_iterator
+
+    entries = search_iterator(
+        owner=None,
+        query=upload_query(upload_id, schema),
+        required=MetadataRequired(include=['entry_id', 'search_quantities']),
+    )
+    entry_ids = []
+    buffers = {column: array('d') for column in paths}
+    for entry in entries:
+        entry_ids.append(entry['entry_id'])
+        values = search_quantity_values(entry, schema, list(paths.values()))
+        for column, path in paths.items():
+            value = values[path]
+            number = type(value) in (int, float)
+            buffers[column].append(value if number else np.nan)
+    return entry_ids, {
+        column: np.frombuffer(buffer, dtype=np.float64)
+        for column, buffer in buffers.items()
+    }
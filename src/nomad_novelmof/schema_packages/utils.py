@@ -0,0 +1,81 @@
+from typing import (
+    TYPE_CHECKING,
+)
+
+if TYPE_CHECKING:
+    from ase import Atoms
+    from structlog.stdlib import (
+        BoundLogger,
+    )
+
+from nomad.datamodel.results import Material, Relation, Symmetry, System
+
+SYMMETRY_TOLERANCE = 0.1
+ROOT_SYSTEM_ID = 'results/material/topology/0'
+# version of the results of `material_from_atoms`, to be increased on changes
+MATERIAL_VERSION = 1
+
+
+def material_from_atoms(
+    atoms: 'Atoms',
+    material: 'Material',
+    logger: 'BoundLogger',
+    symmetry_tol: float = SYMMETRY_TOLERANCE,
+) -> None:
+    '''
+    Fills elements, formulas, symmetry and the root topology system of
+    `results.material` directly from an ASE structure.
+
+    This replaces wrapping the structure into `run.system` and running the system
+    normalizer, which allocates a whole `run` section for a single structure.
+    '''
+    from nomad.atomutils import Formula
+
+    Formula(atoms.get_chemical_formula()).populate(
+        material, descriptive_format='hill', overwrite=True
+    )
+
+    if atoms.pbc.all():
+        try:
+            from matid import SymmetryAnalyzer
+
+            analyzer = SymmetryAnalyzer(atoms, symmetry_tol=symmetry_tol)
+            material.symmetry = Symmetry(
+                space_group_number=analyzer.get_space_group_number(),
+                space_group_symbol=analyzer.get_space_group_international_short(),
+                hall_number=analyzer.get_hall_number(),
+                hall_symbol=analyzer.get_hall_symbol(),
+                point_group=analyzer.get_point_group(),
+                crystal_system=analyzer.get_crystal_system(),
+                bravais_lattice=analyzer.get_bravais_lattice(),
+            )
+        except Exception as e:
+            logger.warning('Could not analyse the symmetry of the structure.', exc_info=e)
+
+    if not material.topology:
+        system = System(
+            system_id=ROOT_SYSTEM_ID,
+            method='parser',
+            label='original',
+            description='The structure given in the structure file.',
+            system_relation=Relation(type='root'),
+            n_atoms=len(atoms),
+        )
+        Formula(atoms.get_chemical_formula()).populate(
+            system, descriptive_format='hill'
+        )
+        if atoms.pbc.all():
+            from nomad.normalizing.common import cell_from_ase_atoms
+
+            system.cell = cell_from_ase_atoms(atoms)
+        material.m_add_sub_section(Material.topology, system)
+
+
+def update_material(material: 'Material', data: dict) -> None:
+    '''
+    Applies the `m_to_dict` of a material filled by `material_from_atoms`, e.g.
+    from the structure cache, to `material` the same way as the function itself.
+    '''
+    if material.topology:
+        data = {key: value for key, value in data.items() if key != 'topology'}
+    material.m_update_from_dict(data)
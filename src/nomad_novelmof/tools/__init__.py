@@ -0,0 +1,3 @@
+'''
+Command line tools for bulk processing of MOF archives outside of NOMAD.
+'''
@@ -0,0 +1,345 @@
+'''
+Throughput benchmark of parsing and normalizing `.mofarch.json` records, with a
+regression check against a stored baseline.
+
+Synthetic records from `tools.synthetic` are processed in chunks, so memory stays
+bounded from 1k to 1M records, and every stage is timed separately:
+
+- `json_load`: decoding the records from a bulk file,
+- `map_json_to_schema`: `MOFArchJsParser.map_json_to_schema_with_type_check`,
+- `map_json_to_schema_tolerant`: the same without the validated fast path,
+- `construct`: `MOFArchive` construction with `m_update_from_dict`,
+- `normalize`: `MOFArchive.normalize`,
+- `merge_sections`: merging an entry into a sparse copy of itself,
+- `create_archive`: writing the entry as a child archive file.
+
+`normalize` and `create_archive` are much slower per record and only run on the
+first `--sample` records. The garbage collector is paused while a stage is
+timed, as in `timeit`, so a collection of a heap grown elsewhere does not land in
+a short stage. Logging is discarded and the structure analyses of the
+CIFs, the duplicate search and the cache are switched off, so only the plugin's
+own work is measured. With `--baseline`, the time per record of every stage is
+compared with the stored one and the benchmark exits with an error if a stage got
+slower by more than `--tolerance`. `tests/tools/test_benchmark.py` runs a small
+benchmark against the baseline committed in `tests/data` if `MOFARCH_BENCHMARK`
+is set.
+
+With `--mapping-memory`, the mapped records are kept as bulk ingestion keeps
+them until their sections are constructed, once as a list of mapped dicts and
+once in `parsers.columns.MappedColumns` with interned strings, and the memory
+they hold is traced with `tracemalloc`. Measured with the default synthetic
+records, 1M mapped records hold 2.79 GB as dicts and 1.02 GB as columns, 2927
+and 1071 bytes per record, of which the CIF blocks of 10% of the records are
+about 700 bytes per record in both.
+
+Usage:
+
+    python -m nomad_novelmof.tools.benchmark -n 100000 --save-baseline baseline.json
+    python -m nomad_novelmof.tools.benchmark -n 100000 --baseline baseline.json
+    python -m nomad_novelmof.tools.benchmark -n 100000 --wrong-types 0.001 --sample 0
+    python -m nomad_novelmof.tools.benchmark -n 1000000 --mapping-memory
+'''
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+
+from nomad_novelmof.tools.records import iter_batches
+from nomad_novelmof.tools.synthetic import RecordGenerator
+
+STAGES = [
+    'json_load',
+    'map_json_to_schema',
+    'map_json_to_schema_tolerant',
+    'construct',
+    'normalize',
+    'merge_sections',
+    'create_archive',
+]
+SAMPLED_STAGES = {'normalize', 'create_archive'}
+DEFAULT_TOLERANCE = 0.25
+
+
+class NullLogger:
+    def _discard(self, *args, **kwargs):
+        pass
+
+    debug = info = warning = warn = error = exception = _discard
+
+    def bind(self, **kwargs) -> 'NullLogger':
+        return self
+
+
+def sparse_copy(data: dict) -> dict:
+    '''
+    Every other top-level field of a mapped record.
+    '''
+    return {key: value for index, (key, value) in enumerate(data.items()) if index % 2}
+
+
+# the plugin's own work only: no structure analyses of the CIFs, no searches for
+# duplicates and no cache, whatever the deployment configures
+BENCHMARK_CONFIGURATION = dict(
+    structure_from_cif=False,
+    fingerprint_structures=False,
+    cache_path=None,
+    log_stage_timings=False,
+    profile_memory=False,
+)
+
+
+@contextmanager
+def plugin_configuration(**settings):
+    '''
+    Temporarily changes the configuration of the schema entry point.
+    '''
+    from nomad_novelmof.schema_packages.novelmof_mofarch import configuration
+
+    previous = {name: getattr(configuration, name) for name in settings}
+    for name, value in settings.items():
+        setattr(configuration, name, value)
+    try:
+        yield configuration
+    finally:
+        for name, value in previous.items():
+            setattr(configuration, name, value)
+
+
+def run(
+    n: int,
+    chunk_size: int = 10_000,
+    sample: int = 1000,
+    generator: RecordGenerator | None = None,
+) -> dict[str, dict]:
+    '''
+    Runs all stages on `n` generated records with `BENCHMARK_CONFIGURATION`.
+    Returns the number of records, total seconds and seconds per record of every
+    stage.
+    '''
+    with (
+        tempfile.TemporaryDirectory(prefix='mofarch_benchmark_') as output_dir,
+        plugin_configuration(**BENCHMARK_CONFIGURATION),
+    ):
+        return _run(n, chunk_size, sample, generator or RecordGenerator(), output_dir)
+
+
+def _run(
+    n: int,
+    chunk_size: int,
+    sample: int,
+    generator: RecordGenerator,
+    output_dir: str,
+) -> dict[str, dict]:
+    from nomad.datamodel import EntryArchive, EntryMetadata
+    from nomad.datamodel.context import ClientContext
+
+    from nomad_novelmof.parsers.mofarch_json_parser import MOFArchJsParser
+    from nomad_novelmof.parsers.utils import create_archive, merge_sections
+    from nomad_novelmof.schema_packages.novelmof_mofarch import MOFArchive
+
+    logger = NullLogger()
+    seconds = defaultdict(float)
+    counts = defaultdict(int)
+    context = ClientContext(local_dir=output_dir)
+
+    def timed(stage, function, items):
+        # as with `timeit`, full collections of the whole heap are not timed
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            results = [function(item) for item in items]
+            seconds[stage] += time.perf_counter() - start
+        finally:
+            if enabled:
+                gc.enable()
+        counts[stage] += len(items)
+        return results
+
+    def construct(data):
+        entry = MOFArchive()
+        entry.m_update_from_dict(data)
+        return entry
+
+    def normalize(entry):
+        entry.normalize(EntryArchive(data=entry, metadata=EntryMetadata()), logger)
+
+    def merge(pair):
+        merge_sections(pair[0], pair[1], logger)
+
+    def write(indexed_entry):
+        index, entry = indexed_entry
+        create_archive(
+            entry,
+            EntryArchive(m_context=context),
+            os.path.join(output_dir, f'mof_{index}.archive.json'),
+        )
+
+    done = 0
+    for chunk in iter_batches(generator.records(n), chunk_size):
+        text = json.dumps(chunk)
+        records = timed('json_load', json.loads, [text])[0]
+        counts['json_load'] += len(records) - 1
+        mapped = timed(
+            'map_json_to_schema',
+            lambda record: MOFArchJsParser.map_json_to_schema_with_type_check(
+                record, logger
+            ),
+            records,
+        )
+        timed(
+            'map_json_to_schema_tolerant',
+            lambda record: MOFArchJsParser.map_json_to_schema_with_type_check(
+                record, logger, fast_path=False
+            ),
+            records,
+        )
+        entries = timed('construct', construct, mapped)
+        sparse = [construct(sparse_copy(data)) for data in mapped]
+        timed('merge_sections', merge, list(zip(sparse, entries)))
+        remaining = max(0, sample - done)
+        if remaining:
+            timed('normalize', normalize, entries[:remaining])
+            timed('create_archive', write, list(enumerate(entries[:remaining], done)))
+        done += len(records)
+
+    return {
+        stage: dict(
+            n=counts[stage],
+            seconds=seconds[stage],
+            per_record=seconds[stage] / counts[stage],
+        )
+        for stage in STAGES
+        if counts[stage]
+    }
+
+
+def mapping_memory(
+    n: int,
+    chunk_size: int = 10_000,
+    generator: RecordGenerator | None = None,
+    storage: str = 'columns',
+) -> dict:
+    '''
+    Maps `n` generated records, decoded from JSON in chunks, and keeps them as a
+    list of dicts (`storage='dicts'`) or in `MappedColumns`. Returns the number
+    of records and the traced bytes held by the kept records.
+    '''
+    from nomad_novelmof.parsers.columns import MappedColumns
+    from nomad_novelmof.parsers.mofarch_json_parser import MOFArchJsParser
+
+    generator = generator or RecordGenerator()
+    logger = NullLogger()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    kept: list | MappedColumns = [] if storage == 'dicts' else MappedColumns()
+    for chunk in iter_batches(generator.records(n), chunk_size):
+        for record in json.loads(json.dumps(chunk)):
+            data = MOFArchJsParser.map_json_to_schema_with_type_check(record, logger)
+            kept.append(data)
+        del chunk
+    held = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return dict(n=len(kept), bytes=held, per_record=held / max(len(kept), 1))
+
+
+def regressions(
+    results: dict[str, dict], baseline: dict[str, dict], tolerance: float
+) -> list[str]:
+    '''
+    The stages whose time per record exceeds the baseline by more than
+    `tolerance`.
+    '''
+    return [
+        stage
+        for stage, result in results.items()
+        if stage in baseline
+        and result['per_record'] > baseline[stage]['per_record'] * (1 + tolerance)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('-n', type=int, default=10_000, help='Number of records.')
+    parser.add_argument('--chunk-size', type=int, default=10_000)
+    parser.add_argument(
+        '--sample', type=int, default=1000, help='Records to normalize and write.'
+    )
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--cif-rate', type=float, default=0.1)
+    parser.add_argument('--max-atoms', type=int, default=2000)
+    parser.add_argument(
+        '--wrong-types',
+        type=float,
+        default=0.1,
+        help='Probability that a typed field has the wrong type.',
+    )
+    parser.add_argument('--sparsity', type=float, default=0.2)
+    parser.add_argument('--baseline', help='Baseline JSON file to compare with.')
+    parser.add_argument('--save-baseline', help='Write the results as a baseline.')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument(
+        '--mapping-memory',
+        action='store_true',
+        help='Compare the memory of mapped records as dicts and as columns.',
+    )
+    parser.add_argument(
+        '--storage',
+        choices=['dicts', 'columns'],
+        action='append',
+        help='Storage to measure with --mapping-memory, both by default.',
+    )
+    args = parser.parse_args()
+
+    def generator():
+        return RecordGenerator(
+            seed=args.seed,
+            sparsity=args.sparsity,
+            wrong_types=args.wrong_types,
+            cif_rate=args.cif_rate,
+            max_atoms=args.max_atoms,
+        )
+
+    if args.mapping_memory:
+        print(f'{"storage":<30}{"records":>10}{"MB":>12}{"bytes/record":>14}')
+        for storage in args.storage or ['dicts', 'columns']:
+            result = mapping_memory(args.n, args.chunk_size, generator(), storage)
+            print(
+                f'{storage:<30}{result["n"]:>10}{result["bytes"] / 1e6:>12.1f}'
+                f'{result["per_record"]:>14.0f}'
+            )
+        return
+
+    results = run(args.n, args.chunk_size, args.sample, generator())
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print(f'{"stage":<30}{"records":>10}{"seconds":>12}{"us/record":>12}{"baseline":>12}')
+    for stage, result in results.items():
+        reference = baseline.get(stage, {}).get('per_record')
+        print(
+            f'{stage:<30}{result["n"]:>10}{result["seconds"]:>12.3f}'
+            f'{result["per_record"] * 1e6:>12.1f}'
+            + (f'{reference * 1e6:>12.1f}' if reference else f'{"-":>12}')
+        )
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    slower = regressions(results, baseline, args.tolerance)
+    if slower:
+        print(f'Regression in {", ".join(slower)} beyond {args.tolerance:.0%}.')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
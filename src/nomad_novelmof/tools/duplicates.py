@@ -0,0 +1,168 @@
+'''
+Persistent index of structure fingerprints for finding duplicate and
+near-duplicate MOFArchive structures.
+
+The fingerprints of `schema_packages.fingerprint` are stored in an SQLite file,
+indexed by structure hash and by formula. Exact duplicates are a lookup of the
+hash; near duplicates are looked up among the structures with the same formula,
+comparing their radial distributions in one vectorized step, so neither needs a
+pairwise comparison with all indexed structures.
+
+Usage:
+
+    python -m nomad_novelmof.tools.duplicates INDEX.sqlite ARCHIVE_DIR
+'''
+
+import argparse
+import os
+import sqlite3
+from collections.abc import Iterable, Iterator
+
+import numpy as np
+
+from nomad_novelmof.schema_packages.fingerprint import (
+    NEAR_DUPLICATE_DISTANCE,
+    atoms_from_cif,
+    fingerprint_distance,
+    structure_fingerprint,
+)
+from nomad_novelmof.tools.records import get_path, iter_archives
+
+
+class FingerprintIndex:
+    def __init__(self, path: str):
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(
+            '''
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                entry_id TEXT PRIMARY KEY,
+                formula TEXT NOT NULL,
+                structure_hash TEXT NOT NULL,
+                distribution BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS fingerprints_hash ON fingerprints (structure_hash);
+            CREATE INDEX IF NOT EXISTS fingerprints_formula ON fingerprints (formula);
+            '''
+        )
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> 'FingerprintIndex':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM fingerprints').fetchone()[0]
+
+    def add(
+        self,
+        fingerprints: Iterable[tuple[str, str, str, np.ndarray]],
+    ) -> None:
+        '''
+        Adds or replaces `(entry_id, formula, structure_hash, distribution)` tuples.
+        '''
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO fingerprints VALUES (?, ?, ?, ?)',
+                (
+                    (entry_id, formula, hash_, np.asarray(rdf, dtype='<f8').tobytes())
+                    for entry_id, formula, hash_, rdf in fingerprints
+                ),
+            )
+
+    def remove(self, entry_ids: Iterable[str]) -> None:
+        with self.connection:
+            self.connection.executemany(
+                'DELETE FROM fingerprints WHERE entry_id = ?',
+                ((entry_id,) for entry_id in entry_ids),
+            )
+
+    def exact(self, structure_hash: str) -> list[str]:
+        rows = self.connection.execute(
+            'SELECT entry_id FROM fingerprints WHERE structure_hash = ?',
+            (structure_hash,),
+        )
+        return [entry_id for entry_id, in rows]
+
+    def near(
+        self,
+        formula: str,
+        distribution: np.ndarray,
+        max_distance: float = NEAR_DUPLICATE_DISTANCE,
+    ) -> list[tuple[str, float]]:
+        '''
+        The indexed structures with the same formula whose radial distribution is
+        within `max_distance`, closest first, as `(entry_id, distance)` pairs.
+        '''
+        rows = self.connection.execute(
+            'SELECT entry_id, distribution FROM fingerprints WHERE formula = ?',
+            (formula,),
+        ).fetchall()
+        # fingerprints computed with other settings are not comparable
+        size = len(distribution) * 8
+        rows = [(entry_id, blob) for entry_id, blob in rows if len(blob) == size]
+        if not rows:
+            return []
+        ids = [entry_id for entry_id, _ in rows]
+        candidates = np.array([np.frombuffer(blob, dtype='<f8') for _, blob in rows])
+        distances = fingerprint_distance(np.asarray(distribution), candidates)
+        order = np.argsort(distances, kind='stable')
+        return [
+            (ids[i], float(distances[i])) for i in order if distances[i] <= max_distance
+        ]
+
+
+def iter_fingerprints(paths: Iterable[str]) -> Iterator[tuple[str, str, str, np.ndarray]]:
+    '''
+    Yields the fingerprints of MOFArchive archive files, taken from the archive if
+    it was normalized and computed from `cif_data` otherwise.
+    '''
+    for path, data in iter_archives(paths):
+        structural_data = get_path(data, 'structural_data') or {}
+        formula = structural_data.get('structure_formula')
+        structure_hash = structural_data.get('structure_hash')
+        distribution = structural_data.get('radial_distribution')
+        if not (formula and structure_hash and distribution):
+            if not structural_data.get('cif_data'):
+                continue
+            try:
+                atoms = atoms_from_cif(structural_data['cif_data'])
+            except Exception:
+                continue
+            formula, structure_hash, distribution = structure_fingerprint(atoms)
+        yield os.path.basename(path), formula, structure_hash, np.asarray(distribution)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('index')
+    parser.add_argument('archive_dir', help='Directory with *.archive.json files.')
+    parser.add_argument('--max-distance', type=float, default=NEAR_DUPLICATE_DISTANCE)
+    args = parser.parse_args()
+
+    paths = sorted(
+        os.path.join(args.archive_dir, name)
+        for name in os.listdir(args.archive_dir)
+        if name.endswith('.archive.json')
+    )
+    with FingerprintIndex(args.index) as index:
+        for entry_id, formula, structure_hash, distribution in iter_fingerprints(paths):
+            exact = [other for other in index.exact(structure_hash) if other != entry_id]
+            near = [
+                (other, distance)
+                for other, distance in index.near(formula, distribution, args.max_distance)
+                if other != entry_id and other not in exact
+            ]
+            if exact:
+                print(f'{entry_id}: duplicate of {", ".join(exact)}')
+            for other, distance in near:
+                print(f'{entry_id}: near duplicate of {other} ({distance:.3f})')
+            index.add([(entry_id, formula, structure_hash, distribution)])
+        print(f'{len(index)} structures in {args.index}.')
+
+
+if __name__ == '__main__':
+    main()
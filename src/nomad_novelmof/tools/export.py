@@ -0,0 +1,278 @@
+'''
+Streaming columnar export of MOFArchive entries to Parquet or Arrow files.
+
+Entries are read either from local `*.archive.json` files or from the NOMAD API,
+where only the quantities of the record columns are requested instead of whole
+archives with their CIF data. The nested sections are flattened into the typed
+columns of `fields.COLUMNS` and written in row groups of bounded size, so
+memory stays flat independent of the number of entries. File exports are split
+across worker processes, each writing its own part file.
+
+The repetitive string columns of `vocabulary.INTERNED_COLUMNS` are written as
+dictionary columns whose indices are the codes of shared per-column
+vocabularies. The vocabularies are saved as `vocabularies.json` in the output
+directory and can be seeded with `--vocabularies`, e.g. with the
+`<bulk file>.vocabularies.json` of bulk ingestion, so codes stay stable across
+exports. Terms first seen by different workers get their codes when the
+vocabularies of the workers are merged; the dictionary stored in each part file
+is always the authoritative one for that file.
+
+Requires `pyarrow` (`pip install 'nomad-novelMOF[tools]'`).
+
+Usage:
+
+    python -m nomad_novelmof.tools.export OUTPUT_DIR --files ARCHIVE_DIR --workers 4
+    python -m nomad_novelmof.tools.export OUTPUT_DIR --url https://nomad-lab.eu/prod/v1/api/v1
+    python -m nomad_novelmof.tools.export OUTPUT_DIR --files ARCHIVE_DIR --vocabularies VOCABULARIES_JSON
+'''
+
+import argparse
+import json
+import os
+from collections.abc import Iterable, Iterator
+from multiprocessing import Pool
+
+from nomad_novelmof.tools.records import (
+    COLUMNS,
+    iter_archives,
+    iter_batches,
+    required_spec,
+    to_record,
+)
+from nomad_novelmof.vocabulary import INTERNED_COLUMNS, Vocabularies, Vocabulary
+
+MOF_ARCHIVE = 'nomad_novelmof.schema_packages.novelmof_mofarch.MOFArchive'
+ROW_GROUP_SIZE = 50_000
+VOCABULARIES_FILE = 'vocabularies.json'
+
+
+def arrow_schema():
+    import pyarrow as pa
+
+    types = {
+        'string': pa.string(),
+        'float': pa.float64(),
+        'int': pa.int64(),
+        'bool': pa.bool_(),
+        'list': pa.list_(pa.string()),
+    }
+    interned_types = {
+        'string': pa.dictionary(pa.int32(), pa.string()),
+        'list': pa.list_(pa.dictionary(pa.int32(), pa.string())),
+    }
+    return pa.schema(
+        [
+            (column, (interned_types if column in INTERNED_COLUMNS else types)[kind])
+            for column, (_, kind) in COLUMNS.items()
+        ]
+    )
+
+
+def interned_array(values: list, vocabulary: Vocabulary, is_list: bool = False):
+    '''
+    The values of an interned column as an Arrow dictionary array with the codes
+    of `vocabulary` as indices, or as a list array of them.
+    '''
+    import pyarrow as pa
+
+    if is_list:
+        offsets, terms = [0], []
+        for value in values:
+            terms.extend(value or [])
+            offsets.append(len(terms))
+        return pa.ListArray.from_arrays(
+            pa.array(offsets, pa.int32()),
+            interned_array(terms, vocabulary),
+            mask=pa.array([value is None for value in values]),
+        )
+    codes = [None if value is None else vocabulary.encode(value) for value in values]
+    return pa.DictionaryArray.from_arrays(
+        pa.array(codes, pa.int32()), pa.array(vocabulary.terms, pa.string())
+    )
+
+
+def iter_file_records(paths: Iterable[str]) -> Iterator[dict]:
+    for path, data in iter_archives(paths):
+        if data.get('m_def', MOF_ARCHIVE) != MOF_ARCHIVE:
+            continue
+        yield to_record(data, entry_id=os.path.basename(path))
+
+
+def iter_api_records(
+    url: str, query: dict | None = None, token: str | None = None, page_size: int = 1000
+) -> Iterator[dict]:
+    '''
+    Streams the records of all MOFArchive entries matching `query` from the
+    archive query endpoint of a NOMAD API, e.g. `https://nomad-lab.eu/prod/v1/api/v1`.
+    '''
+    import requests
+
+    headers = {'Authorization': f'Bearer {token}'} if token else {}
+    body = {
+        'owner': 'visible',
+        'query': {
+            **(query or {}),
+            'section_defs.definition_qualified_name': MOF_ARCHIVE,
+        },
+        'pagination': {'page_size': page_size},
+        'required': required_spec(),
+    }
+    while True:
+        response = requests.post(
+            f'{url}/entries/archive/query', json=body, headers=headers, timeout=300
+        )
+        response.raise_for_status()
+        result = response.json()
+        for entry in result['data']:
+            archive = entry.get('archive', {})
+            yield to_record(archive.get('data', {}), entry_id=entry.get('entry_id'))
+        page_after_value = result['pagination'].get('next_page_after_value')
+        if not page_after_value or not result['data']:
+            break
+        body['pagination']['page_after_value'] = page_after_value
+
+
+def write_records(
+    records: Iterable[dict],
+    path: str,
+    file_format: str = 'parquet',
+    row_group_size: int = ROW_GROUP_SIZE,
+    vocabularies: Vocabularies | None = None,
+) -> int:
+    '''
+    Writes the records into one Parquet or Arrow IPC file, one row group per
+    `row_group_size` records. The interned columns are encoded with, and extend,
+    `vocabularies`. Returns the number of written records.
+    '''
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if vocabularies is None:
+        vocabularies = Vocabularies()
+    schema = arrow_schema()
+    if file_format == 'parquet':
+        writer = pq.ParquetWriter(path, schema, compression='zstd')
+    else:
+        # the dictionaries only grow, so later batches are written as deltas
+        writer = pa.ipc.new_file(
+            path, schema, options=pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+        )
+    count = 0
+    with writer:
+        for batch in iter_batches(records, row_group_size):
+            arrays = []
+            for column, (_, kind) in COLUMNS.items():
+                values = [record.get(column) for record in batch]
+                if column in INTERNED_COLUMNS:
+                    arrays.append(
+                        interned_array(values, vocabularies[column], kind == 'list')
+                    )
+                else:
+                    arrays.append(pa.array(values, schema.field(column).type))
+            table = pa.Table.from_arrays(arrays, schema=schema)
+            if file_format == 'parquet':
+                writer.write_table(table, row_group_size=row_group_size)
+            else:
+                writer.write_table(table, max_chunksize=row_group_size)
+            count += len(batch)
+    return count
+
+
+def _export_part(args) -> tuple[int, dict[str, list[str]]]:
+    paths, path, file_format, row_group_size, terms = args
+    vocabularies = Vocabularies(terms)
+    count = write_records(
+        iter_file_records(paths), path, file_format, row_group_size, vocabularies
+    )
+    return count, vocabularies.to_dict()
+
+
+def export_files(
+    paths: list[str],
+    output_dir: str,
+    file_format: str = 'parquet',
+    workers: int = 1,
+    row_group_size: int = ROW_GROUP_SIZE,
+    vocabularies: Vocabularies | None = None,
+) -> int:
+    '''
+    Exports the archive files into `workers` part files in `output_dir`, each
+    written by its own process, and extends `vocabularies` with the terms of
+    all parts. Returns the number of exported records.
+    '''
+    if vocabularies is None:
+        vocabularies = Vocabularies()
+    os.makedirs(output_dir, exist_ok=True)
+    workers = max(1, min(workers, len(paths)))
+    parts = [
+        (
+            paths[index::workers],
+            os.path.join(output_dir, f'part-{index:05d}.{file_format}'),
+            file_format,
+            row_group_size,
+            vocabularies.to_dict(),
+        )
+        for index in range(workers)
+    ]
+    if workers == 1:
+        results = list(map(_export_part, parts))
+    else:
+        with Pool(workers) as pool:
+            results = pool.map(_export_part, parts)
+    for _, terms in results:
+        for column, vocabulary in vocabularies.items():
+            for term in terms[column]:
+                vocabulary.encode(term)
+    return sum(count for count, _ in results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('output_dir')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--files', help='Directory with *.archive.json files.')
+    source.add_argument('--url', help='Base URL of a NOMAD API.')
+    parser.add_argument('--query', default='{}', help='Search query as JSON.')
+    parser.add_argument('--token', default=None)
+    parser.add_argument('--format', choices=['parquet', 'arrow'], default='parquet')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--row-group-size', type=int, default=ROW_GROUP_SIZE)
+    parser.add_argument(
+        '--vocabularies', default=None, help='Vocabularies JSON to seed the codes with.'
+    )
+    args = parser.parse_args()
+
+    vocabularies = (
+        Vocabularies.load(args.vocabularies) if args.vocabularies else Vocabularies()
+    )
+
+    if args.files:
+        paths = sorted(
+            os.path.join(args.files, name)
+            for name in os.listdir(args.files)
+            if name.endswith('.archive.json')
+        )
+        count = export_files(
+            paths,
+            args.output_dir,
+            args.format,
+            args.workers,
+            args.row_group_size,
+            vocabularies,
+        )
+    else:
+        os.makedirs(args.output_dir, exist_ok=True)
+        records = iter_api_records(args.url, json.loads(args.query), args.token)
+        count = write_records(
+            records,
+            os.path.join(args.output_dir, f'part-00000.{args.format}'),
+            args.format,
+            args.row_group_size,
+            vocabularies,
+        )
+    vocabularies.save(os.path.join(args.output_dir, VOCABULARIES_FILE))
+    print(f'Exported {count} entries to {args.output_dir}.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,233 @@
+'''
+Import time budget of the plugin's entry points.
+
+NOMAD loads every plugin entry point in every API, worker and CLI process, so
+expensive imports at module level slow down all of them, also when no MOFArchive
+is ever processed. Each entry point is loaded in a fresh interpreter with
+`python -X importtime` and the time attributed to the plugin is the cumulative
+import time of its outermost `nomad_novelmof` modules: their own code plus all
+dependencies that they import first. Modules that NOMAD imports anyway are not
+counted. The check fails if an entry point exceeds its budget, and lists the
+dependencies that contribute most, so a new module level import of e.g. `matid`
+or `nomad.normalizing` shows up immediately. The plugin is compiled to bytecode
+first, as it is when installed, so compiling its sources is not measured.
+
+Most of the remaining time of the parser, schema and normalizer entry points is
+the construction of the metainfo sections of `novelmof_mofarch`, which NOMAD
+needs anyway; the analyses, tables and statistics are imported on first use.
+`tests/tools/test_import_budget.py` checks with the test suite that no entry
+point imports `matid`, `nomad.normalizing`, `scipy` or `pyarrow`, and runs the
+check of the budgets if `MOFARCH_IMPORT_BUDGET` is set.
+
+Usage:
+
+    python -m nomad_novelmof.tools.import_budget
+    python -m nomad_novelmof.tools.import_budget --repeat 5 --scale 1.5
+'''
+
+import argparse
+import compileall
+import importlib.util
+import os
+import subprocess
+import sys
+
+PLUGIN = 'nomad_novelmof'
+# what every NOMAD process imports anyway: before it loads plugins, and h5py with
+# the HDF5 references, which the ELN base sections import right after the schema
+# packages are loaded
+PREAMBLE = (
+    'import nomad.config.models.plugins, nomad.datamodel, nomad.parsing.parser\n'
+    'import nomad.datamodel.hdf5\n'
+)
+
+# code that loads an entry point the way NOMAD does
+ENTRY_POINTS = {
+    'parsers:mofarch_json_parser': (
+        'from nomad_novelmof.parsers import mofarch_json_parser as entry_point\n'
+        'entry_point.load()'
+    ),
+    'parsers:mofarch_descriptor_parser': (
+        'from nomad_novelmof.parsers import mofarch_descriptor_parser as entry_point\n'
+        'entry_point.load()'
+    ),
+    'parsers:mofarch_statistics_parser': (
+        'from nomad_novelmof.parsers import mofarch_statistics_parser as entry_point\n'
+        'entry_point.load()'
+    ),
+    'schema_packages:novel_mof_schema': (
+        'from nomad_novelmof.schema_packages import novel_mof_schema as entry_point\n'
+        'entry_point.load()'
+    ),
+    'normalizers:normalizer_entry_point': (
+        'import nomad.normalizing\n'
+        'from nomad_novelmof.normalizers import normalizer_entry_point as entry_point\n'
+        'entry_point.load()'
+    ),
+    'apps:novel_mof_app_entry_point': (
+        'from nomad_novelmof.apps import novel_mof_app_entry_point'
+    ),
+    'apps:mof_statistics_app_entry_point': (
+        'from nomad_novelmof.apps import mof_statistics_app_entry_point'
+    ),
+    # loading it writes the example upload, only the import is measured
+    'example_uploads:example_upload_entry_point': (
+        'from nomad_novelmof.example_uploads import example_upload_entry_point'
+    ),
+}
+
+# milliseconds, with headroom for loaded machines over the measured times of 65 to
+# 80 ms for the entry points that load the schema and 3 ms for the apps and the
+# statistics parser
+BUDGETS = {
+    'parsers:mofarch_json_parser': 150,
+    'parsers:mofarch_descriptor_parser': 150,
+    'parsers:mofarch_statistics_parser': 10,
+    'schema_packages:novel_mof_schema': 150,
+    'normalizers:normalizer_entry_point': 150,
+    'apps:novel_mof_app_entry_point': 10,
+    'apps:mof_statistics_app_entry_point': 10,
+    'example_uploads:example_upload_entry_point': 10,
+}
+
+
+def parse_importtime(output: str) -> list[tuple[int, str, float, float]]:
+    '''
+    The `(depth, module, self_ms, cumulative_ms)` of every import reported by
+    `-X importtime`, in the order of the report, i.e. children before parents.
+    '''
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:') :].split('|')
+        depth = (len(name) - len(name.lstrip(' '))) // 2
+        imports.append(
+            (depth, name.strip(), int(self_us) / 1e3, int(cumulative_us) / 1e3)
+        )
+    return imports
+
+
+def plugin_imports(
+    imports: list[tuple[int, str, float, float]],
+) -> tuple[float, list[tuple[str, float]]]:
+    '''
+    The total import time in ms of the outermost plugin modules, and the
+    cumulative times of the external modules that they import.
+    '''
+    total = 0.0
+    dependencies = []
+    # walk parents before children, keeping the module of every open level
+    stack: list[str] = []
+    for depth, name, _, cumulative in reversed(imports):
+        del stack[depth:]
+        in_plugin = any(module.startswith(PLUGIN) for module in stack)
+        if name.startswith(PLUGIN) and not in_plugin:
+            total += cumulative
+        elif in_plugin and not name.startswith(PLUGIN) and stack[-1].startswith(PLUGIN):
+            dependencies.append((name, cumulative))
+        stack.append(name)
+    return total, sorted(dependencies, key=lambda item: -item[1])
+
+
+def imported_by_plugin(imports: list[tuple[int, str, float, float]]) -> list[str]:
+    '''
+    All external modules that are imported, directly or not, while a plugin
+    module is imported.
+    '''
+    modules = []
+    stack: list[str] = []
+    for depth, name, _, _ in reversed(imports):
+        del stack[depth:]
+        in_plugin = any(module.startswith(PLUGIN) for module in stack)
+        if in_plugin and not name.startswith(PLUGIN):
+            modules.append(name)
+        stack.append(name)
+    return modules
+
+
+def compile_plugin() -> None:
+    '''
+    Writes the bytecode of all plugin modules, if the installation allows it.
+    '''
+    spec = importlib.util.find_spec(PLUGIN)
+    for directory in spec.submodule_search_locations or []:
+        compileall.compile_dir(directory, quiet=2)
+
+
+def importtime(code: str) -> list[tuple[int, str, float, float]]:
+    '''
+    The imports of `code`, run after the preamble in a fresh interpreter.
+    '''
+    env = {
+        name: value
+        for name, value in os.environ.items()
+        if name != 'PYTHONDONTWRITEBYTECODE'
+    }
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PREAMBLE + code],
+        capture_output=True,
+        text=True,
+        check=False,
+        env=env,
+    )
+    if result.returncode:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return parse_importtime(result.stderr)
+
+
+def measure(code: str) -> tuple[float, list[tuple[str, float]]]:
+    return plugin_imports(importtime(code))
+
+
+def check(
+    repeat: int = 3, scale: float = 1.0
+) -> dict[str, tuple[float, float, list[tuple[str, float]]]]:
+    '''
+    The best of `repeat` import times, the budget and the largest dependencies
+    of every entry point.
+    '''
+    compile_plugin()
+    results = {}
+    for name, code in ENTRY_POINTS.items():
+        best, dependencies = min(
+            (measure(code) for _ in range(repeat)), key=lambda item: item[0]
+        )
+        results[name] = (best, BUDGETS[name] * scale, dependencies)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument(
+        '--scale',
+        type=float,
+        default=1.0,
+        help='Factor applied to all budgets, e.g. for slower machines.',
+    )
+    parser.add_argument(
+        '--top', type=int, default=5, help='Dependencies to list per entry point.'
+    )
+    args = parser.parse_args()
+
+    failed = []
+    print(f'{"entry point":<40}{"ms":>10}{"budget":>10}')
+    for name, (milliseconds, budget, dependencies) in check(
+        args.repeat, args.scale
+    ).items():
+        over = milliseconds > budget
+        print(
+            f'{name:<40}{milliseconds:>10.1f}{budget:>10.0f}{"  OVER" if over else ""}'
+        )
+        if over:
+            failed.append(name)
+            for dependency, cumulative in dependencies[: args.top]:
+                print(f'    {dependency:<36}{cumulative:>10.1f}')
+    if failed:
+        print(f'Import time budget exceeded by {", ".join(failed)}.')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
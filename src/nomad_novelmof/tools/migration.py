@@ -0,0 +1,280 @@
+'''
+Bulk migration between the flat `NovelMOF` schema (`novelmof_ref_01`) and the
+nested `MOFArchive` schema (`novelmof_mofarch`).
+
+Archives are read as a stream of `*.archive.json` files and converted in batches:
+every field of a batch is gathered into one numpy column and converted with a
+single vectorized operation (splitting `metal_types`, casting `year`, ...), instead
+of converting field by field for every entry.
+
+With `--to upgrade`, existing `MOFArchive` archives are re-typed to the current
+schema, e.g. `reference_data.year` stored as a string before it became an int.
+Values serialized with their unit, `{"m": ..., "u": ...}`, keep their unit.
+
+Integer fields only accept integral numbers: a value like `2.7` is rejected and
+counted, like any other value that cannot be converted. All top-level keys of an
+archive other than `data` are kept. Archives of another `m_def` are skipped,
+counted and logged.
+
+Usage:
+
+    python -m nomad_novelmof.tools.migration SOURCE_DIR TARGET_DIR --to mofarchive
+'''
+
+import argparse
+import json
+import logging
+import os
+from collections.abc import Iterable
+from typing import NamedTuple
+
+import numpy as np
+
+from nomad_novelmof.tools.records import (
+    PORES,
+    TOPOLOGY,
+    get_path,
+    iter_batches,
+    set_path,
+)
+
+logger = logging.getLogger(__name__)
+
+NOVEL_MOF = 'nomad_novelmof.schema_packages.novelmof_ref_01.NovelMOF'
+MOF_ARCHIVE = 'nomad_novelmof.schema_packages.novelmof_mofarch.MOFArchive'
+
+# flat NovelMOF quantity -> (nested MOFArchive path, kind)
+FIELD_MAP = {
+    'name': ('common_name', 'str'),
+    'mofid_v2': ('identifier', 'str'),
+    'pld': (f'{PORES}.PLD_angstrom', 'float'),
+    'asa': (f'{PORES}.ASA_m2_cm3', 'float'),
+    'nasa': (f'{PORES}.NASA_m2_cm3', 'float'),
+    'pv': (f'{PORES}.PV_cm3_g', 'float'),
+    'structure_dimension': (f'{TOPOLOGY}.structure_dimension', 'int'),
+    'topology_single_nodes': (f'{TOPOLOGY}.topology_single_nodes', 'str'),
+    'topology_all_nodes': (f'{TOPOLOGY}.topology_all_nodes', 'str'),
+    'catenation': (f'{TOPOLOGY}.catenation', 'int'),
+    'dimension_by_topology': (f'{TOPOLOGY}.dimension_by_topo', 'int'),
+    'hall_symbol': (f'{TOPOLOGY}.hall', 'str'),
+    'number_spacegroup': (f'{TOPOLOGY}.number_spacegroup', 'int'),
+    'metal_types': ('compositional_information.metal_types', 'list'),
+    'doi': ('reference_data.doi', 'str'),
+    'year': ('reference_data.year', 'int'),
+    'publication': ('reference_data.publication', 'str'),
+    'unmodified': ('structural_data.unmodified', 'bool'),
+    'thermal_stability': (
+        'calculation_properties.stability.thermal_stability_celsius',
+        'float',
+    ),
+}
+
+
+def as_float(values: np.ndarray) -> np.ndarray:
+    '''
+    Casts a column to float in one pass. Only if that fails, e.g. because of a
+    malformed string, values are cast one by one and unconvertible ones become nan.
+    '''
+    try:
+        return values.astype(float)
+    except (TypeError, ValueError):
+        converted = np.full(len(values), np.nan)
+        for index, value in enumerate(values):
+            try:
+                converted[index] = float(value)
+            except (TypeError, ValueError):
+                pass
+        return converted
+
+
+class MigrationResult(NamedTuple):
+    migrated: int
+    skipped: int
+    rejected: int
+
+
+def magnitude(value):
+    '''
+    The number of a value that may be serialized with its unit.
+    '''
+    if isinstance(value, dict):
+        return value.get('m', value.get('magnitude'))
+    return value
+
+
+def convert_column(values: list, kind: str, to_nested: bool) -> tuple[list, int]:
+    '''
+    Converts one field of a whole batch with vectorized numpy operations.
+    Missing values stay `None`. Returns the converted values and the number of
+    present values that could not be converted and became `None`.
+    '''
+    # filled element-wise, so lists of equal length do not become a 2d array
+    column = np.empty(len(values), dtype=object)
+    column[:] = values
+    present = np.array([value is not None for value in values], dtype=bool)
+    result = np.full(len(values), None, dtype=object)
+    if not present.any():
+        return result.tolist(), 0
+    present_values = column[present]
+    rejected = 0
+
+    if kind in ('float', 'int'):
+        converted = as_float(present_values)
+        valid = np.isfinite(converted)
+        if kind == 'int':
+            valid &= converted == np.round(converted)
+            result[np.flatnonzero(present)[valid]] = converted[valid].astype(np.int64)
+        else:
+            result[np.flatnonzero(present)[valid]] = converted[valid]
+        rejected = int(np.count_nonzero(~valid))
+    elif kind == 'list':
+        if to_nested:
+            stripped = np.char.replace(present_values.astype(str), ' and ', ',')
+            split = np.char.split(np.char.replace(stripped, ' ', ''), ',')
+            for index, items in zip(np.flatnonzero(present), split):
+                result[index] = [item for item in items if item]
+        else:
+            result[present] = [
+                ','.join(items) if isinstance(items, list) else str(items)
+                for items in present_values
+            ]
+    elif kind == 'bool':
+        strings = np.char.lower(np.char.strip(present_values.astype(str)))
+        result[present] = np.isin(strings, ('true', '1', 'yes'))
+    else:
+        result[present] = present_values.astype(str)
+
+    return [
+        value.item() if isinstance(value, np.generic) else value for value in result
+    ], rejected
+
+
+def migrate_batch(batch: list[dict], to_nested: bool) -> tuple[list[dict], int]:
+    '''
+    Converts a batch of `data` dicts from one schema into the other. Returns the
+    converted dicts and the number of rejected values.
+    '''
+    migrated = [
+        {'m_def': MOF_ARCHIVE if to_nested else NOVEL_MOF} for _ in batch
+    ]
+    rejected = 0
+    for flat_name, (nested_path, kind) in FIELD_MAP.items():
+        if to_nested:
+            values = [magnitude(data.get(flat_name)) for data in batch]
+        else:
+            values = [magnitude(get_path(data, nested_path)) for data in batch]
+        converted, n_rejected = convert_column(values, kind, to_nested)
+        rejected += n_rejected
+        for target, value in zip(migrated, converted):
+            if value is None:
+                continue
+            if to_nested:
+                set_path(target, nested_path, value)
+            else:
+                target[flat_name] = value
+    return migrated, rejected
+
+
+def upgrade_batch(batch: list[dict]) -> tuple[list[dict], int]:
+    '''
+    Re-types the numeric quantities of a batch of `MOFArchive` data dicts in place.
+    Values that cannot be converted are removed, as the schema would reject them.
+    Returns the batch and the number of removed values.
+    '''
+    rejected = 0
+    for nested_path, kind in FIELD_MAP.values():
+        if kind not in ('int', 'float'):
+            continue
+        serialized = [get_path(data, nested_path) for data in batch]
+        values = [magnitude(value) for value in serialized]
+        converted, n_rejected = convert_column(values, kind, True)
+        rejected += n_rejected
+        for data, old, value, new in zip(batch, serialized, values, converted):
+            if value is None or (value == new and type(value) is type(new)):
+                continue
+            if new is None:
+                *sections, name = nested_path.split('.')
+                get_path(data, '.'.join(sections)).pop(name)
+            elif isinstance(old, dict):
+                old['m' if 'm' in old else 'magnitude'] = new
+            else:
+                set_path(data, nested_path, new)
+    return batch, rejected
+
+
+def migrate(
+    source_paths: Iterable[str],
+    target_dir: str,
+    to: str = 'mofarchive',
+    batch_size: int = 1000,
+) -> MigrationResult:
+    '''
+    Migrates the given archive files into `target_dir`, keeping their file names
+    and all top-level keys other than `data`. `to` is one of 'mofarchive',
+    'novelmof' or 'upgrade'. Returns the number of migrated and skipped archives
+    and of rejected values.
+    '''
+    source_m_def = NOVEL_MOF if to == 'mofarchive' else MOF_ARCHIVE
+    os.makedirs(target_dir, exist_ok=True)
+    migrated_count = skipped = rejected = 0
+    for batch in iter_batches(iter_archive_files(source_paths), batch_size):
+        selected = []
+        for path, archive in batch:
+            data = archive.get('data', archive)
+            m_def = data.get('m_def', source_m_def)
+            if m_def == source_m_def:
+                selected.append((path, archive))
+            else:
+                skipped += 1
+                logger.warning('Skipped %s with m_def %s.', path, m_def)
+        batch_data = [archive.get('data', archive) for _, archive in selected]
+        if to == 'upgrade':
+            migrated, n_rejected = upgrade_batch(batch_data)
+        else:
+            migrated, n_rejected = migrate_batch(
+                batch_data, to_nested=to == 'mofarchive'
+            )
+        rejected += n_rejected
+        for (path, archive), data in zip(selected, migrated):
+            output = {**archive, 'data': data} if 'data' in archive else {'data': data}
+            with open(os.path.join(target_dir, os.path.basename(path)), 'w') as f:
+                json.dump(output, f)
+        migrated_count += len(migrated)
+    return MigrationResult(migrated_count, skipped, rejected)
+
+
+def iter_archive_files(paths: Iterable[str]):
+    '''
+    Yields `(path, archive)` for every archive file.
+    '''
+    for path in paths:
+        with open(path) as f:
+            yield path, json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('source_dir')
+    parser.add_argument('target_dir')
+    parser.add_argument(
+        '--to', choices=['mofarchive', 'novelmof', 'upgrade'], default='mofarchive'
+    )
+    parser.add_argument('--batch-size', type=int, default=1000)
+    args = parser.parse_args()
+
+    source_paths = sorted(
+        os.path.join(args.source_dir, name)
+        for name in os.listdir(args.source_dir)
+        if name.endswith('.archive.json')
+    )
+    logging.basicConfig(format='%(levelname)s: %(message)s')
+    result = migrate(source_paths, args.target_dir, args.to, args.batch_size)
+    print(
+        f'Migrated {result.migrated} archives to {args.target_dir}, skipped '
+        f'{result.skipped} archives of another schema and rejected '
+        f'{result.rejected} values that could not be converted.'
+    )
+
+
+if __name__ == '__main__':
+    main()
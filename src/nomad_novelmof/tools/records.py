@@ -0,0 +1,76 @@
+'''
+Flat, typed records of MOFArchive data shared by the offline tools.
+
+A record is a dict from column name to a plain python value. The columns are the
+scalar descriptors of `MOFArchive` that are useful outside of NOMAD; free text
+like the CIF data is not part of a record.
+'''
+
+import json
+from collections.abc import Iterable, Iterator
+from itertools import islice
+
+from nomad_novelmof.fields import COLUMNS, PORES, STRUCTURAL, TOPOLOGY  # noqa: F401
+
+
+def get_path(data: dict, path: str):
+    for key in path.split('.'):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def set_path(data: dict, path: str, value) -> None:
+    *sections, name = path.split('.')
+    for key in sections:
+        data = data.setdefault(key, {})
+    data[name] = value
+
+
+def required_spec() -> dict:
+    '''
+    The NOMAD API `required` specification that only loads the quantities of the
+    record columns from an archive.
+    '''
+    required: dict = {}
+    for path, _ in COLUMNS.values():
+        if path:
+            set_path(required, f'data.{path}', '*')
+    return {**required, 'metadata': {'entry_id': '*'}}
+
+
+def to_record(data: dict, entry_id: str | None = None) -> dict:
+    '''
+    Flattens the `data` section of a MOFArchive archive dict into a record.
+    '''
+    record = {'entry_id': entry_id}
+    for column, (path, kind) in COLUMNS.items():
+        if path is None:
+            continue
+        value = get_path(data, path)
+        if value is not None:
+            if kind == 'list' and not isinstance(value, list):
+                value = [value]
+            elif kind == 'float' and isinstance(value, dict):
+                # quantities with units may be serialized with their unit
+                value = value.get('m', value.get('magnitude'))
+        record[column] = value
+    return record
+
+
+def iter_archives(paths: Iterable[str]) -> Iterator[tuple[str, dict]]:
+    '''
+    Yields `(path, data)` for every archive file, where `data` is the `data`
+    section of an `*.archive.json` file or the whole file if it has none.
+    '''
+    for path in paths:
+        with open(path) as f:
+            archive = json.load(f)
+        yield path, archive.get('data', archive)
+
+
+def iter_batches(iterable: Iterable, batch_size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
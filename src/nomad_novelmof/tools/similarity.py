@@ -0,0 +1,277 @@
+'''
+Nearest-neighbour search for "MOFs like this one" over pore and topology
+descriptors.
+
+Every record is mapped to a short descriptor vector: PLD, ASA, NASA and PV on a
+log scale, structure dimension, catenation, the crystal system of the space group
+and the metal set, summarised as number of metals and mean period and group. The
+vectors are standardised with the median and interquartile range of the indexed
+records, missing values are set to the median, and indexed in a KD-tree.
+
+Added entries go into a small buffer with its own tree, removed and replaced
+entries are masked out, and the main tree is only rebuilt once the buffer and the
+removed entries exceed a fraction of it. The index is saved
+with its tree, so loading it does not rebuild anything. Index files are pickles,
+only load your own.
+
+Usage:
+
+    python -m nomad_novelmof.tools.similarity build INDEX EXPORT.parquet [...]
+    python -m nomad_novelmof.tools.similarity query INDEX ENTRY_ID [...] -k 10
+'''
+
+import argparse
+import pickle
+from collections.abc import Iterable
+
+import numpy as np
+from ase.data import atomic_numbers
+from scipy.spatial import cKDTree
+
+FEATURES = [
+    'PLD_angstrom',
+    'ASA_m2_cm3',
+    'NASA_m2_cm3',
+    'PV_cm3_g',
+    'structure_dimension',
+    'catenation',
+    'crystal_system',
+    'n_metals',
+    'metal_period',
+    'metal_group',
+]
+# highest space group number of triclinic, monoclinic, ..., cubic
+CRYSTAL_SYSTEM_BOUNDS = np.array([2, 15, 74, 142, 167, 194, 230])
+PERIOD_BOUNDS = np.array([2, 10, 18, 36, 54, 86, 118])
+REBUILD_FRACTION = 0.1
+
+
+def period_and_group(symbol: str) -> tuple[int, int] | None:
+    '''
+    Period and IUPAC group of an element, with lanthanides and actinides in
+    group 3.
+    '''
+    z = atomic_numbers.get(symbol)
+    if z is None:
+        return None
+    period = int(np.searchsorted(PERIOD_BOUNDS, z)) + 1
+    position = z - (PERIOD_BOUNDS[period - 2] if period > 1 else 0)
+    if period == 1:
+        group = 1 if z == 1 else 18
+    elif period <= 3:
+        group = position if position <= 2 else position + 10
+    elif period <= 5:
+        group = position
+    else:
+        group = position if position <= 2 else max(3, position - 14)
+    return period, int(group)
+
+
+def descriptor_vectors(records: list[dict]) -> np.ndarray:
+    '''
+    The raw descriptor vectors of `tools.records` records, one row per record in
+    the order of `FEATURES`, with nan for missing values.
+    '''
+    vectors = np.full((len(records), len(FEATURES)), np.nan)
+    for column, name in enumerate(FEATURES[:6]):
+        vectors[:, column] = [
+            np.nan if record.get(name) is None else record[name] for record in records
+        ]
+    vectors[:, :4] = np.log1p(np.clip(vectors[:, :4], 0, None))
+    spacegroups = np.array(
+        [record.get('number_spacegroup') or np.nan for record in records], dtype=float
+    )
+    valid = (spacegroups >= 1) & (spacegroups <= 230)
+    vectors[valid, 6] = np.searchsorted(CRYSTAL_SYSTEM_BOUNDS, spacegroups[valid])
+    for row, record in enumerate(records):
+        metals = [period_and_group(metal) for metal in record.get('metal_types') or []]
+        metals = [metal for metal in metals if metal is not None]
+        if metals:
+            vectors[row, 7] = len(metals)
+            vectors[row, 8:10] = np.mean(metals, axis=0)
+    return vectors
+
+
+class SimilarityIndex:
+    '''
+    KD-tree over standardised descriptor vectors with an incrementally
+    maintained buffer of added entries.
+    '''
+
+    def __init__(self, ids: list[str], vectors: np.ndarray):
+        self.center = np.zeros(len(FEATURES))
+        self.scale = np.ones(len(FEATURES))
+        for column, values in enumerate(np.asarray(vectors, dtype=float).T):
+            values = values[np.isfinite(values)]
+            if len(values):
+                lower, self.center[column], upper = np.percentile(values, [25, 50, 75])
+                if upper > lower:
+                    self.scale[column] = upper - lower
+        self._build(np.asarray(ids, dtype=object), self._standardise(vectors))
+
+    def _standardise(self, vectors: np.ndarray) -> np.ndarray:
+        vectors = (np.asarray(vectors, dtype=float) - self.center) / self.scale
+        return np.nan_to_num(vectors, nan=0.0, posinf=0.0, neginf=0.0)
+
+    def _build(self, ids: np.ndarray, points: np.ndarray) -> None:
+        self.tree_ids = ids
+        self.tree = cKDTree(points, balanced_tree=False)
+        self.alive = np.ones(len(ids), dtype=bool)
+        self.buffer_ids = np.empty(0, dtype=object)
+        self.buffer = np.empty((0, len(FEATURES)))
+        self.buffer_tree = None
+        self.rows = {entry_id: row for row, entry_id in enumerate(ids.tolist())}
+
+    def __len__(self) -> int:
+        return int(self.alive.sum()) + len(self.buffer_ids)
+
+    @classmethod
+    def from_records(cls, records: list[dict]) -> 'SimilarityIndex':
+        return cls([record['entry_id'] for record in records], descriptor_vectors(records))
+
+    def add(self, ids: list[str], vectors: np.ndarray) -> None:
+        '''
+        Adds or replaces entries with raw descriptor vectors.
+        '''
+        self.remove(ids)
+        self.buffer_ids = np.concatenate([self.buffer_ids, np.asarray(ids, dtype=object)])
+        self.buffer = np.vstack([self.buffer, self._standardise(vectors)])
+        self.buffer_tree = None
+        self._maybe_rebuild()
+
+    def add_records(self, records: list[dict]) -> None:
+        self.add([record['entry_id'] for record in records], descriptor_vectors(records))
+
+    def remove(self, ids: Iterable[str]) -> None:
+        ids = set(ids)
+        for entry_id in ids:
+            row = self.rows.pop(entry_id, None)
+            if row is not None:
+                self.alive[row] = False
+        if len(self.buffer_ids):
+            keep = ~np.isin(self.buffer_ids, list(ids))
+            if not keep.all():
+                self.buffer_ids, self.buffer = self.buffer_ids[keep], self.buffer[keep]
+                self.buffer_tree = None
+        self._maybe_rebuild()
+
+    def _maybe_rebuild(self) -> None:
+        stale = len(self.buffer_ids) + np.count_nonzero(~self.alive)
+        if stale > REBUILD_FRACTION * max(len(self.tree_ids), 1):
+            self.rebuild()
+
+    def rebuild(self) -> None:
+        self._build(
+            np.concatenate([self.tree_ids[self.alive], self.buffer_ids]),
+            np.vstack([self.tree.data[self.alive], self.buffer]),
+        )
+
+    def query(
+        self, vectors: np.ndarray, k: int = 10, standardised: bool = False
+    ) -> tuple[np.ndarray, np.ndarray]:
+        '''
+        The `k` nearest entries for a batch of raw descriptor vectors. Returns the
+        distances and entry ids, both of shape `(n, k)`; rows with fewer than `k`
+        entries in the index are padded with inf and None.
+        '''
+        points = np.atleast_2d(vectors if standardised else self._standardise(vectors))
+        n_removed = len(self.tree_ids) - int(self.alive.sum())
+        k_tree = min(k + n_removed, len(self.tree_ids))
+        distances, rows = self.tree.query(points, k=max(k_tree, 1), workers=-1)
+        distances = distances.reshape(len(points), -1)
+        rows = rows.reshape(len(points), -1)
+        missing = rows >= len(self.tree_ids)
+        rows[missing] = 0
+        distances[missing | ~self.alive[rows]] = np.inf
+        ids = self.tree_ids[rows]
+        if len(self.buffer_ids):
+            if self.buffer_tree is None:
+                self.buffer_tree = cKDTree(self.buffer)
+            k_buffer = min(k, len(self.buffer_ids))
+            buffer_distances, buffer_rows = self.buffer_tree.query(
+                points, k=k_buffer, workers=-1
+            )
+            distances = np.hstack([distances, buffer_distances.reshape(len(points), -1)])
+            ids = np.hstack([ids, self.buffer_ids[buffer_rows.reshape(len(points), -1)]])
+        order = np.argsort(distances, axis=1, kind='stable')[:, :k]
+        distances = np.take_along_axis(distances, order, axis=1)
+        ids = np.take_along_axis(ids, order, axis=1)
+        if distances.shape[1] < k:
+            pad = k - distances.shape[1]
+            distances = np.pad(distances, ((0, 0), (0, pad)), constant_values=np.inf)
+            ids = np.pad(ids, ((0, 0), (0, pad)), constant_values=None)
+        ids[~np.isfinite(distances)] = None
+        return distances, ids
+
+    def vector_of(self, entry_id: str) -> np.ndarray | None:
+        row = self.rows.get(entry_id)
+        if row is not None:
+            return self.tree.data[row]
+        matches = np.flatnonzero(self.buffer_ids == entry_id)
+        return self.buffer[matches[-1]] if len(matches) else None
+
+    def similar(self, entry_ids: list[str], k: int = 10) -> dict[str, list[tuple]]:
+        '''
+        The `k` entries most similar to each of the given indexed entries, without
+        the entry itself, as `(entry_id, distance)` pairs.
+        '''
+        known = [entry_id for entry_id in entry_ids if self.vector_of(entry_id) is not None]
+        if not known:
+            return {}
+        points = np.array([self.vector_of(entry_id) for entry_id in known])
+        distances, ids = self.query(points, k + 1, standardised=True)
+        return {
+            entry_id: [
+                (other, float(distance))
+                for other, distance in zip(row_ids, row_distances)
+                if other is not None and other != entry_id
+            ][:k]
+            for entry_id, row_ids, row_distances in zip(known, ids, distances)
+        }
+
+    def save(self, path: str) -> None:
+        with open(path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: str) -> 'SimilarityIndex':
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help='Build or update an index.')
+    build.add_argument('index')
+    build.add_argument('files', nargs='+', help='Parquet files from tools.export.')
+    build.add_argument('--update', action='store_true', help='Add to an existing index.')
+    query = commands.add_parser('query', help='Find entries similar to given ones.')
+    query.add_argument('index')
+    query.add_argument('entry_ids', nargs='+')
+    query.add_argument('-k', type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        import pyarrow.parquet as pq
+
+        records = [
+            record for path in args.files for record in pq.read_table(path).to_pylist()
+        ]
+        if args.update:
+            index = SimilarityIndex.load(args.index)
+            index.add_records(records)
+        else:
+            index = SimilarityIndex.from_records(records)
+        index.save(args.index)
+        print(f'Indexed {len(index)} entries in {args.index}.')
+    else:
+        index = SimilarityIndex.load(args.index)
+        for entry_id, neighbours in index.similar(args.entry_ids, args.k).items():
+            print(entry_id)
+            for other, distance in neighbours:
+                print(f'    {other}  {distance:.3f}')
+
+
+if __name__ == '__main__':
+    main()
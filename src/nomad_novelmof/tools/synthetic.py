@@ -0,0 +1,259 @@
+'''
+Generator of realistic synthetic `.mofarch.json` records.
+
+The records follow the input format of `MOFArchJsParser` and reproduce what real
+deliveries look like: optional fields are missing, numbers arrive as strings,
+booleans as 'yes' or 'TRUE', metal types as 'Cu and Zn', and some records embed
+a P1 CIF block with anything from a few to a few thousand atoms. Categorical
+fields draw from small vocabularies, so a dataset has the same repetitiveness as
+a CoReMOF-derived delivery. Generation is deterministic for a given seed.
+
+Records are written either one per `*.mofarch.json` file or as bulk files, which
+hold a JSON list of records.
+
+Usage:
+
+    python -m nomad_novelmof.tools.synthetic OUTPUT_DIR -n 10000 --bulk-size 1000
+'''
+
+import argparse
+import json
+import math
+import os
+import random
+from collections.abc import Iterator
+
+METALS = ['Cu', 'Zn', 'Co', 'Zr', 'Fe', 'Mn', 'Ni', 'Cd', 'Mg', 'Al', 'Cr', 'Gd', 'Eu']
+LINKER_ELEMENTS = ['C', 'H', 'O', 'N']
+TOPOLOGIES = ['pcu', 'dia', 'sql', 'hcb', 'fcu', 'tbo', 'pts', 'bor', 'nbo', 'srs']
+HALL_SYMBOLS = [
+    '-P 1', 'P 2yb', '-P 2ybc', '-C 2yc', 'P 2ac 2ab', '-P 2ac 2n',
+    '-I 4ad', 'R 3 -2"', '-R 3', '-P 6c 2c', '-F 4 2 3', 'F 4d 2 3 -1d',
+]
+PUBLICATIONS = ['ACS', 'RSC', 'Wiley', 'Elsevier', 'Springer', 'Nature', 'Science']
+SYNTHESIS_METHODS = [
+    'solvothermal synthesis', 'hydrothermal synthesis', 'chemical synthesis',
+    'slow evaporation', 'diffusion', 'microwave synthesis',
+]
+STARTING_MATERIALS = [
+    'Cu(NO3)2·3H2O', 'Zn(NO3)2·6H2O', 'ZrCl4', 'CoCl2·6H2O', 'H2BDC', 'H3BTC',
+    'DMF', 'ethanol', 'water', 'methanol', 'bipyridine', 'imidazole',
+]
+TRANSCRIBERS = ['A. Chen', 'B. Schmidt', 'C. Rossi', 'D. Novak']
+
+
+def cif_block(rng: random.Random, name: str, metal: str, n_atoms: int) -> str:
+    '''
+    A P1 CIF block with random positions in a cubic cell of typical MOF density.
+    '''
+    a = (n_atoms * 12.0) ** (1 / 3)
+    lines = [
+        f'data_{name}',
+        f'_chemical_formula_sum \'{metal}1 C{max(n_atoms - 1, 0)}\'',
+        f'_cell_length_a {a:.4f}',
+        f'_cell_length_b {a:.4f}',
+        f'_cell_length_c {a:.4f}',
+        '_cell_angle_alpha 90.0',
+        '_cell_angle_beta 90.0',
+        '_cell_angle_gamma 90.0',
+        "_symmetry_space_group_name_H-M 'P 1'",
+        'loop_',
+        '_atom_site_label',
+        '_atom_site_type_symbol',
+        '_atom_site_fract_x',
+        '_atom_site_fract_y',
+        '_atom_site_fract_z',
+    ]
+    for index in range(n_atoms):
+        symbol = metal if index == 0 else rng.choice(LINKER_ELEMENTS)
+        lines.append(
+            f'{symbol}{index} {symbol} {rng.random():.5f} {rng.random():.5f} '
+            f'{rng.random():.5f}'
+        )
+    return '\n'.join(lines) + '\n'
+
+
+class RecordGenerator:
+    '''
+    Generates `.mofarch.json` records.
+
+    `sparsity` is the probability that an optional field is missing,
+    `wrong_types` the probability that a typed field has the wrong type, and
+    `cif_rate` the fraction of records with a CIF block of log-normally
+    distributed size between `min_atoms` and `max_atoms`.
+    '''
+
+    def __init__(
+        self,
+        seed: int = 0,
+        sparsity: float = 0.2,
+        wrong_types: float = 0.1,
+        cif_rate: float = 0.1,
+        min_atoms: int = 20,
+        max_atoms: int = 2000,
+    ):
+        self.rng = random.Random(seed)
+        self.sparsity = sparsity
+        self.wrong_types = wrong_types
+        self.cif_rate = cif_rate
+        self.min_atoms = min_atoms
+        self.max_atoms = max_atoms
+
+    def _present(self) -> bool:
+        return self.rng.random() >= self.sparsity
+
+    def _wrong(self) -> bool:
+        return self.rng.random() < self.wrong_types
+
+    def _float(self, value: float, digits: int = 3):
+        value = round(float(value), digits)
+        return str(value) if self._wrong() else value
+
+    def _int(self, value: int):
+        return f'{value}.0' if self._wrong() else value
+
+    def record(self, index: int) -> dict:
+        rng = self.rng
+        metals = rng.sample(METALS, rng.choice([1, 1, 1, 2, 2, 3]))
+        name = f'MOF-{index:07d}'
+        record = {'identifier': f'{"".join(metals)}.{rng.choice(TOPOLOGIES)}.{index}'}
+        if self._present():
+            record['common_name'] = name
+        if self._present():
+            record['transcriber'] = (
+                ' and '.join(rng.sample(TRANSCRIBERS, 2)) if self._wrong()
+                else rng.sample(TRANSCRIBERS, rng.randint(1, 2))
+            )
+        if self._present():
+            record['compositional_information'] = {
+                'metal_types': (
+                    ' and '.join(metals) if self._wrong() else metals
+                ),
+            }
+
+        pld = rng.lognormvariate(1.5, 0.6)
+        pores = {
+            'PLD_angstrom': self._float(pld),
+            'ASA_m2_cm3': self._float(rng.uniform(0, 3000), 1),
+            'NASA_m2_cm3': self._float(rng.uniform(0, 300), 1),
+            'PV_cm3_g': self._float(pld * rng.uniform(0.05, 0.2)),
+        }
+        topology = {
+            'structure_dimension': self._int(rng.choice([3, 3, 3, 2, 1])),
+            'topology_single_nodes': rng.choice(TOPOLOGIES),
+            'topology_all_nodes': rng.choice(TOPOLOGIES),
+            'catenation': self._int(rng.choice([1, 1, 1, 2, 3])),
+            'dimension_by_topo': self._int(rng.choice([3, 3, 2])),
+            'hall': rng.choice(HALL_SYMBOLS),
+            'number_spacegroup': self._int(rng.randint(1, 230)),
+        }
+        for section in (pores, topology):
+            for key in list(section):
+                if not self._present():
+                    del section[key]
+        record['calculation_properties'] = {
+            'structural_properties': {
+                'pore_characteristics': pores,
+                'topological_and_crystallographic_information': topology,
+            },
+        }
+        if self._present():
+            record['calculation_properties']['stability'] = {
+                'thermal_stability_celsius': self._float(rng.uniform(150, 550), 1),
+            }
+
+        structural_data = {}
+        if self._present():
+            unmodified = rng.random() < 0.8
+            structural_data['unmodified'] = (
+                rng.choice(['yes', 'TRUE', '1']) if unmodified else 'no'
+            ) if self._wrong() else unmodified
+        if rng.random() < self.cif_rate:
+            n_atoms = int(min(
+                self.max_atoms,
+                max(self.min_atoms, rng.lognormvariate(math.log(200), 0.8)),
+            ))
+            structural_data['cif_data'] = cif_block(rng, name, metals[0], n_atoms)
+        record['structural_data'] = structural_data
+
+        if self._present():
+            year = rng.randint(1995, 2024)
+            record['reference_data'] = {
+                'year': str(year) if self._wrong() else year,
+                'publication': rng.choice(PUBLICATIONS),
+                'doi': f'10.{rng.randint(1000, 1099)}/mof.{rng.randint(0, index // 50 + 1)}',
+            }
+        if self._present():
+            record['synthesis_information'] = {
+                'synthesis_method': rng.choice(SYNTHESIS_METHODS),
+                'synthesis_parameter': {
+                    'starting_materials': (
+                        str(rng.sample(STARTING_MATERIALS, 3)) if self._wrong()
+                        else rng.sample(STARTING_MATERIALS, rng.randint(2, 5))
+                    ),
+                    'temperature': {
+                        'normalized_c': self._float(rng.choice([85, 100, 120, 150, 180]), 1)
+                    },
+                    'time': {'normalized_h': self._float(rng.choice([12, 24, 48, 72]), 1)},
+                },
+            }
+        return record
+
+    def records(self, n: int, start: int = 0) -> Iterator[dict]:
+        for index in range(start, start + n):
+            yield self.record(index)
+
+
+def write_dataset(
+    output_dir: str,
+    n: int,
+    bulk_size: int | None = None,
+    generator: RecordGenerator | None = None,
+) -> list[str]:
+    '''
+    Writes `n` records into `output_dir`, one per file or `bulk_size` per bulk
+    file. Returns the paths of the written files.
+    '''
+    generator = generator or RecordGenerator()
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    if bulk_size:
+        for start in range(0, n, bulk_size):
+            path = os.path.join(output_dir, f'bulk_{start // bulk_size:05d}.mofarch.json')
+            with open(path, 'w') as f:
+                json.dump(list(generator.records(min(bulk_size, n - start), start)), f)
+            paths.append(path)
+    else:
+        for index, record in enumerate(generator.records(n)):
+            path = os.path.join(output_dir, f'mof_{index:07d}.mofarch.json')
+            with open(path, 'w') as f:
+                json.dump(record, f)
+            paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('output_dir')
+    parser.add_argument('-n', type=int, default=1000, help='Number of records.')
+    parser.add_argument('--bulk-size', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--sparsity', type=float, default=0.2)
+    parser.add_argument('--wrong-types', type=float, default=0.1)
+    parser.add_argument('--cif-rate', type=float, default=0.1)
+    parser.add_argument('--max-atoms', type=int, default=2000)
+    args = parser.parse_args()
+
+    generator = RecordGenerator(
+        seed=args.seed,
+        sparsity=args.sparsity,
+        wrong_types=args.wrong_types,
+        cif_rate=args.cif_rate,
+        max_atoms=args.max_atoms,
+    )
+    paths = write_dataset(args.output_dir, args.n, args.bulk_size, generator)
+    print(f'Wrote {args.n} records in {len(paths)} files to {args.output_dir}.')
+
+
+if __name__ == '__main__':
+    main()
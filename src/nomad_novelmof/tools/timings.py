@@ -0,0 +1,104 @@
+'''
+Per-upload report of the stage timings and peak memory logged while processing
+MOFArchive entries.
+
+With `log_stage_timings` enabled on the parser, schema or normalizer entry point,
+every processed entry has `Stage timings.` events in its processing logs, and
+with `profile_memory` `Memory profile.` events. This tool collects them from the
+archives of an upload, either local `*.archive.json` files or through the NOMAD
+API, and prints the count, median, 95th percentile and maximum duration of every
+stage, and the entries with the highest peak memory.
+
+Usage:
+
+    python -m nomad_novelmof.tools.timings --files ARCHIVE_DIR
+    python -m nomad_novelmof.tools.timings --url https://nomad-lab.eu/prod/v1/api/v1 --upload-id UPLOAD_ID
+'''
+
+import argparse
+import json
+import os
+from collections.abc import Iterable, Iterator
+
+from nomad_novelmof.profiling import MemoryReport, TimingReport
+
+
+def iter_file_logs(paths: Iterable[str]) -> Iterator[list[dict]]:
+    for path in paths:
+        with open(path) as f:
+            yield json.load(f).get('processing_logs') or []
+
+
+def iter_api_logs(
+    url: str, upload_id: str, token: str | None = None, page_size: int = 100
+) -> Iterator[list[dict]]:
+    import requests
+
+    headers = {'Authorization': f'Bearer {token}'} if token else {}
+    body = {
+        'owner': 'visible',
+        'query': {'upload_id': upload_id},
+        'pagination': {'page_size': page_size},
+        'required': {'processing_logs': '*'},
+    }
+    while True:
+        response = requests.post(
+            f'{url}/entries/archive/query', json=body, headers=headers, timeout=300
+        )
+        response.raise_for_status()
+        result = response.json()
+        for entry in result['data']:
+            yield entry.get('archive', {}).get('processing_logs') or []
+        page_after_value = result['pagination'].get('next_page_after_value')
+        if not page_after_value or not result['data']:
+            break
+        body['pagination']['page_after_value'] = page_after_value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--files', help='Directory with *.archive.json files.')
+    source.add_argument('--url', help='Base URL of a NOMAD API.')
+    parser.add_argument('--upload-id', help='Upload to report on, with --url.')
+    parser.add_argument('--token', default=None)
+    parser.add_argument(
+        '--memory-threshold-mb',
+        type=float,
+        default=0,
+        help='Only list entries with a higher peak memory.',
+    )
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON.')
+    args = parser.parse_args()
+
+    if args.files:
+        logs = iter_file_logs(
+            os.path.join(args.files, name)
+            for name in sorted(os.listdir(args.files))
+            if name.endswith('.archive.json')
+        )
+    else:
+        if not args.upload_id:
+            parser.error('--upload-id is required with --url')
+        logs = iter_api_logs(args.url, args.upload_id, args.token)
+
+    report = TimingReport()
+    memory = MemoryReport()
+    for processing_logs in logs:
+        report.add_logs(processing_logs)
+        memory.add_logs(processing_logs)
+    threshold = args.memory_threshold_mb * 1024**2
+    if args.json:
+        print(json.dumps(dict(
+            stage_timings=report.summary(),
+            memory_outliers=memory.outliers(threshold),
+        ), indent=2))
+        return
+    print(report.format())
+    if memory.peaks:
+        print()
+        print(memory.format(threshold))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+'''
+Per-column vocabularies of the repetitive strings of MOFArchive records.
+
+Across a bulk dataset, publishers, synthesis methods, Hall symbols, crystal
+systems, topologies, metals and building blocks take only a few hundred distinct
+values, while every decoded record holds its own string objects. A `Vocabulary`
+maps each distinct term to a small integer code in order of first appearance,
+so columns can store codes and share one string object per term. Codes are
+stable once assigned, so vocabularies can be persisted with `Vocabularies.save`
+and extended by later deliveries, and the columnar export and the query tools
+use the same codes.
+'''
+
+import json
+from collections.abc import Iterable
+
+# record columns, see `fields.COLUMNS`, that are interned
+INTERNED_COLUMNS = [
+    'metal_types',
+    'topology_single_nodes',
+    'topology_all_nodes',
+    'hall',
+    'crystal_system',
+    'publication',
+    'synthesis_method',
+    'metal_nodes',
+    'linkers',
+    'plausibility_flags',
+]
+NO_CODE = -1
+
+
+class Vocabulary:
+    def __init__(self, terms: Iterable[str] = ()):
+        self.terms: list[str] = []
+        self.codes: dict[str, int] = {}
+        for term in terms:
+            self.encode(term)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def encode(self, term: str | None) -> int:
+        '''
+        The code of a term, adding it to the vocabulary if it is new. `NO_CODE`
+        for `None`.
+        '''
+        if term is None:
+            return NO_CODE
+        code = self.codes.get(term)
+        if code is None:
+            code = self.codes[term] = len(self.terms)
+            self.terms.append(term)
+        return code
+
+    def decode(self, code: int) -> str | None:
+        return None if code == NO_CODE else self.terms[code]
+
+
+class Vocabularies(dict):
+    '''
+    The vocabularies of the interned columns by column name.
+    '''
+
+    def __init__(self, terms: dict[str, list[str]] | None = None):
+        super().__init__(
+            (column, Vocabulary((terms or {}).get(column, [])))
+            for column in INTERNED_COLUMNS
+        )
+
+    def to_dict(self) -> dict[str, list[str]]:
+        return {column: vocabulary.terms for column, vocabulary in self.items()}
+
+    def save(self, path: str) -> None:
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: str) -> 'Vocabularies':
+        with open(path) as f:
+            return cls(json.load(f))
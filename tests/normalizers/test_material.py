@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('nomad')
+
+import structlog
+from nomad.datamodel.results import Material
+
+from nomad_novelmof.normalizers.material import (
+    DESCRIPTOR_SYSTEM_ID,
+    formula_from_cif,
+    populate_materials,
+)
+
+logger = structlog.get_logger()
+
+
+def cif(formula):
+    return f"data_mof\n_chemical_formula_sum '{formula}'\n_cell_length_a 10\n"
+
+
+def test_formula_from_cif():
+    assert formula_from_cif(cif('C24 H12 Cu3 O15')) == 'C24H12Cu3O15'
+    assert formula_from_cif('data_mof\n_cell_length_a 10\n') is None
+    assert formula_from_cif(None) is None
+    assert formula_from_cif(float('nan')) is None
+
+
+def test_populate_materials():
+    materials = [Material() for _ in range(4)]
+    populate_materials(
+        materials,
+        [cif('Cu3 O15 C24 H12'), None, cif('Cu3 O15 C24 H12'), cif('Cu3-O')],
+        np.array([5.0, np.nan, np.nan, 7.5]),
+        np.array([3, 2, np.nan, 5]),
+        logger,
+    )
+
+    assert materials[0].chemical_formula_hill == 'C24H12Cu3O15'
+    assert materials[0].elements == ['C', 'Cu', 'H', 'O']
+    assert materials[2].chemical_formula_hill == 'C24H12Cu3O15'
+    # the materials with the same formula do not share their sections
+    compositions = [materials[index].elemental_composition for index in (0, 2)]
+    assert len(compositions[0]) == 4
+    assert compositions[0][0] is not compositions[1][0]
+    assert compositions[0][0].m_parent is materials[0]
+    assert materials[1].chemical_formula_hill is None
+    assert materials[3].chemical_formula_hill is None
+
+    system = materials[0].topology[0]
+    assert system.system_id == DESCRIPTOR_SYSTEM_ID
+    assert system.pore_limiting_diameter.to('angstrom').magnitude == pytest.approx(5)
+    assert system.dimensionality == '3D'
+    assert materials[1].topology[0].pore_limiting_diameter is None
+    assert materials[1].topology[0].dimensionality == '2D'
+    assert not materials[2].topology
+    assert materials[3].topology[0].dimensionality is None
+
+
+def test_populate_materials_keeps_existing():
+    material = Material(chemical_formula_hill='CuO')
+    populate_materials(
+        [material], [cif('C24 H12 Cu3 O15')], np.array([5.0]), np.array([3]), logger
+    )
+    assert material.chemical_formula_hill == 'CuO'
+    assert len(material.topology) == 1
+
+    populate_materials([material], None, np.array([9.0]), np.array([1]), logger)
+    assert len(material.topology) == 1
+    assert material.topology[0].dimensionality == '3D'
@@ -0,0 +1,156 @@
+import copy
+import json
+
+import numpy as np
+import pytest
+
+pytest.importorskip('nomad')
+
+import structlog
+
+from nomad_novelmof.parsers.bulk import child_file_name, plausibility_file_name
+from nomad_novelmof.parsers.mofarch_json_parser import MOFArchJsParser
+from nomad_novelmof.plausibility import MIN_OUTLIER_ROWS
+from nomad_novelmof.profiling import StageTimer
+from nomad_novelmof.tools.synthetic import RecordGenerator
+
+
+@pytest.fixture
+def deliver(tmp_path):
+    from nomad.datamodel import EntryArchive, EntryMetadata
+    from nomad.datamodel.context import ClientContext
+
+    mainfile = str(tmp_path / 'mofs.mofarch.json')
+    context = ClientContext(local_dir=str(tmp_path))
+
+    def deliver(records):
+        archive = EntryArchive(
+            m_context=context, metadata=EntryMetadata(mainfile='mofs.mofarch.json')
+        )
+        return MOFArchJsParser().parse_bulk(
+            copy.deepcopy(records),
+            mainfile,
+            archive,
+            structlog.get_logger(),
+            StageTimer('test', False),
+        )
+
+    def entry(identifier):
+        with open(tmp_path / child_file_name(mainfile, identifier)) as file:
+            return json.load(file)
+
+    def child(identifier):
+        return entry(identifier)['data']
+
+    def statistics():
+        with open(tmp_path / plausibility_file_name(mainfile)) as file:
+            return json.load(file)
+
+    deliver.entry = entry
+    deliver.child = child
+    deliver.statistics = statistics
+    return deliver
+
+
+def generated_records(n):
+    generator = RecordGenerator(seed=1, sparsity=0, wrong_types=0, cif_rate=0)
+    return [generator.record(index) for index in range(n)]
+
+
+def pld(data):
+    return data['calculation_properties']['structural_properties'][
+        'pore_characteristics'
+    ]['PLD_angstrom']
+
+
+def test_duplicate_identifiers_are_not_checked(deliver):
+    records = generated_records(31)
+    orphan = copy.deepcopy(records[0])
+    pores = orphan['calculation_properties']['structural_properties']
+    pores['pore_characteristics']['PLD_angstrom'] = -1000.0
+
+    delta = deliver([orphan, *records])
+
+    assert sorted(delta.created) == sorted(record['identifier'] for record in records)
+    data = deliver.child(records[0]['identifier'])
+    assert pld(data) == pytest.approx(pld(records[0]))
+    assert 'negative_PLD_angstrom' not in (data.get('plausibility_flags') or [])
+    # the statistics are those of the delivered records only
+    median, _ = deliver.statistics()['PLD_angstrom']
+    assert median == pytest.approx(np.median([pld(record) for record in records]))
+
+
+def test_removed_records_are_replaced(deliver):
+    records = generated_records(3)
+    removed = records[2]['identifier']
+    deliver(records)
+
+    delta = deliver(records[:2])
+    assert delta.deleted == [removed]
+    data = deliver.child(removed)
+    assert data['m_def'].endswith('.RemovedMOFRecord')
+    assert data['identifier'] == removed
+    assert data['bulk_file'] == 'mofs.mofarch.json'
+
+    delta = deliver(records)
+    assert delta.created == [removed]
+    assert deliver.child(removed)['m_def'].endswith('.MOFArchive')
+
+
+def test_partial_delivery_keeps_statistics(deliver):
+    records = generated_records(80)
+    deliver(records)
+    statistics = deliver.statistics()
+
+    # enough changed records for statistics of their own, which are not used
+    changed = copy.deepcopy(records)
+    for record in changed[:MIN_OUTLIER_ROWS]:
+        pores = record['calculation_properties']['structural_properties']
+        pores['pore_characteristics']['PLD_angstrom'] = 1000.0
+    delta = deliver(changed)
+
+    assert len(delta.updated) == MIN_OUTLIER_ROWS
+    assert deliver.statistics() == statistics
+    flags = deliver.child(records[0]['identifier'])['plausibility_flags']
+    assert 'PLD_angstrom_outlier' in flags
+
+
+def test_int_beyond_int64(deliver):
+    records = generated_records(3)
+    topology = records[1]['calculation_properties']['structural_properties'][
+        'topological_and_crystallographic_information'
+    ]
+    topology['number_spacegroup'] = 2**70
+
+    delta = deliver(records)
+
+    # the record does not abort the delivery or shift the rows after it
+    assert sorted(delta.created) == sorted(record['identifier'] for record in records)
+    for record in records[::2]:
+        data = deliver.child(record['identifier'])
+        assert data['identifier'] == record['identifier']
+        assert pld(data) == pytest.approx(pld(record))
+
+
+def test_materials_are_written_into_the_children(deliver):
+    records = generated_records(3)
+    records[0]['structural_data']['cif_data'] = (
+        "data_mof\n_chemical_formula_sum 'Cu3 O15 C24 H12'\n"
+    )
+    structural = records[2]['calculation_properties']['structural_properties']
+    del structural['pore_characteristics']['PLD_angstrom']
+    del structural['topological_and_crystallographic_information'][
+        'structure_dimension'
+    ]
+
+    deliver(records)
+
+    material = deliver.entry(records[0]['identifier'])['results']['material']
+    assert material['chemical_formula_hill'] == 'C24H12Cu3O15'
+    assert material['topology'][0]['pore_limiting_diameter'] == pytest.approx(
+        pld(records[0]) * 1e-10
+    )
+    material = deliver.entry(records[1]['identifier'])['results']['material']
+    assert 'chemical_formula_hill' not in material
+    assert len(material['topology']) == 1
+    assert 'results' not in deliver.entry(records[2]['identifier'])
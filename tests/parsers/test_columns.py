@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('nomad')
+
+import structlog
+
+from nomad_novelmof.fields import COLUMNS, PORES, TOPOLOGY
+from nomad_novelmof.parsers.columns import MappedColumns
+from nomad_novelmof.parsers.mofarch_json_parser import MOFArchJsParser
+from nomad_novelmof.parsers.validator import set_path
+from nomad_novelmof.plausibility import CHECKED_COLUMNS
+from nomad_novelmof.tools.synthetic import RecordGenerator
+from nomad_novelmof.vocabulary import Vocabularies
+
+logger = structlog.get_logger()
+
+
+def mapped_records(n):
+    generator = RecordGenerator(seed=2, wrong_types=0.1, cif_rate=0.2, max_atoms=50)
+    return [
+        MOFArchJsParser.map_json_to_schema_with_type_check(record, logger)
+        for record in generator.records(n)
+    ]
+
+
+def test_rows_are_decoded_as_appended():
+    records = mapped_records(100)
+    # values that do not fit the buffer of their field
+    set_path(records[0], f'{TOPOLOGY}.catenation', True)
+    set_path(records[1], f'{PORES}.PLD_angstrom', '6.5')
+    set_path(records[2], 'compositional_information.metal_types', ['Cu', 1])
+    set_path(records[3], 'compositional_information.metal_types', [])
+    set_path(records[4], f'{TOPOLOGY}.number_spacegroup', 2**70)
+    columns = MappedColumns()
+    for data in records:
+        columns.append(data)
+
+    assert len(columns) == len(records)
+    for row, data in enumerate(records):
+        assert columns.record(row) == data
+    assert len(columns.overflow) == 4
+
+
+def test_numeric_and_descriptors():
+    records = mapped_records(20)
+    set_path(records[1], f'{PORES}.PLD_angstrom', '6.5')
+    columns = MappedColumns()
+    for data in records:
+        columns.append(data)
+
+    expected = [
+        data['calculation_properties']['structural_properties'][
+            'pore_characteristics'
+        ]['PLD_angstrom']
+        for data in records
+    ]
+    expected = [value if type(value) is float else np.nan for value in expected]
+    np.testing.assert_array_equal(columns.numeric(f'{PORES}.PLD_angstrom'), expected)
+    with pytest.raises(ValueError):
+        columns.numeric(f'{TOPOLOGY}.hall')
+
+    rows = [1, 4, 7]
+    descriptors = columns.descriptors(rows)
+    assert set(descriptors) == {
+        column for column in CHECKED_COLUMNS if column in COLUMNS
+    } | {'max_cell_length_angstrom'}
+    for column, values in columns.descriptors().items():
+        np.testing.assert_array_equal(descriptors[column], values[rows])
+
+
+def test_codes_are_stable_across_deliveries(tmp_path):
+    columns = MappedColumns()
+    for data in mapped_records(50):
+        columns.append(data)
+    path = tmp_path / 'vocabularies.json'
+    columns.vocabularies.save(path)
+
+    later = MappedColumns(Vocabularies.load(path))
+    records = mapped_records(80)
+    for data in records:
+        later.append(data)
+    for column, vocabulary in columns.vocabularies.items():
+        terms = later.vocabularies[column].terms
+        assert terms[: len(vocabulary)] == vocabulary.terms
+    for row, data in enumerate(records):
+        assert later.record(row) == data
@@ -0,0 +1,79 @@
+import pytest
+
+pytest.importorskip('nomad')
+
+import structlog
+from structlog.testing import capture_logs
+
+from nomad_novelmof.parsers.mofarch_json_parser import MOFArchJsParser
+
+logger = structlog.get_logger()
+
+
+@pytest.mark.parametrize(
+    'year, expected',
+    [(2011, 2011), ('2011', 2011), ('2011.0', 2011), ('2011.7', None), (2011.7, None)],
+)
+def test_year_conversion(year, expected):
+    with capture_logs() as logs:
+        data = MOFArchJsParser.map_json_to_schema_with_type_check(
+            {'reference_data': {'year': year}}, logger
+        )
+    assert data['reference_data']['year'] == expected
+    if expected is None:
+        assert any('non-integral' in log['event'] for log in logs)
+
+
+def test_publications_by_normalized_doi(tmp_path):
+    from nomad.datamodel import EntryArchive, EntryMetadata
+    from nomad.datamodel.context import ClientContext
+
+    archive = EntryArchive(
+        m_context=ClientContext(local_dir=str(tmp_path)),
+        metadata=EntryMetadata(mainfile='mofs.mofarch.json'),
+    )
+    mainfile = str(tmp_path / 'mofs.mofarch.json')
+    publications = {}
+    records = [
+        {'reference_data': {'doi': doi}}
+        for doi in ['10.1021/JA01', ' 10.1021/ja01', '10.1021/ja02']
+    ]
+    for data in records:
+        MOFArchJsParser.link_publication(data, mainfile, archive, logger, publications)
+
+    entries = [data['reference_data']['publication_entry'] for data in records]
+    assert entries[0] == entries[1] != entries[2]
+    assert sorted(publications) == ['10.1021/ja01', '10.1021/ja02']
+    assert len(list(tmp_path.glob('publication_*.archive.json'))) == 2
+
+
+def test_statistics_are_processed_after_the_entries(tmp_path):
+    from nomad.datamodel import EntryArchive, EntryMetadata
+    from nomad.datamodel.context import ClientContext
+
+    from nomad_novelmof.parsers import mofarch_statistics_parser
+    from nomad_novelmof.parsers.mofarch_json_parser import (
+        STATISTICS_FILE_NAME,
+        configuration,
+    )
+    from nomad_novelmof.schema_packages.novelmof_mofarch import MOFArchiveStatistics
+
+    assert mofarch_statistics_parser.level > configuration.level
+    parser = mofarch_statistics_parser.load()
+    path = tmp_path / STATISTICS_FILE_NAME
+    assert parser.is_mainfile(str(path), 'application/json', b'', '')
+    other = str(tmp_path / 'mof.archive.json')
+    assert not parser.is_mainfile(other, 'application/json', b'', '')
+
+    archive = EntryArchive(
+        m_context=ClientContext(local_dir=str(tmp_path)),
+        metadata=EntryMetadata(mainfile='mof.mofarch.json'),
+    )
+    mainfile = str(tmp_path / 'mof.mofarch.json')
+    # an existing statistics entry is written again, so it is processed again
+    path.write_text('{}')
+    MOFArchJsParser.create_statistics(mainfile, archive, logger)
+
+    statistics = EntryArchive()
+    parser.parse(str(path), statistics, logger)
+    assert isinstance(statistics.data, MOFArchiveStatistics)
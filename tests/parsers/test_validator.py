@@ -0,0 +1,104 @@
+import pytest
+
+pytest.importorskip('nomad')
+
+import structlog
+from structlog.testing import capture_logs
+
+from nomad_novelmof.parsers.mofarch_json_parser import MOFArchJsParser
+from nomad_novelmof.parsers.validator import RECORD_FIELDS, validate_record
+from nomad_novelmof.tools.records import PORES, get_path
+from nomad_novelmof.tools.synthetic import RecordGenerator
+
+logger = structlog.get_logger()
+
+RECORD = {
+    'common_name': 'HKUST-1',
+    'compositional_information': {'metal_types': ['Cu']},
+    'calculation_properties': {
+        'structural_properties': {'pore_characteristics': {'PLD_angstrom': 6.5}}
+    },
+    'structural_data': {'unmodified': True, 'cif_data': None},
+    'reference_data': {'year': 1999},
+    'synthesis_information': {
+        'synthesis_parameter': {'temperature': {'normalized_c': 180.0}}
+    },
+}
+
+
+def map_record(record: dict, fast_path: bool) -> tuple[dict, list[str]]:
+    with capture_logs() as logs:
+        data = MOFArchJsParser.map_json_to_schema_with_type_check(
+            record, logger, fast_path=fast_path
+        )
+    return data, [log['event'] for log in logs]
+
+
+def test_exact_record_matches_tolerant_mapping():
+    missing = []
+    data = validate_record(RECORD, missing)
+    assert data is not None
+    assert get_path(data, f'{PORES}.PLD_angstrom') == 6.5
+    temperature = 'synthesis_information.synthesis_parameter.temperature'
+    assert get_path(data, temperature) == 180
+    assert ('identifier', 'identifier') in missing
+
+    fast, fast_logs = map_record(RECORD, fast_path=True)
+    tolerant, tolerant_logs = map_record(RECORD, fast_path=False)
+    assert fast == tolerant
+    assert sorted(fast_logs) == sorted(tolerant_logs)
+
+
+@pytest.mark.parametrize(
+    'record',
+    [
+        pytest.param([], id='not an object'),
+        pytest.param({'reference_data': {'year': '1999'}}, id='string for int'),
+        pytest.param({'reference_data': {'year': True}}, id='bool for int'),
+        pytest.param({'reference_data': {'year': 1999.0}}, id='float for int'),
+        pytest.param({'structural_data': {'unmodified': 1}}, id='int for bool'),
+        pytest.param(
+            {'compositional_information': {'metal_types': 'Cu, Zn'}},
+            id='string for list',
+        ),
+        pytest.param({'reference_data': 'ACS'}, id='string for section'),
+        pytest.param(
+            {'synthesis_information': {'synthesis_parameter': {'time': 12.0}}},
+            id='number for unit section',
+        ),
+    ],
+)
+def test_other_records_fall_back(record):
+    assert validate_record(record, []) is None
+
+
+def test_fallback_converts():
+    record = {
+        'reference_data': {'year': '1999'},
+        'compositional_information': {'metal_types': 'Cu, Zn'},
+    }
+    data, events = map_record(record, fast_path=True)
+    assert data['reference_data']['year'] == 1999
+    assert data['compositional_information']['metal_types'] == ['Cu', 'Zn']
+    assert any(event.startswith('Type mismatch') for event in events)
+
+
+def test_generated_records():
+    '''
+    Every record that the validator accepts is mapped as the tolerant path maps
+    it, and records with wrong types are left to the tolerant path.
+    '''
+    generator = RecordGenerator(seed=1, wrong_types=0.05, cif_rate=0)
+    n_validated = 0
+    for record in generator.records(300):
+        data = validate_record(record, [])
+        tolerant, _ = map_record(record, fast_path=False)
+        if data is not None:
+            n_validated += 1
+            assert data == tolerant
+    assert 0 < n_validated < 300
+
+
+def test_fields_are_unique():
+    targets = [target for target, _, _ in RECORD_FIELDS]
+    assert len(targets) == len(set(targets))
@@ -0,0 +1,73 @@
+import pytest
+import structlog
+from structlog.testing import capture_logs
+
+from nomad_novelmof.schema_packages import cache as cache_module
+from nomad_novelmof.schema_packages.cache import StructureCache, content_hash, get_cache
+
+VALUE = 'x' * 90
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = StructureCache(str(tmp_path / 'cache.sqlite'), max_bytes=1000)
+    yield cache
+    cache.close()
+
+
+def test_evicts_least_recently_used(cache, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, 'time', lambda: now[0])
+    for index in range(10):
+        now[0] += 1
+        cache.set('analysis', 1, f's{index}', VALUE)
+    assert cache.size() == 920
+
+    # read the oldest results, the access times are only written on eviction
+    for index in range(3):
+        now[0] += 1
+        assert cache.get('analysis', 1, f's{index}') == VALUE
+    assert cache.n_pending == 3
+
+    now[0] += 1
+    cache.set('analysis', 1, 's10', VALUE)
+    assert cache.n_pending == 0
+    assert cache.size() <= cache_module.EVICTION_TARGET * cache.max_bytes
+    present = [
+        index
+        for index in range(11)
+        if cache.get('analysis', 1, f's{index}') is not None
+    ]
+    assert present == [0, 1, 2, 5, 6, 7, 8, 9, 10]
+
+
+def test_metrics_are_batched(cache, monkeypatch):
+    monkeypatch.setattr(cache_module, 'FLUSH_EVERY', 4)
+    computed = []
+    for _ in range(3):
+        cache.cached('analysis', 1, 'key', lambda: computed.append(1) or VALUE)
+    assert computed == [1]
+    # one miss and two hits are not written yet
+    stored = cache.connection.execute('SELECT * FROM metrics').fetchall()
+    assert stored == []
+    cache.get('other', 1, 'key')
+    stored = cache.connection.execute('SELECT * FROM metrics').fetchall()
+    assert sorted(stored) == [('analysis', 2, 1), ('other', 0, 1)]
+    assert cache.metrics()['analysis']['hit_rate'] == pytest.approx(2 / 3)
+
+
+def test_version_invalidates(cache):
+    key = content_hash('data_cif')
+    cache.set('analysis', 1, key, [1, 2])
+    assert cache.get('analysis', 1, key) == [1, 2]
+    assert cache.get('analysis', 2, key) is None
+
+
+def test_get_cache_errors(tmp_path):
+    # a file where the directory of the cache should be
+    (tmp_path / 'file').write_text('')
+    path = str(tmp_path / 'file' / 'cache.sqlite')
+    with capture_logs() as logs:
+        assert get_cache(path, logger=structlog.get_logger()) is None
+    assert logs[0]['event'] == 'Could not open the structure cache.'
+    assert get_cache(None) is None
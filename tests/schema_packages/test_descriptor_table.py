@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('nomad')
+pytest.importorskip('h5py')
+
+from nomad_novelmof.parsers.descriptor_parser import convert_column
+from nomad_novelmof.schema_packages.descriptor_table import (
+    DescriptorTable,
+    DescriptorTableWriter,
+    column_array,
+)
+from nomad_novelmof.schema_packages.novelmof_mofarch import MOFDescriptorTable
+
+
+def test_write_and_read(tmp_path):
+    path = str(tmp_path / 'table.h5')
+    with DescriptorTableWriter(path, chunk_rows=4) as writer:
+        for index in range(10):
+            writer.append(
+                dict(identifier=f'mof-{index}', PLD_angstrom=float(index), catenation=1)
+            )
+        writer.append(dict(identifier='mof-10', number_spacegroup=None))
+
+    with DescriptorTable(path) as table:
+        assert len(table) == 11
+        rows = table.filter(ranges={'PLD_angstrom': (3, 8)}, equals={'catenation': [1]})
+        assert rows.tolist() == [3, 4, 5, 6, 7, 8]
+        taken = table.take([10, 2], ['identifier', 'number_spacegroup'])
+        assert taken['identifier'].tolist() == ['mof-2', 'mof-10']
+        assert taken['number_spacegroup'].tolist() == [-1, -1]
+
+
+@pytest.mark.parametrize('values', [[1, 40000], np.array([1, -40000])])
+def test_integers_out_of_range(values):
+    with pytest.raises(ValueError):
+        column_array(values, np.int16)
+
+
+def test_convert_column():
+    values, invalid = convert_column(['3', '', '2.5', '70000', 'x'], np.int16)
+    assert values.tolist() == [3, -1, -1, -1, -1]
+    assert invalid == 3
+
+
+def test_references():
+    table = MOFDescriptorTable()
+    table.set_file('screening.h5', n_rows=10, chunk_rows=4)
+    assert table.PLD_angstrom == 'screening.h5#/descriptors/PLD_angstrom'
+    assert table.m_to_dict()['catenation'] == 'screening.h5#/descriptors/catenation'
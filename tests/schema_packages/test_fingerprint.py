@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('ase')
+
+from ase import Atoms
+
+from nomad_novelmof.schema_packages.fingerprint import (
+    BIN_WIDTH,
+    R_MAX,
+    radial_distribution,
+)
+
+
+def test_distances_beyond_cutoff_are_ignored():
+    pair = Atoms('CO', positions=[(0, 0, 0), (1.2, 0, 0)])
+    # the same pair and a third atom far from both
+    spread = Atoms('CON', positions=[(0, 0, 0), (1.2, 0, 0), (3 * R_MAX, 0, 0)])
+    distribution = radial_distribution(spread)
+    assert len(distribution) == round(R_MAX / BIN_WIDTH)
+    assert distribution[-5:].sum() == pytest.approx(0)
+    np.testing.assert_allclose(
+        distribution * len(spread), radial_distribution(pair) * len(pair)
+    )
+
+
+
+def test_isolated_atoms_have_no_neighbours():
+    far = Atoms('C2', positions=[(0, 0, 0), (R_MAX + 1, 0, 0)])
+    assert not np.any(radial_distribution(far))
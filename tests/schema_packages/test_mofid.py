@@ -0,0 +1,64 @@
+import pytest
+
+pytest.importorskip('nomad')
+
+from nomad_novelmof.schema_packages.mofid import (
+    decompose_mofid,
+    is_metal_node,
+    smiles_elements,
+)
+
+HKUST_1 = '[Cu][Cu].[O-]C(=O)c1cc(cc(c1)C(=O)[O-])C(=O)[O-] MOFid-v1.tbo.cat0;HKUST-1'
+
+
+def test_decompose():
+    assert decompose_mofid(HKUST_1) == dict(
+        metal_nodes=['[Cu][Cu]'],
+        linkers=['[O-]C(=O)c1cc(cc(c1)C(=O)[O-])C(=O)[O-]'],
+        topology='tbo',
+        catenation=0,
+    )
+
+
+def test_blocks_are_canonical():
+    reordered = (
+        '[O-]C(=O)c1cc(cc(c1)C(=O)[O-])C(=O)[O-].[Cu][Cu].[Cu][Cu] MOFid-v1.TBO.cat0'
+    )
+    assert decompose_mofid(reordered) == decompose_mofid(HKUST_1)
+
+
+@pytest.mark.parametrize(
+    'identifier, topology, catenation',
+    [
+        ('[Zn].C1=CC=NC=C1 MOFid-v1.UNKNOWN.cat0', None, 0),
+        ('[Zn].C1=CC=NC=C1 MOFid-v1.pcu.catNA', 'pcu', None),
+        ('[Zn].C1=CC=NC=C1 MOFid-v1.pcu', 'pcu', None),
+    ],
+)
+def test_missing_topology_and_catenation(identifier, topology, catenation):
+    components = decompose_mofid(identifier)
+    assert components['metal_nodes'] == ['[Zn]']
+    assert components['topology'] == topology
+    assert components['catenation'] == catenation
+
+
+@pytest.mark.parametrize(
+    'identifier',
+    [
+        None,
+        '',
+        'HKUST-1',
+        '[Cu][Cu].[O-]C(=O)c1cc(cc(c1)C(=O)[O-])C(=O)[O-] MOFid-v1.ERROR',
+        '[Cu][Cu].[O-]C(=O)c1cc(cc(c1)C(=O)[O-])C(=O)[O-] MOFid-v1.ERROR.cat0;x',
+        '* MOFid-v1.ERROR',
+    ],
+)
+def test_not_decomposed(identifier):
+    assert decompose_mofid(identifier) is None
+
+
+def test_elements():
+    assert smiles_elements('[Cu][Cu]') == {'Cu'}
+    assert smiles_elements('c1ccncc1Cl') == {'C', 'N', 'Cl'}
+    assert is_metal_node('[Zn]O[Zn]')
+    assert not is_metal_node('[O-]C(=O)c1ccccc1')
@@ -0,0 +1,116 @@
+import os
+from io import BytesIO
+
+import pytest
+
+pytest.importorskip('nomad')
+
+import ase.build
+import ase.io
+import structlog
+from nomad.datamodel import EntryArchive, EntryMetadata
+from nomad.datamodel.context import Context
+from structlog.testing import capture_logs
+
+from nomad_novelmof.profiling import STAGE_TIMINGS_EVENT
+from nomad_novelmof.schema_packages import fingerprint, novelmof_mofarch
+from nomad_novelmof.schema_packages.novelmof_mofarch import MOFArchive
+
+logger = structlog.get_logger()
+
+
+@pytest.fixture
+def configuration(monkeypatch, tmp_path):
+    configuration = novelmof_mofarch.configuration
+    monkeypatch.setattr(configuration, 'structure_from_cif', True)
+    monkeypatch.setattr(configuration, 'fingerprint_structures', True)
+    monkeypatch.setattr(configuration, 'log_stage_timings', True)
+    monkeypatch.setattr(configuration, 'cache_path', str(tmp_path / 'cache.sqlite'))
+    # there is no search index to look up duplicates in
+    monkeypatch.setattr(fingerprint, 'find_duplicates', lambda *args, **kwargs: [])
+    return configuration
+
+
+@pytest.fixture
+def data():
+    cif = BytesIO()
+    atoms = ase.build.bulk('Cu', 'fcc', a=3.6, cubic=True).repeat((4, 4, 4))
+    ase.io.write(cif, atoms, format='cif')
+    return {
+        'common_name': 'Cu',
+        'compositional_information': {'metal_types': ['Cu']},
+        'structural_data': {'cif_data': cif.getvalue().decode()},
+    }
+
+
+def normalize(
+    entry: MOFArchive, archive: EntryArchive | None = None
+) -> tuple[dict, EntryArchive]:
+    if archive is None:
+        archive = EntryArchive(data=entry, metadata=EntryMetadata())
+    with capture_logs() as logs:
+        entry.normalize(archive, logger)
+    timings = [log for log in logs if log['event'] == STAGE_TIMINGS_EVENT]
+    return timings[0]['stage_timings'], archive
+
+
+def test_reprocess_skips_expensive_stages(configuration, data, monkeypatch):
+    def atoms_from_cif(cif_data):
+        raise AssertionError('The CIF must not be parsed again.')
+
+    entry = MOFArchive.m_from_dict(data)
+    first_stages, archive = normalize(entry)
+    assert 'MOFArchive.structure_fingerprint' in first_stages
+    assert 'MOFArchive.material' in first_stages
+    assert archive.results.material.elements == ['Cu']
+
+    # normalizing the same archive again skips both structure analyses, but
+    # still finds the duplicates indexed in the meantime
+    monkeypatch.setattr(fingerprint, 'atoms_from_cif', atoms_from_cif)
+    monkeypatch.setattr(
+        fingerprint, 'find_duplicates', lambda *args, **kwargs: ['other']
+    )
+    again_stages, archive = normalize(entry, archive)
+    assert 'MOFArchive.structure_fingerprint' not in again_stages
+    assert 'MOFArchive.material' not in again_stages
+    assert 'MOFArchive.elements' in again_stages
+    assert 'MOFArchive.duplicates' in again_stages
+    assert entry.structural_data.duplicates == ['other']
+
+    # reprocessing rebuilds the results: the fingerprint kept in data is skipped,
+    # the material is taken from the cache
+    stored = entry.m_to_dict()
+    reprocess_stages, archive = normalize(MOFArchive.m_from_dict(stored))
+    assert 'MOFArchive.structure_fingerprint' not in reprocess_stages
+    assert 'MOFArchive.material' in reprocess_stages
+    assert archive.results.material.topology
+    assert archive.results.material.elements == ['Cu']
+
+
+class UploadContext(Context):
+    '''
+    The raw files of an upload in a local directory, as on the server.
+    '''
+
+    def __init__(self, directory):
+        super().__init__()
+        self.directory = directory
+
+    def raw_file(self, path, *args, **kwargs):
+        return open(os.path.join(self.directory, path), *args, **kwargs)
+
+
+def test_cif_moves_into_raw_file(data, tmp_path):
+    entry = MOFArchive.m_from_dict(data)
+    archive = EntryArchive(
+        data=entry,
+        metadata=EntryMetadata(mainfile='mof.archive.json'),
+        m_context=UploadContext(tmp_path),
+    )
+    entry.structural_data.normalize(archive, logger)
+    structural_data = entry.structural_data
+    assert structural_data.cif_data is None
+    assert structural_data.cif_file == 'mof.cif'
+    cif_data = data['structural_data']['cif_data']
+    assert (tmp_path / 'mof.cif').read_text() == cif_data
+    assert structural_data.read_cif(archive) == cif_data
@@ -0,0 +1,25 @@
+import pytest
+
+pytest.importorskip('nomad')
+
+import ase.build
+import structlog
+from nomad.datamodel.results import Material
+
+from nomad_novelmof.schema_packages.utils import material_from_atoms
+
+logger = structlog.get_logger()
+
+
+@pytest.fixture
+def atoms():
+    # a periodic structure of about 500 atoms, the size of a typical MOF cell
+    return ase.build.bulk('Cu', 'fcc', a=3.6, cubic=True).repeat((5, 5, 5))
+
+
+def test_material_from_atoms(atoms):
+    material = Material()
+    material_from_atoms(atoms, material, logger)
+    assert material.elements == ['Cu']
+    assert material.symmetry.space_group_number == 225
+    assert material.topology[0].n_atoms == len(atoms)
@@ -0,0 +1,93 @@
+import pytest
+
+pytest.importorskip('nomad')
+
+from nomad_novelmof.schema_packages import spacegroups
+from nomad_novelmof.schema_packages.novelmof_mofarch import (
+    TopologicalAndCrystallographicInformation,
+)
+from nomad_novelmof.schema_packages.spacegroups import (
+    CRYSTAL_SYSTEMS,
+    HALL_NUMBERS,
+    HALL_SETTINGS,
+    crystal_system,
+    hall_setting,
+    normalize_hall,
+    standard_hall,
+)
+
+
+def test_tables():
+    assert len(HALL_SETTINGS) == 530
+    numbers = [number for _, number, _ in HALL_SETTINGS]
+    assert numbers == sorted(numbers)
+    assert set(numbers) == set(range(1, 231))
+    assert all(hall == normalize_hall(hall) for hall, _, _ in HALL_SETTINGS)
+    # the origin choices of some settings of space group 68 share their symbol
+    assert len(HALL_NUMBERS) == 527
+    assert HALL_NUMBERS['C 2 2 -1ac'] == 322
+
+
+@pytest.mark.parametrize(
+    'hall, setting',
+    [
+        ('-P 2ac 2ab', ('-P 2ac 2ab', 61, 'Pbca')),
+        (' -P  2ac\t2ab ', ('-P 2ac 2ab', 61, 'Pbca')),
+        ('-F 4vw 2vw 3', ('-F 4vw 2vw 3', 227, 'Fd-3m')),
+        # lower and upper case letters mean different operations
+        ('-p 2ac 2ab', None),
+        ('-P 2AC 2AB', None),
+        ('P 2c -2AC', None),
+        ('Fm-3m', None),
+        ('', None),
+        (None, None),
+    ],
+)
+def test_hall_setting(hall, setting):
+    assert hall_setting(hall) == setting
+
+
+@pytest.mark.parametrize(
+    'number, hall', [(1, 'P 1'), (14, '-P 2ybc'), (225, '-F 4 2 3'), (0, None)]
+)
+def test_standard_hall(number, hall):
+    assert standard_hall(number) == hall
+    if hall:
+        assert hall_setting(hall)[1] == number
+
+
+@pytest.mark.parametrize(
+    'number, system',
+    [
+        (1, 'triclinic'),
+        (2, 'triclinic'),
+        (3, 'monoclinic'),
+        (74, 'orthorhombic'),
+        (75, 'tetragonal'),
+        (167, 'trigonal'),
+        (168, 'hexagonal'),
+        (230, 'cubic'),
+        (0, None),
+        (231, None),
+        (None, None),
+    ],
+)
+def test_crystal_system(number, system):
+    assert crystal_system(number) == system
+
+
+def test_crystal_system_enum():
+    # MEnum keeps its values sorted
+    quantity = TopologicalAndCrystallographicInformation.crystal_system
+    assert list(quantity.type) == sorted(
+        system for _, system in spacegroups.CRYSTAL_SYSTEMS
+    )
+    assert [system for _, system in CRYSTAL_SYSTEMS] == [
+        'triclinic',
+        'monoclinic',
+        'orthorhombic',
+        'tetragonal',
+        'trigonal',
+        'hexagonal',
+        'cubic',
+    ]
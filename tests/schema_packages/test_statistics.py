@@ -0,0 +1,165 @@
+import json
+import socket
+
+import numpy as np
+import pytest
+
+pytest.importorskip('nomad')
+
+import structlog
+from nomad.config import config
+from nomad.datamodel import EntryArchive, EntryMetadata
+
+from nomad_novelmof.schema_packages.novelmof_mofarch import (
+    MOFArchive,
+    MOFArchiveStatistics,
+)
+from nomad_novelmof.schema_packages.statistics import (
+    PORES,
+    RunningStatistics,
+    search_quantity_values,
+)
+
+SCHEMA = MOFArchive.m_def.qualified_name()
+PLD = f'{PORES}.PLD_angstrom'
+PUBLICATION = 'data.reference_data.publication'
+
+logger = structlog.get_logger()
+
+
+def test_running_statistics_merge():
+    values = np.random.default_rng(0).uniform(0, 50, 1000)
+    merged = RunningStatistics(0, 50)
+    for batch in np.array_split(values, 7):
+        part = RunningStatistics(0, 50)
+        part.update(batch)
+        merged.merge(part)
+    assert merged.count == len(values)
+    assert merged.mean == pytest.approx(values.mean())
+    assert merged.variance == pytest.approx(values.var(ddof=1))
+    assert merged.bin_counts.sum() == len(values)
+
+
+def test_search_quantity_values():
+    entry = {
+        'search_quantities': [
+            {'id': f'{PLD}#{SCHEMA}', 'float_value': 6.5},
+            {'id': f'{PUBLICATION}#{SCHEMA}', 'str_value': 'ACS'},
+            {'id': f'{PLD}#other.Schema', 'float_value': 1.0},
+        ]
+    }
+    assert search_quantity_values(entry, SCHEMA, [PLD, PUBLICATION, 'data.x']) == {
+        PLD: 6.5,
+        PUBLICATION: 'ACS',
+        'data.x': None,
+    }
+
+
+@pytest.fixture
+def elastic():
+    try:
+        socket.create_connection((config.elastic.host, config.elastic.port), 1).close()
+    except OSError:
+        pytest.skip('Elasticsearch is not available.')
+    from nomad import infrastructure
+
+    infrastructure.setup_elastic()
+
+
+@pytest.fixture
+def upload(elastic):
+    from nomad import search
+    from nomad.utils.exampledata import ExampleData
+
+    data = ExampleData()
+    upload_id = 'test_mofarchive_statistics'
+    data.create_upload(upload_id=upload_id, published=False)
+    records = [(4.0, 'ACS'), (6.0, 'ACS'), (8.0, 'RSC')]
+    for index, (pld, publication) in enumerate(records):
+        entry = MOFArchive.m_from_dict(
+            {
+                'identifier': f'mof_{index}',
+                'reference_data': {'publication': publication},
+                'calculation_properties': {
+                    'structural_properties': {
+                        'pore_characteristics': {'PLD_angstrom': pld}
+                    }
+                },
+            }
+        )
+        archive = data.create_entry(
+            upload_id=upload_id,
+            mainfile=f'mof_{index}.archive.json',
+            entry_archive=EntryArchive(data=entry),
+        )
+        archive.metadata.apply_archive_metadata(archive)
+    data.save(with_files=False, with_mongo=False, with_es=True)
+    yield data, upload_id
+    search.delete_upload(upload_id, refresh=True)
+
+
+def test_statistics_of_processed_upload(upload):
+    from nomad import search
+
+    data, upload_id = upload
+    statistics = MOFArchiveStatistics()
+    archive = EntryArchive(
+        data=statistics, metadata=EntryMetadata(upload_id=upload_id)
+    )
+    statistics.normalize(archive, logger)
+    assert statistics.n_entries == 3
+    pld = next(section for section in statistics.descriptors if section.name == PLD)
+    assert pld.mean == pytest.approx(6.0)
+    publishers = next(
+        section for section in statistics.terms if section.name == PUBLICATION
+    )
+    assert list(publishers.terms) == ['ACS', 'RSC']
+
+    # a deleted entry is noticed and the statistics are recomputed
+    search.delete_entry(next(iter(data.entries)), refresh=True)
+    statistics.normalize(archive, logger)
+    assert statistics.n_entries == 2
+
+
+def test_statistics_of_single_record_files(elastic, tmp_path):
+    from nomad import search
+    from nomad.datamodel.context import ClientContext
+    from nomad.utils.exampledata import ExampleData
+
+    from nomad_novelmof.parsers import mofarch_statistics_parser
+    from nomad_novelmof.parsers.mofarch_json_parser import (
+        STATISTICS_FILE_NAME,
+        MOFArchJsParser,
+    )
+
+    data = ExampleData()
+    upload_id = 'test_mofarchive_statistics_files'
+    data.create_upload(upload_id=upload_id, published=False)
+    context = ClientContext(local_dir=str(tmp_path))
+    try:
+        for index in range(2):
+            mainfile = tmp_path / f'mof_{index}.mofarch.json'
+            mainfile.write_text(json.dumps({'identifier': f'mof_{index}'}))
+            archive = EntryArchive(
+                m_context=context,
+                metadata=EntryMetadata(upload_id=upload_id, mainfile=mainfile.name),
+            )
+            MOFArchJsParser().parse(str(mainfile), archive, logger)
+            # the entry is processed and indexed before the statistics entry,
+            # whose parser has a higher level
+            indexed = data.create_entry(
+                upload_id=upload_id,
+                mainfile=mainfile.name,
+                entry_archive=EntryArchive(data=archive.data.m_copy(deep=True)),
+            )
+            indexed.metadata.apply_archive_metadata(indexed)
+            data.save(with_files=False, with_mongo=False, with_es=True)
+
+            statistics = EntryArchive(metadata=EntryMetadata(upload_id=upload_id))
+            mofarch_statistics_parser.load().parse(
+                str(tmp_path / STATISTICS_FILE_NAME), statistics, logger
+            )
+            statistics.data.normalize(statistics, logger)
+            assert statistics.data.n_entries == index + 1
+    finally:
+        search.delete_upload(upload_id, refresh=True)
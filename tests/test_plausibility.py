@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+from nomad_novelmof.plausibility import (
+    MAX_SYNTHESIS_CELSIUS,
+    MIN_OUTLIER_ROWS,
+    max_cell_length,
+    plausibility_flags,
+    robust_statistics,
+)
+
+nan = np.nan
+
+
+def flags_of(column, values, **columns):
+    columns[column] = np.asarray(values, dtype=float)
+    return plausibility_flags(columns, len(values), statistics={})
+
+
+@pytest.mark.parametrize(
+    'column, values, flag, flagged',
+    [
+        ('PV_cm3_g', [0.5, -0.1, 0, nan], 'negative_PV_cm3_g', [1]),
+        (
+            'structure_dimension',
+            [3, 4, -1, 0],
+            'structure_dimension_out_of_range',
+            [1, 2],
+        ),
+        (
+            'number_spacegroup',
+            [1, 230, 0, 231],
+            'number_spacegroup_out_of_range',
+            [2, 3],
+        ),
+        (
+            'synthesis_temperature_celsius',
+            [25, 280, MAX_SYNTHESIS_CELSIUS, 450, MAX_SYNTHESIS_CELSIUS + 273.15],
+            'synthesis_temperature_in_kelvin',
+            [3, 4],
+        ),
+        (
+            'synthesis_temperature_celsius',
+            [25, MAX_SYNTHESIS_CELSIUS + 274, 5000],
+            'synthesis_temperature_out_of_range',
+            [1, 2],
+        ),
+        (
+            'synthesis_temperature_celsius',
+            [-273.15, -300],
+            'synthesis_temperature_below_absolute_zero',
+            [1],
+        ),
+    ],
+)
+def test_rules(column, values, flag, flagged):
+    flags = flags_of(column, values)
+    assert sorted(flags) == flagged
+    assert all(flags[row] == [flag] for row in flagged)
+
+
+def test_valid_celsius_is_not_kelvin():
+    temperatures = np.linspace(-80, MAX_SYNTHESIS_CELSIUS, 961)
+    assert flags_of('synthesis_temperature_celsius', temperatures) == {}
+
+
+def test_pld_exceeds_cell():
+    cif = '_cell_length_a 10.0\n_cell_length_b   12.5\n_cell_length_c 8\n'
+    assert max_cell_length(cif) == 12.5
+    assert np.isnan(max_cell_length(None))
+    flags = flags_of(
+        'PLD_angstrom',
+        [6.0, 13.0, 13.0],
+        max_cell_length_angstrom=np.array([12.5, 12.5, nan]),
+    )
+    assert flags == {1: ['PLD_exceeds_cell']}
+
+
+def test_outliers():
+    values = np.random.default_rng(0).normal(10, 1, 100)
+    values[[5, 50]] = [100, -50]
+    columns = {'PLD_angstrom': values}
+    statistics = robust_statistics(columns)
+    median, mad = statistics['PLD_angstrom']
+    assert median == pytest.approx(np.median(values))
+    assert 0.5 < mad < 1
+
+    flags = plausibility_flags(columns, len(values))
+    assert flags == {
+        5: ['PLD_angstrom_outlier'],
+        50: ['negative_PLD_angstrom', 'PLD_angstrom_outlier'],
+    }
+    # checked against given statistics, e.g. those of the whole dataset
+    flags = plausibility_flags({'PLD_angstrom': np.array([10.0, 30.0])}, 2, statistics)
+    assert flags == {1: ['PLD_angstrom_outlier']}
+
+
+def test_too_few_rows_for_outliers():
+    values = np.append(np.arange(MIN_OUTLIER_ROWS - 2, dtype=float), 1e6)
+    assert robust_statistics({'PLD_angstrom': values}) == {}
+    assert plausibility_flags({'PLD_angstrom': values}, len(values)) == {}
+
+
+def test_missing_columns_pass():
+    assert plausibility_flags({}, 3) == {}
@@ -0,0 +1,166 @@
+from types import SimpleNamespace
+
+import pytest
+import structlog
+from structlog.testing import capture_logs
+
+from nomad_novelmof import profiling
+from nomad_novelmof.profiling import (
+    MEMORY_PROFILE_EVENT,
+    STAGE_TIMINGS_EVENT,
+    MemoryProfile,
+    MemoryReport,
+    StageTimer,
+    TimingReport,
+)
+
+MiB = 1024**2
+logger = structlog.get_logger()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    '''
+    A clock that only advances by `clock.advance(seconds)`.
+    '''
+    now = [100.0]
+
+    def advance(seconds):
+        now[0] += seconds
+
+    clock = SimpleNamespace(perf_counter=lambda: now[0], advance=advance)
+    monkeypatch.setattr(profiling, 'time', clock)
+    return clock
+
+
+def test_stage_timer(clock):
+    timer = StageTimer('Parser')
+    for seconds in [0.5, 0.25]:
+        with timer.span('load'):
+            clock.advance(seconds)
+    with timer.span('map'):
+        clock.advance(1)
+        with timer.span('validate'):
+            clock.advance(2)
+    assert timer.durations == {
+        'Parser.load': 0.75,
+        'Parser.validate': 2,
+        'Parser.map': 3,
+    }
+
+    with capture_logs() as logs:
+        timer.log(logger, mainfile='mofs.mofarch.json')
+    assert logs == [
+        dict(
+            event=STAGE_TIMINGS_EVENT,
+            log_level='info',
+            stage_timings=timer.durations,
+            mainfile='mofs.mofarch.json',
+        )
+    ]
+
+
+def test_disabled_stage_timer(clock):
+    timer = StageTimer('Parser', enabled=False)
+    with timer.span('load'), timer.span('map'):
+        clock.advance(1)
+    assert timer.span('load') is timer.span('map')
+    assert timer.durations == {}
+    with capture_logs() as logs:
+        timer.log(logger)
+    assert logs == []
+
+
+def test_timing_report():
+    report = TimingReport()
+    processing_logs = [
+        {'event': STAGE_TIMINGS_EVENT, 'stage_timings': {'A.load': duration}}
+        for duration in [0.001, 0.002, 0.003, 0.004, 0.1]
+    ]
+    report.add_logs([*processing_logs, {'event': 'Other event.'}])
+    report.add({'A.map': 0.01})
+
+    summary = report.summary()
+    assert summary['A.map'] == dict(count=1, p50=0.01, p95=0.01, max=0.01)
+    assert summary['A.load']['count'] == 5
+    assert summary['A.load']['p50'] == pytest.approx(0.003)
+    assert summary['A.load']['p95'] == pytest.approx(0.0808)
+    assert summary['A.load']['max'] == pytest.approx(0.1)
+
+    lines = report.format().splitlines()
+    assert lines[0].split() == ['stage', 'count', 'p50', 'ms', 'p95', 'ms', 'max', 'ms']
+    assert lines[1].split() == ['A.load', '5', '3.00', '80.80', '100.00']
+    assert lines[2].split() == ['A.map', '1', '10.00', '10.00', '10.00']
+
+
+def allocate(size: int) -> bytearray:
+    return bytearray(size)
+
+
+def test_memory_profile():
+    with MemoryProfile(True, threshold_bytes=4 * MiB) as profile:
+        buffer = allocate(8 * MiB)
+    assert profile.peak_bytes == pytest.approx(8 * MiB, rel=0.01)
+    assert profile.is_outlier
+    # the sites hold the most memory at the end
+    line = allocate.__code__.co_firstlineno + 1
+    assert profile.sites[0].startswith(f'{__file__}:{line} 8.0 MiB')
+    del buffer
+
+    with MemoryProfile(True, threshold_bytes=4 * MiB) as small:
+        allocate(MiB)
+    assert not small.is_outlier
+    assert small.sites == []
+
+
+def test_nested_memory_profiles():
+    with MemoryProfile(True, threshold_bytes=64 * MiB) as outer:
+        buffer = allocate(16 * MiB)
+        del buffer
+        for _ in range(2):
+            with MemoryProfile(True, threshold_bytes=64 * MiB) as inner:
+                buffer = allocate(4 * MiB)
+                del buffer
+            assert inner.peak_bytes == pytest.approx(4 * MiB, rel=0.01)
+    # the inner profiles do not reset the peak of the outer one
+    assert outer.peak_bytes == pytest.approx(16 * MiB, rel=0.01)
+
+    with MemoryProfile(True, threshold_bytes=64 * MiB) as outer:
+        with MemoryProfile(True, threshold_bytes=64 * MiB):
+            buffer = allocate(8 * MiB)
+            del buffer
+    assert outer.peak_bytes == pytest.approx(8 * MiB, rel=0.01)
+
+
+def test_disabled_memory_profile():
+    with MemoryProfile(False, threshold_bytes=0) as profile:
+        allocate(MiB)
+    assert profile.peak_bytes is None
+    with capture_logs() as logs:
+        profile.log(None, 'parser')
+    assert logs == []
+
+
+def test_memory_report():
+    report = MemoryReport()
+    with capture_logs() as logs:
+        for size in [1, 3, 2]:
+            with MemoryProfile(True, threshold_bytes=2.5 * MiB) as profile:
+                buffer = allocate(size * MiB)
+                del buffer
+            profile.log(logger, 'MOFArchJsParser', identifier=f'mof_{size}')
+    assert [log['event'] for log in logs] == [MEMORY_PROFILE_EVENT] * 3
+    assert [log['log_level'] for log in logs] == ['info', 'warning', 'info']
+    report.add_logs(logs)
+    report.add_logs([{'event': 'other'}], entry='ignored')
+
+    outliers = report.outliers(threshold_bytes=1.5 * MiB)
+    assert [(identifier, component) for _, identifier, component in outliers] == [
+        ('mof_3', 'MOFArchJsParser'),
+        ('mof_2', 'MOFArchJsParser'),
+    ]
+    assert outliers[0][0] == pytest.approx(3 * MiB, rel=0.05)
+    lines = report.format(threshold_bytes=1.5 * MiB).splitlines()
+    assert lines[0].split() == ['peak', 'MiB', 'component', 'identifier']
+    assert lines[1].split() == ['3.0', 'MOFArchJsParser', 'mof_3']
+    assert len(lines) == 3
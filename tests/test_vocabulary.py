@@ -0,0 +1,29 @@
+from nomad_novelmof.vocabulary import (
+    INTERNED_COLUMNS,
+    NO_CODE,
+    Vocabularies,
+    Vocabulary,
+)
+
+
+def test_vocabulary():
+    vocabulary = Vocabulary(['Cu', 'Zn'])
+    assert vocabulary.encode('Zn') == 1
+    assert vocabulary.encode('Co') == 2
+    assert vocabulary.encode('Cu') == 0
+    assert vocabulary.encode(None) == NO_CODE
+    assert len(vocabulary) == 3
+    assert [vocabulary.decode(code) for code in [2, 0, NO_CODE]] == ['Co', 'Cu', None]
+
+
+def test_vocabularies(tmp_path):
+    vocabularies = Vocabularies({'hall': ['-P 1'], 'unknown': ['x']})
+    assert list(vocabularies) == INTERNED_COLUMNS
+    assert vocabularies['hall'].terms == ['-P 1']
+    vocabularies['metal_types'].encode('Cu')
+
+    path = tmp_path / 'vocabularies.json'
+    vocabularies.save(path)
+    loaded = Vocabularies.load(path)
+    assert loaded.to_dict() == vocabularies.to_dict()
+    assert loaded['metal_types'].codes == {'Cu': 0}
@@ -0,0 +1,77 @@
+'''
+Tests of `tools.benchmark` and its throughput regression test against the
+committed baseline.
+
+Times differ between machines and with the load of the machine, so the
+throughput test only runs if `MOFARCH_BENCHMARK` is set, e.g. on a dedicated
+runner, and a stage only fails if it got more than `MOFARCH_BENCHMARK_TOLERANCE`
+(default 2, i.e. three times) slower than the baseline. Run with
+`MOFARCH_SAVE_BASELINE=1` to replace the baseline after an intended change.
+'''
+
+import json
+import os
+import tempfile
+
+import pytest
+
+pytest.importorskip('nomad')
+
+from nomad_novelmof.schema_packages import fingerprint, novelmof_mofarch
+from nomad_novelmof.tools.benchmark import STAGES, regressions, run
+from nomad_novelmof.tools.synthetic import RecordGenerator
+
+BASELINE = os.path.join(
+    os.path.dirname(__file__), '..', 'data', 'benchmark_baseline.json'
+)
+TOLERANCE = float(os.environ.get('MOFARCH_BENCHMARK_TOLERANCE', 2))
+
+
+@pytest.fixture
+def benchmark(tmp_path, monkeypatch):
+    '''
+    `run` that checks that the benchmark does not search for duplicates,
+    restores the configuration and leaves no temporary files.
+    '''
+
+    def search(*args, **kwargs):
+        raise AssertionError('The benchmark must not search.')
+
+    # the deployment configuration is overridden during the benchmark
+    configuration = novelmof_mofarch.configuration
+    monkeypatch.setattr(configuration, 'fingerprint_structures', True)
+    monkeypatch.setattr(fingerprint, 'find_duplicates', search)
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+
+    def benchmark(n, chunk_size, sample):
+        results = run(n, chunk_size, sample, generator=RecordGenerator())
+        assert list(results) == STAGES
+        assert configuration.fingerprint_structures
+        assert not os.listdir(tmp_path)
+        return results
+
+    return benchmark
+
+
+def test_benchmark(benchmark):
+    results = benchmark(100, chunk_size=50, sample=10)
+    assert all(result['n'] in (10, 100) for result in results.values())
+    # every stage is compared by the throughput test
+    with open(BASELINE) as f:
+        assert list(json.load(f)) == STAGES
+
+
+@pytest.mark.skipif(
+    not os.environ.get('MOFARCH_BENCHMARK'),
+    reason='Set MOFARCH_BENCHMARK to compare the throughput with the baseline.',
+)
+def test_throughput(benchmark):
+    results = benchmark(1000, chunk_size=500, sample=100)
+
+    if os.environ.get('MOFARCH_SAVE_BASELINE'):
+        with open(BASELINE, 'w') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+    with open(BASELINE) as f:
+        baseline = json.load(f)
+    assert regressions(results, baseline, TOLERANCE) == []
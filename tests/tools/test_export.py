@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+pytest.importorskip('numpy')
+pq = pytest.importorskip('pyarrow.parquet')
+
+from nomad_novelmof.tools.export import MOF_ARCHIVE, export_files
+from nomad_novelmof.tools.query import MOFTable
+from nomad_novelmof.tools.records import PORES, TOPOLOGY, set_path, to_record
+from nomad_novelmof.vocabulary import Vocabularies
+
+
+def archive(index: int) -> dict:
+    data = {'m_def': MOF_ARCHIVE, 'common_name': f'MOF-{index}'}
+    metal_types = ['Cu', 'Zn'][: index % 2 + 1]
+    set_path(data, 'compositional_information.metal_types', metal_types)
+    set_path(data, f'{PORES}.PLD_angstrom', {'m': 2.0 + index})
+    set_path(data, f'{TOPOLOGY}.structure_dimension', 3 if index % 3 else None)
+    set_path(data, f'{TOPOLOGY}.hall', ['-P 2ac 2ab', 'P 1'][index % 2])
+    set_path(data, 'reference_data.year', 2000 + index)
+    set_path(data, 'synthesis_information.synthesis_method', 'solvothermal')
+    return {'data': data}
+
+
+@pytest.fixture
+def archive_files(tmp_path):
+    paths = []
+    for index in range(7):
+        path = tmp_path / f'{index}.archive.json'
+        path.write_text(json.dumps(archive(index)))
+        paths.append(str(path))
+    return paths
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_export_query_round_trip(archive_files, tmp_path, workers):
+    output_dir = tmp_path / 'export'
+    vocabularies = Vocabularies()
+    count = export_files(
+        archive_files, str(output_dir), workers=workers, vocabularies=vocabularies
+    )
+    assert count == len(archive_files)
+    assert vocabularies['hall'].terms == ['-P 2ac 2ab', 'P 1']
+
+    table = pq.read_table(sorted(str(path) for path in output_dir.glob('*.parquet')))
+    exported = MOFTable.from_arrow(table, vocabularies)
+
+    records = [to_record(archive(index)['data']) for index in range(7)]
+    expected = MOFTable.from_records(records)
+    assert exported.n_rows == expected.n_rows
+
+    def query(table: MOFTable):
+        mask = table.filter(
+            ranges={'PLD_angstrom': (3, 7), 'year': (None, 2005)},
+            terms={'metal_types': ['Zn']},
+        )
+        rows = table.rows(mask, ['common_name', 'metal_types', 'hall', 'year'])
+        return (
+            sorted(rows, key=lambda row: row['common_name']),
+            sorted(table.facets('hall', mask)),
+            int(table.filter(ranges={'structure_dimension': (3, 3)}).sum()),
+        )
+
+    assert query(exported) == query(expected)
+    rows, _, n_three_dimensional = query(exported)
+    assert [row['common_name'] for row in rows] == ['MOF-1', 'MOF-3', 'MOF-5']
+    assert rows[0]['metal_types'] == ['Cu', 'Zn']
+    assert n_three_dimensional == 4
@@ -0,0 +1,85 @@
+import os
+
+import pytest
+
+from nomad_novelmof.tools.import_budget import (
+    ENTRY_POINTS,
+    check,
+    compile_plugin,
+    imported_by_plugin,
+    importtime,
+    parse_importtime,
+    plugin_imports,
+)
+
+# imported on first use only, never when an entry point is loaded
+DEFERRED = ['matid', 'nomad.normalizing', 'scipy', 'pyarrow']
+
+IMPORTTIME = '''\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |   numpy
+import time:      2000 |       2000 |     sqlite3
+import time:       500 |       2500 |   nomad_novelmof.schema_packages.cache
+import time:      1000 |       3600 | nomad_novelmof.schema_packages
+import time:       300 |        300 | tracemalloc
+'''
+
+
+def test_plugin_imports():
+    imports = parse_importtime(IMPORTTIME)
+    assert imports[0] == (1, 'numpy', 0.1, 0.1)
+    total, dependencies = plugin_imports(imports)
+    assert total == 3.6
+    assert dependencies == [('sqlite3', 2.0), ('numpy', 0.1)]
+    assert imported_by_plugin(imports) == ['sqlite3', 'numpy']
+
+
+def test_all_entry_points_are_measured():
+    tomllib = pytest.importorskip('tomllib')
+    path = os.path.join(os.path.dirname(__file__), '..', '..', 'pyproject.toml')
+    with open(path, 'rb') as f:
+        pyproject = tomllib.load(f)
+    entry_points = pyproject['project']['entry-points']['nomad.plugin'].values()
+    assert sorted(ENTRY_POINTS) == sorted(
+        value.removeprefix('nomad_novelmof.') for value in entry_points
+    )
+
+
+def test_entry_points_defer_heavy_imports():
+    '''
+    Modules that NOMAD imported before the entry point is loaded are not imported
+    again, so only the others are checked.
+    '''
+    pytest.importorskip('nomad')
+    compile_plugin()
+    for name, code in ENTRY_POINTS.items():
+        deferred = [
+            imported
+            for imported in imported_by_plugin(importtime(code))
+            for module in DEFERRED
+            if imported == module or imported.startswith(f'{module}.')
+        ]
+        assert deferred == [], name
+
+
+@pytest.mark.skipif(
+    not os.environ.get('MOFARCH_IMPORT_BUDGET'),
+    reason='Set MOFARCH_IMPORT_BUDGET to check the import times.',
+)
+def test_entry_points_within_budget():
+    '''
+    Loads every entry point twice in a fresh interpreter and takes the faster
+    run. Import times depend on the machine and its load, so the test only runs
+    if `MOFARCH_IMPORT_BUDGET` is set. Slower machines can scale the budgets
+    with `MOFARCH_IMPORT_BUDGET_SCALE`.
+    '''
+    pytest.importorskip('nomad')
+    scale = float(os.environ.get('MOFARCH_IMPORT_BUDGET_SCALE', 1))
+    results = check(repeat=2, scale=scale)
+    assert list(results) == list(ENTRY_POINTS)
+    over = {
+        name: (round(milliseconds), budget, dependencies[:5])
+        for name, (milliseconds, budget, dependencies) in results.items()
+        if milliseconds > budget
+    }
+    assert not over
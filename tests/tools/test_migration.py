@@ -0,0 +1,75 @@
+import json
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from nomad_novelmof.tools.migration import (
+    MOF_ARCHIVE,
+    NOVEL_MOF,
+    convert_column,
+    migrate,
+    migrate_batch,
+    upgrade_batch,
+)
+from nomad_novelmof.tools.records import PORES, get_path, set_path
+
+FLAT = {
+    'm_def': NOVEL_MOF,
+    'name': 'HKUST-1',
+    'pld': 6.5,
+    'structure_dimension': 3,
+    'metal_types': 'Cu,Zn',
+    'year': 2011,
+    'unmodified': True,
+}
+
+
+def test_round_trip():
+    nested, rejected = migrate_batch([FLAT], to_nested=True)
+    assert rejected == 0
+    assert nested[0]['m_def'] == MOF_ARCHIVE
+    assert nested[0]['compositional_information']['metal_types'] == ['Cu', 'Zn']
+    assert nested[0]['reference_data']['year'] == 2011
+    flat, rejected = migrate_batch(nested, to_nested=False)
+    assert rejected == 0
+    assert flat[0] == FLAT
+
+
+def test_convert_int_rejects_non_integral():
+    values, rejected = convert_column(['2011', 2011.7, 3.0, None, 'x'], 'int', True)
+    assert values == [2011, None, 3, None, None]
+    assert rejected == 2
+
+
+def test_upgrade_keeps_units():
+    batch = [
+        {
+            'reference_data': {'year': '2011'},
+        }
+    ]
+    set_path(batch[0], f'{PORES}.PLD_angstrom', {'m': '6.5', 'u': 'angstrom'})
+    upgraded, rejected = upgrade_batch(batch)
+    assert rejected == 0
+    assert upgraded[0]['reference_data']['year'] == 2011
+    pld = get_path(upgraded[0], f'{PORES}.PLD_angstrom')
+    assert pld == {'m': 6.5, 'u': 'angstrom'}
+
+
+def test_migrate_keeps_archive_and_skips_other_schemas(tmp_path):
+    source = tmp_path / 'source'
+    source.mkdir()
+    archive = {'metadata': {'entry_id': 'a'}, 'data': FLAT}
+    (source / 'a.archive.json').write_text(json.dumps(archive))
+    other = {'data': {'m_def': 'other.Schema'}}
+    (source / 'b.archive.json').write_text(json.dumps(other))
+
+    result = migrate(
+        sorted(str(path) for path in source.iterdir()),
+        str(tmp_path / 'target'),
+        'mofarchive',
+    )
+    assert result == (1, 1, 0)
+    migrated = json.loads((tmp_path / 'target' / 'a.archive.json').read_text())
+    assert migrated['metadata'] == {'entry_id': 'a'}
+    assert migrated['data']['common_name'] == 'HKUST-1'
@@ -0,0 +1,72 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from nomad_novelmof.tools.query import CategoricalColumn, MOFTable
+from nomad_novelmof.vocabulary import NO_CODE
+
+RECORDS = [
+    {'entry_id': 'a', 'PLD_angstrom': 3.0, 'metal_types': ['Cu', 'Zn'], 'hall': 'P 1'},
+    {'entry_id': 'b', 'PLD_angstrom': 8.0, 'metal_types': ['Cu'], 'hall': '-P 1'},
+    {'entry_id': 'c', 'PLD_angstrom': None, 'metal_types': None, 'hall': 'P 1'},
+    {'entry_id': 'd', 'PLD_angstrom': 5.0, 'metal_types': ['Zn'], 'year': 2020},
+]
+
+
+def test_filter():
+    table = MOFTable.from_records(RECORDS)
+    assert table.filter(ranges={'PLD_angstrom': (3, 5)}).tolist() == [
+        True,
+        False,
+        False,
+        True,
+    ]
+    assert table.filter(terms={'metal_types': ['Cu', 'Fe']}).tolist() == [
+        True,
+        True,
+        False,
+        False,
+    ]
+    assert table.filter(all_terms={'metal_types': ['Cu', 'Zn']}).tolist() == [
+        True,
+        False,
+        False,
+        False,
+    ]
+    assert not table.filter(all_terms={'metal_types': ['Cu', 'Fe']}).any()
+    assert table.filter(ranges={'year': (2000, None)}).tolist() == [
+        False,
+        False,
+        False,
+        True,
+    ]
+
+
+def test_facets_and_rows():
+    table = MOFTable.from_records(RECORDS)
+    assert table.facets('metal_types') == [('Cu', 2), ('Zn', 2)]
+    assert table.facets('hall', table.filter(terms={'metal_types': ['Cu']})) == [
+        ('-P 1', 1),
+        ('P 1', 1),
+    ]
+    rows = table.rows(np.array([False, False, True, True]))
+    assert rows[0]['entry_id'] == 'c'
+    assert rows[0]['PLD_angstrom'] is None
+    assert rows[0]['metal_types'] == []
+    assert rows[0]['hall'] == 'P 1'
+    assert rows[1]['year'] == 2020
+    assert rows[1]['hall'] is None
+
+
+def test_from_codes_with_vocabulary():
+    column = CategoricalColumn.from_codes(
+        ['Zn', 'Cu'],
+        np.array([0, 1, NO_CODE, 0]),
+        np.array([0, 0, 1, 2]),
+        n_rows=3,
+        vocabulary=['Fe', 'Cu'],
+    )
+    assert column.vocabulary.tolist() == ['Cu', 'Fe', 'Zn']
+    assert column.any_mask(['Zn']).tolist() == [True, False, True]
+    assert column.any_mask(['Fe']).tolist() == [False, False, False]
+    assert column.all_mask(['Cu', 'Zn']).tolist() == [True, False, False]
@@ -0,0 +1,92 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('scipy')
+
+from nomad_novelmof.tools.similarity import (
+    FEATURES,
+    SimilarityIndex,
+    descriptor_vectors,
+    period_and_group,
+)
+
+
+@pytest.mark.parametrize(
+    'symbol, expected',
+    [
+        ('H', (1, 1)),
+        ('Mg', (3, 2)),
+        ('Al', (3, 13)),
+        ('Cu', (4, 11)),
+        ('Zr', (5, 4)),
+        ('Gd', (6, 3)),
+        ('Pb', (6, 14)),
+        ('U', (7, 3)),
+        ('Xx', None),
+    ],
+)
+def test_period_and_group(symbol, expected):
+    assert period_and_group(symbol) == expected
+
+
+def test_descriptor_vectors():
+    vectors = descriptor_vectors(
+        [
+            {'PLD_angstrom': 6.5, 'number_spacegroup': 225, 'metal_types': ['Cu']},
+            {'structure_dimension': 3, 'number_spacegroup': 0},
+        ]
+    )
+    assert vectors.shape == (2, len(FEATURES))
+    assert vectors[0, 0] == pytest.approx(np.log1p(6.5))
+    # cubic is the last crystal system
+    assert vectors[0, 6] == 6
+    assert vectors[0, 7:].tolist() == [1, 4, 11]
+    assert np.isnan(vectors[1, 6])
+    assert np.isnan(vectors[1, 7:]).all()
+
+
+def brute_force(index: SimilarityIndex, point: np.ndarray, k: int) -> list[str]:
+    ids = [*index.tree_ids[index.alive].tolist(), *index.buffer_ids.tolist()]
+    points = np.vstack([index.tree.data[index.alive], index.buffer])
+    distances = np.linalg.norm(points - point, axis=1)
+    return [ids[row] for row in np.argsort(distances, kind='stable')[:k]]
+
+
+def test_index_matches_brute_force(tmp_path):
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(200, len(FEATURES)))
+    index = SimilarityIndex([f'id{row}' for row in range(200)], vectors)
+
+    # stays below the rebuild threshold, so the buffer and the mask are used
+    index.remove(['id0', 'id1', 'id2'])
+    index.add(['id3', 'new0'], rng.normal(size=(2, len(FEATURES))))
+    assert len(index.buffer_ids) == 2
+    assert len(index) == 198
+
+    queries = rng.normal(size=(5, len(FEATURES)))
+    _, ids = index.query(queries, k=5)
+    for query, row_ids in zip(index._standardise(queries), ids):
+        assert row_ids.tolist() == brute_force(index, query, 5)
+    assert not {'id0', 'id1', 'id2'} & set(ids.ravel().tolist())
+
+    similar = index.similar(['new0', 'unknown'], k=3)
+    assert list(similar) == ['new0']
+    assert [entry_id for entry_id, _ in similar['new0']] == brute_force(
+        index, index.vector_of('new0'), 4
+    )[1:]
+
+    index.save(str(tmp_path / 'index.pkl'))
+    loaded = SimilarityIndex.load(str(tmp_path / 'index.pkl'))
+    assert loaded.query(queries, k=5)[1].tolist() == ids.tolist()
+
+    index.rebuild()
+    assert len(index.buffer_ids) == 0
+    assert index.query(queries, k=5)[1].tolist() == ids.tolist()
+
+
+def test_query_pads_small_index():
+    index = SimilarityIndex(['a', 'b'], np.zeros((2, len(FEATURES))))
+    distances, ids = index.query(np.zeros(len(FEATURES)), k=3)
+    assert set(ids[0, :2]) == {'a', 'b'}
+    assert ids[0, 2] is None
+    assert distances[0, 2] == np.inf
@@ -0,0 +1,42 @@
+import json
+import sys
+
+from nomad_novelmof.profiling import MEMORY_PROFILE_EVENT, STAGE_TIMINGS_EVENT
+from nomad_novelmof.tools import timings
+
+
+def write_archives(directory):
+    for index, (load, peak) in enumerate([(0.001, 1024), (0.003, 4096)]):
+        processing_logs = [
+            {'event': STAGE_TIMINGS_EVENT, 'stage_timings': {'A.load': load}},
+            {
+                'event': MEMORY_PROFILE_EVENT,
+                'peak_bytes': peak,
+                'identifier': f'mof_{index}',
+                'component': 'A',
+            },
+            {'event': 'Other event.'},
+        ]
+        path = directory / f'mof_{index}.archive.json'
+        path.write_text(json.dumps({'processing_logs': processing_logs}))
+    (directory / 'notes.json').write_text('{}')
+
+
+def test_report_of_files(tmp_path, monkeypatch, capsys):
+    write_archives(tmp_path)
+    paths = sorted(str(path) for path in tmp_path.glob('*.archive.json'))
+    assert [len(logs) for logs in timings.iter_file_logs(paths)] == [3, 3]
+
+    monkeypatch.setattr(sys, 'argv', ['timings', '--files', str(tmp_path), '--json'])
+    timings.main()
+    report = json.loads(capsys.readouterr().out)
+    assert report['stage_timings']['A.load']['count'] == 2
+    assert report['stage_timings']['A.load']['p50'] == 0.002
+    assert report['memory_outliers'] == [[4096, 'mof_1', 'A'], [1024, 'mof_0', 'A']]
+
+    monkeypatch.setattr(sys, 'argv', ['timings', '--files', str(tmp_path)])
+    timings.main()
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[1].split() == ['A.load', '2', '2.00', '2.90', '3.00']
+    assert lines[2] == ''
+    assert [line.split()[-1] for line in lines[4:]] == ['mof_1', 'mof_0']